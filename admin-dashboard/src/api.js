@@ -47,11 +47,19 @@ export const promoteUser = async (userId, isPremium, token) => {
     return response.data;
 };
 
+// The whole approval queue: follows X-Next-Cursor across pages
 export const getPendingVideos = async (token) => {
-    const response = await api.get('/videos/?status=pending', {
-        headers: { Authorization: `Bearer ${token}` }
-    });
-    return response.data;
+    const videos = [];
+    let cursor = null;
+    do {
+        const response = await api.get('/videos/', {
+            params: { status: 'pending', limit: 100, ...(cursor && { cursor }) },
+            headers: { Authorization: `Bearer ${token}` }
+        });
+        videos.push(...response.data);
+        cursor = response.headers['x-next-cursor'];
+    } while (cursor);
+    return videos;
 };
 
 export const updateVideoStatus = async (videoId, status, token) => {
@@ -7,6 +7,8 @@ from app.core.dependencies import admin_only
 from app.core import security, config
 from app.crud import user as crud_user
 from app.models.models import User, Video
+from app.utils.jobs import job_queue
+from app.utils.admission import admission
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
 from typing import List
@@ -68,6 +70,22 @@ def read_stats(
         "total_views": total_views_sum
     }
 
+@router.get("/jobs")
+def read_job_stats(
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(admin_only)
+):
+    # Queue depth for the video processing workers
+    return job_queue.stats(db)
+
+@router.get("/admission")
+def read_admission_state(
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(admin_only)
+):
+    # Upload admission limits and current load (this worker's view)
+    return admission.state(db)
+
 @router.post("/promote/{user_id}")
 def promote_user(
     user_id: int,
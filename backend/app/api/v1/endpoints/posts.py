@@ -7,9 +7,10 @@ from app.db.session import get_db
 from app.core.dependencies import get_current_user, get_current_user_optional
 from app.schemas import schemas
 from app.core import config
-from app.models.models import Post, Follow, Like, Comment
+from app.models.models import Post, Follow
 from app.crud import video as crud_video
-from sqlalchemy import case, func
+from app.crud import tag as crud_tag
+from sqlalchemy import case
 
 router = APIRouter()
 
@@ -51,21 +52,11 @@ def get_posts(
         posts.extend(remaining_posts)
 
     # Populate metadata & handle engagement attribution
-    for post in posts:
-        # Determine the target for engagement attribution
-        target = post
-        if post.original_post_id and post.original_post:
-            target = post.original_post
-            
-        # Metadata counts always reflect the ORIGINAL post
-        target.likes_count = db.query(func.count(Like.id)).filter(Like.post_id == target.id).scalar() or 0
-        target.comments_count = db.query(func.count(Comment.id)).filter(Comment.post_id == target.id).scalar() or 0
-        
-        if current_user:
-            target.liked_by_user = db.query(Like).filter(Like.post_id == target.id, Like.user_id == current_user.id).first() is not None
-        else:
-            target.liked_by_user = False
-        
+    # Metadata (stored counters, liked flag) always reflects the ORIGINAL post
+    targets = [post.original_post if post.original_post_id and post.original_post else post for post in posts]
+    crud_video.hydrate_posts(db, targets, current_user_id=current_user.id if current_user else None)
+
+    for target in targets:
         # Increment View on Original
         crud_video.increment_view(db, user_id=current_user.id if current_user else None, post_id=target.id)
         
@@ -137,9 +128,9 @@ def like_post(
         raise HTTPException(status_code=404, detail="Post not found")
     
     is_liked = crud_video.toggle_like(db, user_id=current_user.id, post_id=post_id)
-    likes_count = db.query(func.count(Like.id)).filter(Like.post_id == post_id).scalar() or 0
+    db.refresh(post)
     
-    return {"status": "success", "liked": is_liked, "likes_count": likes_count}
+    return {"status": "success", "liked": is_liked, "likes_count": post.likes_count}
 
 @router.post("/{post_id}/comment", response_model=schemas.Comment)
 def comment_post(
@@ -183,6 +174,7 @@ def delete_post(
             except Exception as e:
                 print(f"Failed to delete post image {local_path}: {e}")
                 
+    crud_tag.on_post_delete(db, post)
     db.delete(post)
     db.commit()
     return {"status": "success", "message": "Post deleted successfully"}
@@ -0,0 +1,68 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.crud import video as crud_video
+from app.crud import tag as crud_tag
+from app.schemas import schemas
+from app.core.dependencies import get_current_user_optional
+from app.core import config
+from app.utils.pagination import encode_id_cursor, decode_id_cursor
+
+router = APIRouter()
+
+def _page_args(limit: int, cursor: Optional[str]):
+    limit = max(1, min(limit, config.VIDEO_PAGE_SIZE_MAX))
+    try:
+        before_id = decode_id_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return limit, before_id
+
+def _get_tag_or_404(db: Session, name: str):
+    tag = crud_tag.get_tag(db, name)
+    if not tag:
+        raise HTTPException(status_code=404, detail="Tag not found")
+    return tag
+
+@router.get("/", response_model=List[schemas.Tag])
+def read_tags(limit: int = 50, db: Session = Depends(get_db)):
+    return crud_tag.get_top_tags(db, limit=max(1, min(limit, config.VIDEO_PAGE_SIZE_MAX)))
+
+@router.get("/{name}/videos", response_model=schemas.TagVideoPage)
+def read_tag_videos(
+    name: str,
+    limit: int = config.VIDEO_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: Optional[dict] = Depends(get_current_user_optional)
+):
+    limit, before_id = _page_args(limit, cursor)
+    tag = _get_tag_or_404(db, name)
+
+    # Fetch one extra id to know whether another page exists
+    ids = crud_tag.get_tag_video_ids(db, tag.id, limit=limit + 1, before_id=before_id)
+    next_cursor = encode_id_cursor(ids[limit - 1]) if len(ids) > limit else None
+    videos = crud_video.get_videos_by_ids(db, ids[:limit], current_user_id=current_user.id if current_user else None)
+
+    # Facets describe the whole tag, so only the first page computes them
+    related = crud_tag.get_related_tags(db, tag.id) if before_id is None else []
+    return {"tag": tag, "videos": videos, "next_cursor": next_cursor, "related_tags": related}
+
+@router.get("/{name}/posts", response_model=schemas.TagPostPage)
+def read_tag_posts(
+    name: str,
+    limit: int = config.VIDEO_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: Optional[dict] = Depends(get_current_user_optional)
+):
+    limit, before_id = _page_args(limit, cursor)
+    tag = _get_tag_or_404(db, name)
+
+    posts = crud_tag.get_tag_posts(db, tag.id, limit=limit + 1, before_id=before_id)
+    next_cursor = encode_id_cursor(posts[limit - 1].id) if len(posts) > limit else None
+    posts = posts[:limit]
+    crud_video.hydrate_posts(db, posts, current_user_id=current_user.id if current_user else None)
+    return {"tag": tag, "posts": posts, "next_cursor": next_cursor}
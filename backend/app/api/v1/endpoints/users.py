@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Request
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy import func
 from typing import List, Optional
 
 from app.db.session import get_db
@@ -8,7 +8,10 @@ from app.crud import user as crud_user
 from app.schemas import schemas
 from app.core.dependencies import get_current_user, get_current_user_optional
 from app.core import config
-from app.models.models import User, Video, Like, Follow
+from app.models.models import User, Video, Follow
+from app.utils.pagination import encode_offset_cursor, decode_offset_cursor
+from app.utils.autocomplete import normalize
+from app.utils.cache import response_cache, SEARCH
 
 router = APIRouter()
 
@@ -69,24 +72,61 @@ def follow_user(
 
 @router.get("/search", response_model=schemas.UnifiedSearchResponse)
 def search_unified(
+    request: Request,
     q: str = "", 
-    db: Session = Depends(get_db)
+    section: Optional[str] = None,
+    users_limit: int = 10,
+    users_cursor: Optional[str] = None,
+    videos_limit: int = config.VIDEO_PAGE_SIZE,
+    videos_cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: Optional[schemas.User] = Depends(get_current_user_optional)
 ):
+    """Each section is ranked and paged independently; pass `section` to fetch
+    only the next page of one of them."""
+    q = normalize(q)
     if not q:
         return {"videos": [], "users": []}
-    
-    # Search for users
-    users = db.query(User).filter(
-        or_(
-            User.username.ilike(f"%{q}%"),
-            User.full_name.ilike(f"%{q}%")
-        )
-    ).limit(10).all()
-    
-    from app.crud import video as crud_video
-    videos = crud_video.search_videos(db, query_str=q)
-    
-    return {"videos": videos, "users": users}
+
+    try:
+        users_offset = decode_offset_cursor(users_cursor) if users_cursor else 0
+        videos_offset = decode_offset_cursor(videos_cursor) if videos_cursor else 0
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    users_limit = max(1, min(users_limit, config.VIDEO_PAGE_SIZE_MAX))
+    videos_limit = max(1, min(videos_limit, config.VIDEO_PAGE_SIZE_MAX))
+
+    def build():
+        result = {"videos": [], "users": []}
+        if section in (None, "users"):
+            users, has_more = crud_user.search_users(db, query_str=q, limit=users_limit, offset=users_offset)
+            result["users"] = users
+            if has_more:
+                result["users_next_cursor"] = encode_offset_cursor(users_offset + users_limit)
+
+        if section in (None, "videos"):
+            from app.crud import video as crud_video
+            videos = crud_video.search_videos(
+                db,
+                query_str=q,
+                current_user_id=current_user.id if current_user else None,
+                limit=videos_limit + 1,
+                offset=videos_offset
+            )
+            if len(videos) > videos_limit:
+                videos = videos[:videos_limit]
+                result["videos_next_cursor"] = encode_offset_cursor(videos_offset + videos_limit)
+            result["videos"] = videos
+
+        return schemas.UnifiedSearchResponse.model_validate(result).model_dump(mode="json")
+
+    params = {
+        "unified": q, "section": section,
+        "users": [users_limit, users_offset], "videos": [videos_limit, videos_offset]
+    }
+    return response_cache.respond(
+        request, SEARCH, params, build, cacheable=current_user is None, ttl=config.SEARCH_CACHE_TTL_SECONDS
+    )
 
 @router.post("/upload-avatar")
 async def upload_avatar(
@@ -138,8 +178,8 @@ def get_user_insights(
     # Total Views
     total_views = db.query(func.sum(Video.views)).filter(Video.owner_id == user_id).scalar() or 0
     
-    # Total Likes - Count likes on videos owned by user
-    total_likes = db.query(func.count(Like.user_id)).join(Video).filter(Video.owner_id == user_id).scalar() or 0
+    # Total Likes - Sum of the stored like counters on videos owned by user
+    total_likes = db.query(func.sum(Video.likes_count)).filter(Video.owner_id == user_id).scalar() or 0
     
     # Total Earnings
     total_earnings = db.query(func.sum(Video.earnings)).filter(Video.owner_id == user_id).scalar() or 0.0
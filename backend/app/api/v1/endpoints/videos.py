@@ -2,257 +2,192 @@ from typing import List, Optional
 import os
 import shutil
 import tempfile
-import httpx
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks
+import hmac
+import hashlib
+import asyncio
+import contextlib
+import json
+from collections import OrderedDict
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request, Response, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db, SessionLocal
 from app.crud import video as crud_video
+from app.crud import tag as crud_tag
+from app.crud import upload as crud_upload
 from app.schemas import schemas
 from app.core.dependencies import get_current_user, get_current_user_optional
+from app.core.security import processing_callback_token
 from app.core import config
 from app.core.config import FLASH_QUOTA_LIMIT, HOME_QUOTA_LIMIT
 from app.models.models import Video, User
+from app.utils.pagination import encode_cursor, decode_cursor, encode_offset_cursor, decode_offset_cursor
+from app.utils.ranking import feed_ranker
+from app.utils.search import search_index
+from app.utils.autocomplete import autocomplete, normalize
+from app.utils.trending import trending
+from app.utils import processing
+from app.utils.progress import progress_hub, TERMINAL
+from app.utils.admission import admission
+from app.utils.media import probe_header, validate_media, IncompleteHeader
+from app.utils.cache import response_cache, VIDEO_LISTS, SEARCH, video_namespace
 
 router = APIRouter()
 
+DEFAULT_THUMBNAIL_URL = "https://images.unsplash.com/photo-1618005182384-a83a8bd57fbe?auto=format&fit=crop&w=800&q=60"
+
+def _serialize_videos(videos) -> list:
+    return [schemas.Video.model_validate(v).model_dump(mode="json") for v in videos]
+
 @router.get("/", response_model=List[schemas.Video])
 def read_videos(
+    request: Request,
     video_type: str = None, 
     status: str = "approved", 
+    limit: int = config.VIDEO_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    sort: str = "ranked",
     db: Session = Depends(get_db), 
     current_user: Optional[dict] = Depends(get_current_user_optional)
 ):
     user_id = current_user.id if current_user else None
-    return crud_video.get_videos(db, video_type=video_type, filter_status=status, current_user_id=user_id)
+    limit = max(1, min(limit, config.VIDEO_PAGE_SIZE_MAX))
+
+    # Typed public feeds are served from the precomputed ranking
+    ranked = bool(video_type and status == "approved" and sort == "ranked" and feed_ranker.is_ready)
+    try:
+        if ranked:
+            offset = decode_offset_cursor(cursor) if cursor else 0
+        else:
+            after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    def build():
+        headers = {}
+        if ranked:
+            videos, has_more = crud_video.get_ranked_videos(
+                db, video_type=video_type, offset=offset, limit=limit, current_user_id=user_id
+            )
+            if has_more:
+                headers["X-Next-Cursor"] = encode_offset_cursor(offset + limit)
+            return _serialize_videos(videos), headers
+
+        # Fetch one extra row to know whether another page exists
+        videos = crud_video.get_videos(
+            db,
+            video_type=video_type,
+            filter_status=status,
+            current_user_id=user_id,
+            limit=limit + 1,
+            after=after
+        )
+        if len(videos) > limit:
+            videos = videos[:limit]
+            last = videos[-1]
+            headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+        return _serialize_videos(videos), headers
+
+    params = {"video_type": video_type, "status": status, "limit": limit, "cursor": cursor, "ranked": ranked}
+    return response_cache.respond(request, VIDEO_LISTS, params, build, cacheable=current_user is None)
 
 @router.get("/search", response_model=List[schemas.Video])
-async def search_videos(
+def search_videos(
+    request: Request,
     q: Optional[str] = "", 
+    limit: int = config.VIDEO_PAGE_SIZE,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: Optional[dict] = Depends(get_current_user_optional)
 ):
     user_id = current_user.id if current_user else None
-    return crud_video.search_videos(db, query_str=q, current_user_id=user_id)
+    limit = max(1, min(limit, config.VIDEO_PAGE_SIZE_MAX))
+    try:
+        offset = decode_offset_cursor(cursor) if cursor else 0
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    q = normalize(q)
+
+    def build():
+        headers = {}
+        # Fetch one extra hit to know whether another page exists
+        videos = crud_video.search_videos(db, query_str=q, current_user_id=user_id, limit=limit + 1, offset=offset)
+        if len(videos) > limit:
+            videos = videos[:limit]
+            headers["X-Next-Cursor"] = encode_offset_cursor(offset + limit)
+        return _serialize_videos(videos), headers
+
+    params = {"q": q, "limit": limit, "offset": offset}
+    return response_cache.respond(
+        request, SEARCH, params, build, cacheable=current_user is None, ttl=config.SEARCH_CACHE_TTL_SECONDS
+    )
 
 @router.get("/suggestions")
-async def get_search_suggestions(q: Optional[str] = "", db: Session = Depends(get_db)):
-    if not q or len(q) < 2: return []
-    
-    # 1. Search Videos (Home & Flash)
-    videos = crud_video.search_videos(db, query_str=q)
-    
-    # 2. Search Users
-    from app.models.models import User
-    users = db.query(User).filter(User.username.ilike(f"%{q}%")).limit(5).all()
-    
-    seen = set()
-    suggestions = []
-    
-    # Prioritize users in suggestions
-    for u in users:
-        val = f"@{u.username}"
-        if val not in seen:
-            suggestions.append(val)
-            seen.add(val)
-            
-    for v in videos[:10]:
-        if v.title not in seen:
-            suggestions.append(v.title)
-            seen.add(v.title)
-            
-    return suggestions[:10]
+def get_search_suggestions(request: Request, q: Optional[str] = "", db: Session = Depends(get_db)):
+    q = normalize(q)
+    if len(q) < 2: return []
 
-@router.get("/trending-suggestions")
-async def get_trending_suggestions(db: Session = Depends(get_db)):
-    # 1. High views (Trending)
-    trending_videos = db.query(Video).filter(Video.status == "approved").order_by(Video.views.desc()).limit(5).all()
-    
-    # 2. Recent uploads
-    recent_videos = db.query(Video).filter(Video.status == "approved").order_by(Video.created_at.desc()).limit(5).all()
-    
-    # 3. Popular Creators
-    from app.models.models import User
-    users = db.query(User).limit(3).all()
+    # Served from the in-memory prefix index; users are prioritized
+    def build():
+        autocomplete.ensure_ready(db)
+        return autocomplete.suggest(q, limit=10)
 
-    seen = set()
-    suggestions = []
-    
-    for v in trending_videos:
-        if v.title not in seen:
-            suggestions.append(v.title)
-            seen.add(v.title)
-            
-    for v in recent_videos:
-        if v.title not in seen:
-            suggestions.append(v.title)
-            seen.add(v.title)
-            
-    for u in users:
-        val = f"@{u.username}"
-        if val not in seen:
-            suggestions.append(val)
-            seen.add(val)
-            
-    return suggestions[:10]
+    return response_cache.respond(request, SEARCH, {"suggest": q}, build, ttl=config.SEARCH_CACHE_TTL_SECONDS)
+
+@router.get("/trending-suggestions")
+def get_trending_suggestions(request: Request, db: Session = Depends(get_db)):
+    # Precomputed on a schedule by the trending engine
+    return response_cache.respond(request, VIDEO_LISTS, {"view": "trending-suggestions"}, lambda: trending.get_suggestions(db))
 
 @router.get("/{video_id}", response_model=schemas.Video)
-def read_video(video_id: int, db: Session = Depends(get_db), current_user: Optional[dict] = Depends(get_current_user_optional)):
+def read_video(
+    video_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Optional[dict] = Depends(get_current_user_optional)
+):
     user_id = current_user.id if current_user else None
-    db_video = crud_video.get_video(db, video_id=video_id, current_user_id=user_id)
-    if db_video is None:
-        raise HTTPException(status_code=404, detail="Video not found")
-    return db_video
 
+    def build():
+        db_video = crud_video.get_video(db, video_id=video_id, current_user_id=user_id)
+        if db_video is None:
+            raise HTTPException(status_code=404, detail="Video not found")
+        return schemas.Video.model_validate(db_video).model_dump(mode="json")
 
-async def background_process_video(
-    temp_file_path: str,
-    video_type: str,
-    title: str,
-    video_id: int,
-    thumbnail_provided: bool,
-    task_id: str
+    return response_cache.respond(request, video_namespace(video_id), {}, build, cacheable=current_user is None)
+
+
+@router.post("/processing-callback", status_code=202, include_in_schema=False)
+def processing_callback(
+    event: schemas.ProcessingEvent,
+    x_callback_token: str = Header(""),
+    db: Session = Depends(get_db)
 ):
-    db = SessionLocal()
-    try:
-        # Phase 1: Communication with Rust Service
-        try:
-            async with httpx.AsyncClient() as client:
-                rust_response = await client.post(
-                    f"{config.RUST_SERVICE_URL}/process",
-                    json={
-                        "video_id": temp_file_path,
-                        "target_format": video_type,
-                        "skip_thumbnail": thumbnail_provided,
-                        "task_id": task_id
-                    },
-                    timeout=600.0
-                )
-                
-                import asyncio
-                max_retries = 300 # 10 minutes with 2s sleep
-                retries = 0
-                while retries < max_retries:
-                    try:
-                        status_resp = await client.get(f"{config.RUST_SERVICE_URL}/status/{task_id}")
-                        if status_resp.status_code == 200:
-                            status_data = status_resp.json()
-                            if status_data:
-                                if status_data.get("status") == "completed":
-                                    break
-                                if status_data.get("status") == "error":
-                                    raise Exception(f"Rust processing error: {status_data.get('message')}")
-                        elif status_resp.status_code == 404:
-                             pass
-                    except Exception as e:
-                        if "Rust processing error" in str(e):
-                            raise e
-                        print(f"Polling error (try {retries}): {e}")
-                    
-                    await asyncio.sleep(2)
-                    retries += 1
-                
-                if retries >= max_retries:
-                    raise Exception(f"Background processing timed out for task {task_id}")
-
-        except Exception as e:
-            print(f"Error in background processing phase: {e}")
-            # Rollback quota and mark as failed
-            video = db.query(Video).filter(Video.id == video_id).first()
-            if video:
-                video.status = "failed"
-                video.failed_at = func.now()
-                owner = db.query(User).filter(User.id == video.owner_id).first()
-                if owner:
-                    if video.video_type == "flash":
-                        owner.flash_uploads = max(0, (owner.flash_uploads or 1) - 1)
-                    else:
-                        owner.home_uploads = max(0, (owner.home_uploads or 1) - 1)
-                db.commit()
-            return
-
-        # Phase 2: Post-processing (Moving files and updating DB)
-        try:
-            # Ensure base filename is safe and unique
-            clean_title = "".join([c if c.isalnum() else "_" for c in title])
-            timestamp = int(os.path.getmtime(temp_file_path))
-            base_filename = f"{clean_title}_{timestamp}"
-            
-            def save_resolution(suffix):
-                src = f"{temp_file_path}_{suffix}.mp4"
-                if not os.path.exists(src):
-                    return None
-                    
-                # Local Storage
-                dest_dir = os.path.join(config.STATIC_DIR, "videos")
-                os.makedirs(dest_dir, exist_ok=True)
-                dest_path = os.path.join(dest_dir, f"{base_filename}_{suffix}.mp4")
-                shutil.copy2(src, dest_path)
-                return f"{config.BASE_URL}/static/videos/{base_filename}_{suffix}.mp4"
-
-            url_480p = save_resolution("480p")
-            url_720p = save_resolution("720p")
-            url_1080p = save_resolution("1080p")
-            url_2k = save_resolution("1440p")
-            url_4k = save_resolution("2160p")
-            
-            # Fallback logic for the main video URL
-            video_url = url_720p or url_1080p or url_480p or ""
-            
-            temp_thumb_path = f"{temp_file_path}.jpg"
-            thumbnail_url = None
-            
-            if not thumbnail_provided and os.path.exists(temp_thumb_path):
-                # Local Storage
-                dest_dir = os.path.join(config.STATIC_DIR, "thumbs")
-                os.makedirs(dest_dir, exist_ok=True)
-                dest_path = os.path.join(dest_dir, f"{base_filename}.jpg")
-                shutil.copy2(temp_thumb_path, dest_path)
-                thumbnail_url = f"{config.BASE_URL}/static/thumbs/{base_filename}.jpg"
-
-            # Get Duration
-            duration = 0
-            try:
-                import subprocess
-                probe_cmd = [
-                    "ffprobe", "-v", "error", "-show_entries", "format=duration",
-                    "-of", "default=noprint_wrappers=1:nokey=1", temp_file_path
-                ]
-                duration_str = subprocess.check_output(probe_cmd).decode('utf-8').strip()
-                duration = int(float(duration_str))
-            except Exception as e:
-                print(f"Failed to get duration: {e}")
-
-            # Update Database
-            video = db.query(Video).filter(Video.id == video_id).first()
-            if video:
-                video.video_url = video_url
-                video.url_480p = url_480p
-                video.url_720p = url_720p
-                video.url_1080p = url_1080p
-                video.url_2k = url_2k
-                video.url_4k = url_4k
-                video.duration = duration
-                # video.status = "approved" # REMOVED AUTO-APPROVAL
-                video.failed_at = None # Clear if it was a retry
-                
-                if thumbnail_url:
-                    video.thumbnail_url = thumbnail_url
-                
-                db.commit()
-        except Exception as e:
-            print(f"Error in post-processing: {e}")
+    """Completion events pushed by the Rust service."""
+    if not hmac.compare_digest(x_callback_token, processing_callback_token(event.task_id)):
+        raise HTTPException(status_code=403, detail="Invalid callback token")
 
-    finally:
-        db.close()
-        # Clean up temp
-        temp_dir = os.path.dirname(temp_file_path)
-        if os.path.exists(temp_dir):
-            try:
-                shutil.rmtree(temp_dir)
-            except Exception as e:
-                print(f"Error cleaning up temp dir {temp_dir}: {e}")
+    video = db.query(Video).filter(Video.processing_key == event.task_id).first()
+    if not video:
+        raise HTTPException(status_code=404, detail="Video not found")
+    # The service retries deliveries, so the same event can arrive twice
+    if video.video_url or video.failed_at:
+        return {"status": "ignored"}
+
+    temp_file_path = os.path.realpath(event.video_path)
+    if os.path.dirname(temp_file_path) != os.path.realpath(os.path.join(tempfile.gettempdir(), event.task_id)):
+        raise HTTPException(status_code=400, detail="Unexpected video path")
+
+    if event.status == "completed":
+        # Phase 2 moves multi-GB files; a worker runs it after the event is acknowledged
+        media = event.media.model_dump() if event.media else None
+        processing.enqueue_finish(db, video, temp_file_path, event.skip_thumbnail, media)
+    else:
+        print(f"Rust processing error for video {video.id}: {event.message}")
+        processing.abandon_processing(event.message, temp_file_path, video.id)
+    return {"status": "accepted"}
 
 def delete_video_files(video: Video):
     """Utility to delete all local files associated with a video."""
@@ -263,7 +198,8 @@ def delete_video_files(video: Video):
         video.url_1080p,
         video.url_2k,
         video.url_4k,
-        video.thumbnail_url
+        video.thumbnail_url,
+        *processing.thumbnail_urls(video).values()
     ]
     
     for url in urls:
@@ -281,6 +217,11 @@ def delete_video_files(video: Video):
                 except Exception as e:
                     print(f"Failed to delete file {local_path}: {e}")
 
+    if video.manifest_url:
+        shutil.rmtree(processing.hls_dir(video.id), ignore_errors=True)
+    if video.seek_preview_url:
+        shutil.rmtree(processing.seek_preview_dir(video.id), ignore_errors=True)
+
 @router.delete("/{video_id}")
 def delete_video(
     video_id: int,
@@ -299,8 +240,13 @@ def delete_video(
     delete_video_files(video)
     
     # Delete from DB
+    search_index.remove_video(db, video_id)
+    crud_tag.on_video_status_change(db, video, video.status, None)
     db.delete(video)
     db.commit()
+    feed_ranker.remove(video_id)
+    autocomplete.remove_video(video_id)
+    response_cache.invalidate(VIDEO_LISTS, SEARCH, video_namespace(video_id))
     
     return {"status": "success", "message": "Video deleted successfully"}
 
@@ -321,8 +267,14 @@ def update_video_status(
     if status not in ["approved", "rejected", "pending"]:
          raise HTTPException(status_code=400, detail="Invalid status")
          
+    old_status = video.status
     video.status = status
+    search_index.index_video(db, video)
+    crud_tag.on_video_status_change(db, video, old_status, status)
     db.commit()
+    feed_ranker.update(video)
+    autocomplete.update_video(video)
+    response_cache.invalidate(VIDEO_LISTS, SEARCH, video_namespace(video_id))
     
     # Check for FIRST_UPLOAD achievement upon approval
     if status == "approved":
@@ -339,9 +291,85 @@ def update_video_status(
     return {"status": "success", "video_status": video.status}
 
 
+def _check_upload_quota(user: User, video_type: str):
+    if not user.is_premium:
+        if video_type == "flash" and user.flash_uploads >= FLASH_QUOTA_LIMIT:
+            raise HTTPException(status_code=403, detail=f"Flash quota exceeded ({FLASH_QUOTA_LIMIT} max)")
+        if video_type == "home" and user.home_uploads >= HOME_QUOTA_LIMIT:
+            raise HTTPException(status_code=403, detail=f"Home quota exceeded ({HOME_QUOTA_LIMIT} max)")
+
+def _start_processing(
+    db: Session,
+    current_user: User,
+    temp_file_path: str,
+    video_create_data: schemas.VideoCreate,
+    thumbnail_provided: bool = False
+):
+    """Charge the upload quota, create the pending video and queue processing."""
+    # Committed together with the video row, so a failed insert charges nothing
+    if video_create_data.video_type == "flash":
+        current_user.flash_uploads = (current_user.flash_uploads or 0) + 1
+    else:
+        current_user.home_uploads = (current_user.home_uploads or 0) + 1
+
+    db_video = crud_video.create_video(db, video_create_data, user_id=current_user.id)
+    processing.enqueue_processing(
+        db, db_video, temp_file_path, thumbnail_provided=thumbnail_provided, premium=bool(current_user.is_premium)
+    )
+    return db_video
+
+def _pending_video_data(title, description, tags, video_type, temp_file_path, content_hash=None) -> schemas.VideoCreate:
+    return schemas.VideoCreate(
+        title=title,
+        description=description,
+        tags=tags,
+        video_type=video_type,
+        video_url="", 
+        thumbnail_url=DEFAULT_THUMBNAIL_URL,
+        processing_key=os.path.basename(os.path.dirname(temp_file_path)),
+        content_hash=content_hash
+    )
+
+# Uploads are hashed while they are written, so re-uploads of a file we have
+# already transcoded can reuse its renditions
+
+HASH_READ_SIZE = 1024 * 1024
+
+def _copy_with_digest(src, dest_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(dest_path, "wb") as dest:
+        while chunk := src.read(HASH_READ_SIZE):
+            dest.write(chunk)
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _preflight(f, video_type: str, available: int, complete: bool = True):
+    """Refuse files the pipeline would reject, reading only their header.
+
+    Containers other than MP4/MOV are left to the video-service. Raises 422;
+    nothing is raised while a partial upload has not reached its metadata yet.
+    """
+    try:
+        media = probe_header(f, available)
+        if media is not None:
+            validate_media(media, video_type)
+    except IncompleteHeader:
+        if complete:
+            raise HTTPException(status_code=422, detail="Video metadata not found; the file is incomplete or corrupt")
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    finally:
+        f.seek(0)
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_READ_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 @router.post("/upload", response_model=schemas.Video)
 async def upload_video(
-    background_tasks: BackgroundTasks,
     title: str = Form(...),
     description: Optional[str] = Form(None),
     tags: Optional[str] = Form(None),
@@ -352,27 +380,21 @@ async def upload_video(
     current_user: dict = Depends(get_current_user)
 ):
     # current_user is now a User model instance, not dict
-    if not current_user.is_premium:
-        if video_type == "flash" and current_user.flash_uploads >= FLASH_QUOTA_LIMIT:
-            raise HTTPException(status_code=403, detail=f"Flash quota exceeded ({FLASH_QUOTA_LIMIT} max)")
-        if video_type == "home" and current_user.home_uploads >= HOME_QUOTA_LIMIT:
-            raise HTTPException(status_code=403, detail=f"Home quota exceeded ({HOME_QUOTA_LIMIT} max)")
+    _check_upload_quota(current_user, video_type)
+
+    # The form is already spooled; check it before copying and hashing it
+    size = file.file.seek(0, os.SEEK_END)
+    if size > config.UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Upload exceeds maximum size")
+    await asyncio.to_thread(_preflight, file.file, video_type, size)
 
     temp_dir = tempfile.mkdtemp()
     temp_file_path = os.path.join(temp_dir, file.filename)
-    with open(temp_file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Large bodies would stall the event loop if copied inline
+    content_hash = await asyncio.to_thread(_copy_with_digest, file.file, temp_file_path)
 
     # Initial DB record
-    video_create_data = schemas.VideoCreate(
-        title=title,
-        description=description,
-        tags=tags,
-        video_type=video_type,
-        video_url="", 
-        thumbnail_url="https://images.unsplash.com/photo-1618005182384-a83a8bd57fbe?auto=format&fit=crop&w=800&q=60",
-        processing_key=os.path.basename(temp_dir)
-    )
+    video_create_data = _pending_video_data(title, description, tags, video_type, temp_file_path, content_hash)
     
     if thumbnail:
         from app.core.storage import s3_client
@@ -386,36 +408,258 @@ async def upload_video(
                 content_type=thumbnail.content_type
             )
 
-    # Update quota
-    if video_type == "flash":
-        current_user.flash_uploads = (current_user.flash_uploads or 0) + 1
-    else:
-        current_user.home_uploads = (current_user.home_uploads or 0) + 1
-    
-    db.commit() # Save user updates
-    
-    db_video = crud_video.create_video(db, video_create_data, user_id=current_user.id)
-
-    background_tasks.add_task(
-        background_process_video,
-        temp_file_path,
-        video_type,
-        title,
-        db_video.id,
-        thumbnail is not None,
-        db_video.processing_key
+    return _start_processing(
+        db, current_user, temp_file_path, video_create_data, thumbnail_provided=thumbnail is not None
     )
 
-    return db_video
+# Resumable uploads (tus-style): create a session, PATCH bytes at the current
+# offset, HEAD to find where to resume. The last chunk starts processing.
+
+UPLOAD_WRITE_BUFFER = 1024 * 1024
+
+class _UploadDigest:
+    """Running SHA-256 of a resumable upload and how many bytes it covers."""
+
+    def __init__(self):
+        self.sha256 = hashlib.sha256()
+        self.length = 0
+
+    def write(self, f, data: bytes):
+        f.write(data)
+        self.sha256.update(data)
+        self.length += len(data)
+
+# Digests of sessions in progress in this worker, oldest first. A session that
+# resumes on another worker, or is evicted, is hashed from disk when it completes
+MAX_UPLOAD_DIGESTS = 1024
+_upload_digests: "OrderedDict[str, _UploadDigest]" = OrderedDict()
+
+def _take_upload_digest(upload_id: str, offset: int) -> Optional[_UploadDigest]:
+    digest = _upload_digests.pop(upload_id, None)
+    if digest and digest.length == offset:
+        return digest
+    return _UploadDigest() if offset == 0 else None
+
+def _keep_upload_digest(upload_id: str, digest: Optional[_UploadDigest], offset: int):
+    if digest is None or digest.length != offset:
+        return
+    _upload_digests[upload_id] = digest
+    while len(_upload_digests) > MAX_UPLOAD_DIGESTS:
+        _upload_digests.popitem(last=False)
+
+def _get_owned_upload(db: Session, upload_id: str, user: User):
+    upload = crud_upload.get_upload_session(db, upload_id)
+    if not upload or upload.owner_id != user.id:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload
+
+def _upload_headers(upload, offset: int) -> dict:
+    return {"Upload-Offset": str(offset), "Upload-Length": str(upload.length), "Cache-Control": "no-store"}
+
+async def _append_chunk(
+    request: Request, path: str, offset: int, length: int, digest: Optional[_UploadDigest] = None
+) -> None:
+    """Stream the request body onto the end of the file, off the event loop.
+
+    Whatever arrived before a disconnect is still flushed, so the client can
+    resume from there rather than resending the whole chunk.
+    """
+    buffer = bytearray()
+    with open(path, "ab") as f:
+        write = (lambda data: digest.write(f, data)) if digest else f.write
+        try:
+            async for data in request.stream():
+                if offset + len(buffer) + len(data) > length:
+                    raise HTTPException(status_code=413, detail="Chunk exceeds declared upload length")
+                buffer += data
+                if len(buffer) >= UPLOAD_WRITE_BUFFER:
+                    await asyncio.to_thread(write, bytes(buffer))
+                    offset += len(buffer)
+                    buffer.clear()
+        finally:
+            if buffer:
+                await asyncio.to_thread(write, bytes(buffer))
+
+def _renew_writer(upload_id: str):
+    db = SessionLocal()
+    try:
+        crud_upload.renew_writer(db, upload_id)
+    finally:
+        db.close()
+
+async def _hold_write_lease(upload_id: str):
+    # Keeps the lease live for as long as the chunk takes to arrive
+    while True:
+        await asyncio.sleep(config.UPLOAD_WRITE_LEASE_SECONDS / 3)
+        await asyncio.to_thread(_renew_writer, upload_id)
+
+@router.post("/uploads", response_model=schemas.UploadStatus, status_code=201)
+def create_upload(
+    upload: schemas.UploadCreate,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    if upload.length <= 0:
+        raise HTTPException(status_code=400, detail="Upload length must be positive")
+    if upload.length > config.UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Upload exceeds maximum size")
+    _check_upload_quota(current_user, upload.video_type)
+    admission.check(db, current_user.id, upload.length)
+
+    db_upload = crud_upload.create_upload_session(db, upload, user_id=current_user.id)
+    response.headers.update(_upload_headers(db_upload, 0))
+    response.headers["Location"] = f"{config.BASE_URL}/api/v1/videos/uploads/{db_upload.id}"
+    return {"upload_id": db_upload.id, "offset": 0, "length": db_upload.length}
+
+@router.head("/uploads/{upload_id}")
+def get_upload_offset(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    upload = _get_owned_upload(db, upload_id, current_user)
+    return Response(status_code=200, headers=_upload_headers(upload, crud_upload.received_bytes(upload)))
+
+@router.patch("/uploads/{upload_id}", response_model=schemas.UploadStatus)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    response: Response,
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    upload = _get_owned_upload(db, upload_id, current_user)
+    if upload.video_id:
+        raise HTTPException(status_code=409, detail="Upload already completed")
+    if crud_upload.writer_active(upload):
+        raise HTTPException(status_code=409, detail="Another chunk is being written")
+
+    offset = crud_upload.received_bytes(upload)
+    if upload_offset != offset:
+        raise HTTPException(status_code=409, detail="Upload-Offset mismatch", headers=_upload_headers(upload, offset))
+    # Capacity was admitted when the session was created; disk can run out since
+    admission.check_disk(upload.length - offset)
+
+    if not crud_upload.claim_writer(db, upload, config.MAX_CONCURRENT_UPLOADS_PER_USER):
+        if crud_upload.writer_active(upload):
+            raise HTTPException(status_code=409, detail="Another chunk is being written")
+        raise HTTPException(
+            status_code=429,
+            detail="Too many uploads in progress, try again shortly",
+            headers={"Retry-After": str(admission.retry_after)}
+        )
+    lease = asyncio.create_task(_hold_write_lease(upload_id))
+    digest = _take_upload_digest(upload_id, offset)
+    try:
+        await _append_chunk(request, upload.temp_path, offset, upload.length, digest)
+    finally:
+        lease.cancel()
+        upload.writing_since = None
+        upload.bytes_received = crud_upload.received_bytes(upload)
+        db.commit()
+        _keep_upload_digest(upload_id, digest, upload.bytes_received)
+
+    # Fail as soon as the header shows the file will be refused
+    complete = upload.bytes_received == upload.length
+    try:
+        with open(upload.temp_path, "rb") as f:
+            await asyncio.to_thread(_preflight, f, upload.video_type, upload.bytes_received, complete)
+    except HTTPException:
+        _upload_digests.pop(upload_id, None)
+        crud_upload.delete_upload_session(db, upload)
+        raise
+
+    video = None
+    if complete:
+        # Quota may have been used up by other uploads since the session began
+        _check_upload_quota(current_user, upload.video_type)
+        digest = _upload_digests.pop(upload_id, None)
+        if digest and digest.length == upload.length:
+            content_hash = digest.sha256.hexdigest()
+        else:
+            content_hash = await asyncio.to_thread(_file_digest, upload.temp_path)
+        video_create_data = _pending_video_data(
+            upload.title, upload.description, upload.tags, upload.video_type, upload.temp_path, content_hash
+        )
+        video = _start_processing(db, current_user, upload.temp_path, video_create_data)
+        upload.video_id = video.id
+        db.commit()
+
+    response.headers.update(_upload_headers(upload, upload.bytes_received))
+    return {"upload_id": upload.id, "offset": upload.bytes_received, "length": upload.length, "video": video}
+
+@router.delete("/uploads/{upload_id}", status_code=204)
+def cancel_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    upload = _get_owned_upload(db, upload_id, current_user)
+    if upload.video_id:
+        raise HTTPException(status_code=409, detail="Upload already completed")
+    _upload_digests.pop(upload_id, None)
+    crud_upload.delete_upload_session(db, upload)
+    return Response(status_code=204)
+
+# /status/{key} predates the event stream, and its pollers expect the
+# video-service's terminal values rather than the event stream's
+LEGACY_STATUS = {"ready": "completed", "failed": "error"}
 
 @router.get("/status/{key}")
 async def get_processing_status(key: str):
-    async with httpx.AsyncClient() as client:
+    try:
+        snapshot = await progress_hub.snapshot(key)
+    except Exception:
+        return {"status": "unknown"}
+    return dict(snapshot, status=LEGACY_STATUS.get(snapshot["status"], snapshot["status"]))
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _processing_key_exists(db: Session, key: str) -> bool:
+    try:
+        return db.query(Video.id).filter(Video.processing_key == key).first() is not None
+    finally:
+        db.close()  # the stream can stay open for minutes
+
+@router.get("/status/{key}/events")
+async def stream_processing_status(key: str, db: Session = Depends(get_db)):
+    """Server-sent events: `progress` on every change, then one `done`."""
+    if not await asyncio.to_thread(_processing_key_exists, db, key):
+        raise HTTPException(status_code=404, detail="Processing key not found")
+
+    async def events():
+        updates = progress_hub.subscribe(key)
+        pending = None
         try:
-            resp = await client.get(f"{config.RUST_SERVICE_URL}/status/{key}")
-            return resp.json()
-        except Exception:
-            return {"status": "unknown"}
+            while True:
+                pending = pending or asyncio.ensure_future(updates.__anext__())
+                done, _ = await asyncio.wait({pending}, timeout=config.PROGRESS_KEEPALIVE_SECONDS)
+                if not done:
+                    # Keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                try:
+                    event = pending.result()
+                except StopAsyncIteration:
+                    return
+                pending = None
+                yield _sse("done" if event["status"] in TERMINAL else "progress", event)
+        finally:
+            # Runs on client disconnect too, which unsubscribes from the hub
+            if pending and not pending.done():
+                pending.cancel()
+                with contextlib.suppress(asyncio.CancelledError, StopAsyncIteration):
+                    await pending
+            await updates.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.post("/{video_id}/view")
@@ -460,11 +704,9 @@ def like_video(
         raise HTTPException(status_code=404, detail="Video not found")
     
     is_liked = crud_video.toggle_like(db, user_id=current_user.id, video_id=video_id)
+    db.refresh(video)
     
-    from app.models.models import Like
-    likes_count = db.query(func.count(Like.video_id)).filter(Like.video_id == video_id).scalar() or 0
-    
-    return {"status": "success", "liked": is_liked, "likes_count": likes_count}
+    return {"status": "success", "liked": is_liked, "likes_count": video.likes_count}
 
 
 @router.post("/{video_id}/share")
@@ -25,3 +25,79 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./montage.db")
 # Quota Limits
 FLASH_QUOTA_LIMIT = 50
 HOME_QUOTA_LIMIT = 20
+
+# Video Processing
+# The video-service POSTs completion events here, so it must be reachable from that service
+PROCESSING_CALLBACK_URL = os.getenv("PROCESSING_CALLBACK_URL", f"{BASE_URL}/api/v1/videos/processing-callback")
+# Uploads that get no completion event within this window are marked failed
+PROCESSING_TIMEOUT_SECONDS = int(os.getenv("PROCESSING_TIMEOUT_SECONDS", "1800"))
+PROCESSING_SWEEP_INTERVAL_SECONDS = int(os.getenv("PROCESSING_SWEEP_INTERVAL_SECONDS", "60"))
+# Package home videos for HLS as well (progressive MP4s are always kept as a fallback)
+HLS_ENABLED = os.getenv("HLS_ENABLED", "true").lower() == "true"
+# "per_rendition" (one ffmpeg per rendition) or "single_decode" (decode once, encode all outputs in one run)
+TRANSCODE_MODE = os.getenv("TRANSCODE_MODE", "per_rendition")
+# Render seek-preview sprite sheets (with a WebVTT index) for home videos
+SEEK_PREVIEW_ENABLED = os.getenv("SEEK_PREVIEW_ENABLED", "true").lower() == "true"
+
+# Processing Progress (one upstream poll per active task, shared by all listeners)
+PROGRESS_POLL_SECONDS = float(os.getenv("PROGRESS_POLL_SECONDS", "1"))
+PROGRESS_KEEPALIVE_SECONDS = 15
+
+# Job Queue (the API runs JOB_INLINE_WORKERS itself; for more throughput run `python worker.py`
+# next to it, or set JOB_INLINE_WORKERS=0 when dedicated workers handle every job)
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "4"))
+JOB_INLINE_WORKERS = int(os.getenv("JOB_INLINE_WORKERS", "1"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_RETRY_BASE_SECONDS = int(os.getenv("JOB_RETRY_BASE_SECONDS", "5"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+# Running jobs whose worker stops heartbeating for this long are handed to another worker
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "120"))
+
+# Resumable Uploads
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(20 * 1024 ** 3)))
+# Unfinished uploads idle longer than this are discarded
+UPLOAD_SESSION_TTL_HOURS = int(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24"))
+UPLOAD_CLEANUP_INTERVAL_SECONDS = int(os.getenv("UPLOAD_CLEANUP_INTERVAL_SECONDS", "3600"))
+# Chunks a user may stream at once, counted across all API workers
+MAX_CONCURRENT_UPLOADS_PER_USER = int(os.getenv("MAX_CONCURRENT_UPLOADS_PER_USER", "3"))
+# A PATCH renews its write lease while streaming; one left by a crashed worker lapses after this
+UPLOAD_WRITE_LEASE_SECONDS = int(os.getenv("UPLOAD_WRITE_LEASE_SECONDS", "60"))
+
+# Upload Validation (checked from the file header while the upload is received)
+ALLOWED_VIDEO_CODECS = set(os.getenv("ALLOWED_VIDEO_CODECS", "h264,hevc,av1,vp9,mpeg4,prores").split(","))
+FLASH_MAX_DURATION_SECONDS = int(os.getenv("FLASH_MAX_DURATION_SECONDS", "180"))
+HOME_MAX_DURATION_SECONDS = int(os.getenv("HOME_MAX_DURATION_SECONDS", str(4 * 3600)))
+# Longest side, in pixels
+MAX_VIDEO_DIMENSION = int(os.getenv("MAX_VIDEO_DIMENSION", "7680"))
+
+# Upload Admission (new uploads get 429 + Retry-After while over these limits)
+ADMISSION_MAX_PROCESSING = int(os.getenv("ADMISSION_MAX_PROCESSING", "100"))
+ADMISSION_MAX_PROCESSING_PER_USER = int(os.getenv("ADMISSION_MAX_PROCESSING_PER_USER", "3"))
+# Free space the temp filesystem must keep after an upload lands
+ADMISSION_MIN_FREE_BYTES = int(os.getenv("ADMISSION_MIN_FREE_BYTES", str(5 * 1024 ** 3)))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "30"))
+
+# Feed Pagination
+VIDEO_PAGE_SIZE = int(os.getenv("VIDEO_PAGE_SIZE", "20"))
+VIDEO_PAGE_SIZE_MAX = 100
+
+# Ranked Feeds
+FEED_RANK_TOP_N = int(os.getenv("FEED_RANK_TOP_N", "1000"))
+FEED_RANK_REFRESH_SECONDS = int(os.getenv("FEED_RANK_REFRESH_SECONDS", "60"))
+
+# Response Cache (set CACHE_URL, e.g. redis://localhost:6379/0, to share it across workers)
+CACHE_URL = os.getenv("CACHE_URL", "")
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "30"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "2048"))
+# Search results go stale faster than listings, so they get a shorter window
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "10"))
+
+# Search Autocomplete
+AUTOCOMPLETE_REFRESH_SECONDS = int(os.getenv("AUTOCOMPLETE_REFRESH_SECONDS", "300"))
+
+# Trending ("hours:weight" sliding windows; recent activity counts in every window it falls in)
+TRENDING_WINDOWS = [
+    (int(hours), float(weight))
+    for hours, weight in (w.split(":") for w in os.getenv("TRENDING_WINDOWS", "1:6,24:2,168:1").split(","))
+]
+TRENDING_REFRESH_SECONDS = int(os.getenv("TRENDING_REFRESH_SECONDS", "300"))
@@ -7,6 +7,7 @@ from app.core.config import SECRET_KEY, ALGORITHM
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 import hashlib
+import hmac
 
 def verify_password(plain_password, hashed_password):
     try:
@@ -35,3 +36,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+def processing_callback_token(task_id: str) -> str:
+    """Per-task secret the video-service echoes back on its completion callback."""
+    return hmac.new(SECRET_KEY.encode(), f"processing:{task_id}".encode(), hashlib.sha256).hexdigest()
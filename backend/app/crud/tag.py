@@ -0,0 +1,144 @@
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from app.models.models import Tag, VideoTag, PostTag, Video, Post
+from typing import List, Optional
+
+MAX_TAGS = 20
+MAX_TAG_LENGTH = 50
+# Related-tag facets are computed over at most this many of a tag's newest videos
+FACET_SAMPLE_SIZE = 1000
+
+def parse_tags(raw: Optional[str]) -> List[str]:
+    """Split the comma-separated tags column into normalized, unique names."""
+    names = []
+    for part in (raw or "").split(","):
+        name = part.strip().lstrip("#").strip().lower()[:MAX_TAG_LENGTH]
+        if name and name not in names:
+            names.append(name)
+    return names[:MAX_TAGS]
+
+def get_or_create_tags(db: Session, names: List[str]) -> List[Tag]:
+    if not names:
+        return []
+    existing = {t.name: t for t in db.query(Tag).filter(Tag.name.in_(names)).all()}
+    for name in names:
+        if name in existing:
+            continue
+        # A concurrent request may insert the same name after our select; the
+        # savepoint keeps its unique violation from aborting the caller's transaction
+        try:
+            with db.begin_nested():
+                tag = Tag(name=name, video_count=0, post_count=0)
+                db.add(tag)
+            existing[name] = tag
+        except IntegrityError:
+            existing[name] = db.query(Tag).filter(Tag.name == name).one()
+    return [existing[name] for name in names]
+
+def _bump_tag_counts(db: Session, tag_ids: List[int], column: str, delta: int):
+    if not tag_ids or not delta:
+        return
+    counter = getattr(Tag, column)
+    db.query(Tag).filter(Tag.id.in_(tag_ids)).update(
+        {counter: counter + delta}, synchronize_session=False
+    )
+
+def set_video_tags(db: Session, video: Video, raw: Optional[str]):
+    """Point the video's tag links at the tags in `raw`, adjusting facet counts."""
+    tags = get_or_create_tags(db, parse_tags(raw))
+    new_ids = {t.id for t in tags}
+    old_ids = {link.tag_id for link in video.tag_links}
+
+    for link in list(video.tag_links):
+        if link.tag_id not in new_ids:
+            video.tag_links.remove(link)
+    for tag_id in new_ids - old_ids:
+        video.tag_links.append(VideoTag(tag_id=tag_id))
+
+    if video.status == "approved":
+        _bump_tag_counts(db, list(old_ids - new_ids), "video_count", -1)
+        _bump_tag_counts(db, list(new_ids - old_ids), "video_count", 1)
+
+def set_post_tags(db: Session, post: Post, raw: Optional[str]):
+    tags = get_or_create_tags(db, parse_tags(raw))
+    new_ids = {t.id for t in tags}
+    old_ids = {link.tag_id for link in post.tag_links}
+
+    for link in list(post.tag_links):
+        if link.tag_id not in new_ids:
+            post.tag_links.remove(link)
+    for tag_id in new_ids - old_ids:
+        post.tag_links.append(PostTag(tag_id=tag_id))
+
+    _bump_tag_counts(db, list(old_ids - new_ids), "post_count", -1)
+    _bump_tag_counts(db, list(new_ids - old_ids), "post_count", 1)
+
+def on_video_status_change(db: Session, video: Video, old_status: Optional[str], new_status: Optional[str]):
+    """Keep video_count in step with approvals; pass new_status=None on delete."""
+    was_counted = old_status == "approved"
+    is_counted = new_status == "approved"
+    if was_counted != is_counted:
+        tag_ids = [link.tag_id for link in video.tag_links]
+        _bump_tag_counts(db, tag_ids, "video_count", 1 if is_counted else -1)
+
+def on_post_delete(db: Session, post: Post):
+    _bump_tag_counts(db, [link.tag_id for link in post.tag_links], "post_count", -1)
+
+def get_tag(db: Session, name: str):
+    return db.query(Tag).filter(Tag.name == name.strip().lstrip("#").lower()).first()
+
+def get_top_tags(db: Session, limit: int = 50):
+    return db.query(Tag).filter((Tag.video_count > 0) | (Tag.post_count > 0)).order_by(
+        (Tag.video_count + Tag.post_count).desc(), Tag.name
+    ).limit(limit).all()
+
+def get_tag_video_ids(db: Session, tag_id: int, limit: int, before_id: Optional[int] = None) -> List[int]:
+    """Approved video ids for a tag, newest (highest id) first."""
+    query = db.query(VideoTag.video_id).join(Video, Video.id == VideoTag.video_id).filter(
+        VideoTag.tag_id == tag_id, Video.status == "approved"
+    )
+    if before_id:
+        query = query.filter(VideoTag.video_id < before_id)
+    return [row[0] for row in query.order_by(VideoTag.video_id.desc()).limit(limit).all()]
+
+def get_tag_posts(db: Session, tag_id: int, limit: int, before_id: Optional[int] = None):
+    query = db.query(Post).options(joinedload(Post.owner)).join(PostTag, PostTag.post_id == Post.id).filter(PostTag.tag_id == tag_id)
+    if before_id:
+        query = query.filter(PostTag.post_id < before_id)
+    return query.order_by(PostTag.post_id.desc()).limit(limit).all()
+
+def get_related_tags(db: Session, tag_id: int, limit: int = 10):
+    """Facet counts: tags co-occurring with `tag_id` on its newest approved videos."""
+    recent_ids = db.query(VideoTag.video_id).filter(VideoTag.tag_id == tag_id).order_by(
+        VideoTag.video_id.desc()
+    ).limit(FACET_SAMPLE_SIZE).subquery()
+
+    rows = db.query(Tag.name, func.count(VideoTag.video_id)).join(
+        VideoTag, VideoTag.tag_id == Tag.id
+    ).join(
+        Video, Video.id == VideoTag.video_id
+    ).filter(
+        VideoTag.video_id.in_(select(recent_ids.c.video_id)),
+        VideoTag.tag_id != tag_id,
+        Video.status == "approved"
+    ).group_by(Tag.name).order_by(func.count(VideoTag.video_id).desc(), Tag.name).limit(limit).all()
+    return [{"name": name, "count": count} for name, count in rows]
+
+def rebuild_tag_index(db: Session, batch_size: int = 500):
+    """Backfill tag links and counts from the raw tags columns."""
+    db.query(VideoTag).delete()
+    db.query(PostTag).delete()
+    db.query(Tag).update({Tag.video_count: 0, Tag.post_count: 0})
+    db.commit()
+
+    for model, setter in ((Video, set_video_tags), (Post, set_post_tags)):
+        last_id = 0
+        while True:
+            rows = db.query(model).filter(model.id > last_id, model.tags.isnot(None)).order_by(model.id).limit(batch_size).all()
+            if not rows:
+                break
+            for row in rows:
+                setter(db, row, row.tags)
+            db.commit()
+            last_id = rows[-1].id
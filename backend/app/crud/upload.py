@@ -0,0 +1,96 @@
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import UPLOAD_SESSION_TTL_HOURS, UPLOAD_WRITE_LEASE_SECONDS
+from app.models.models import UploadSession
+from app.schemas import schemas
+
+def _safe_filename(filename: str) -> str:
+    name = re.sub(r"[^\w.\-]", "_", os.path.basename(filename or ""))
+    return name.lstrip(".") or "upload"
+
+def create_upload_session(db: Session, upload: schemas.UploadCreate, user_id: int):
+    temp_dir = tempfile.mkdtemp()
+    temp_path = os.path.join(temp_dir, _safe_filename(upload.filename))
+    open(temp_path, "wb").close()
+
+    db_upload = UploadSession(
+        id=uuid4().hex,
+        owner_id=user_id,
+        title=upload.title,
+        description=upload.description,
+        tags=upload.tags,
+        video_type=upload.video_type,
+        filename=upload.filename,
+        length=upload.length,
+        bytes_received=0,
+        temp_path=temp_path
+    )
+    db.add(db_upload)
+    db.commit()
+    db.refresh(db_upload)
+    return db_upload
+
+def get_upload_session(db: Session, upload_id: str):
+    return db.query(UploadSession).filter(UploadSession.id == upload_id).first()
+
+def received_bytes(upload: UploadSession) -> int:
+    """The file on disk is authoritative: it survives a crash between writing
+    a chunk and recording its offset."""
+    try:
+        return os.path.getsize(upload.temp_path)
+    except OSError:
+        return 0
+
+def claim_writer(db: Session, upload: UploadSession, max_per_owner: int) -> bool:
+    """Take the session's write lease in one conditional UPDATE.
+
+    Fails while another PATCH holds a live lease on this session, or while the
+    owner already has `max_per_owner` sessions streaming. The decision is made
+    in the database, so it holds across workers and replicas.
+    """
+    now = datetime.now()
+    live_after = now - timedelta(seconds=UPLOAD_WRITE_LEASE_SECONDS)
+    other = aliased(UploadSession)
+    streaming = select(func.count(other.id)).where(
+        other.owner_id == upload.owner_id, other.writing_since >= live_after
+    ).scalar_subquery()
+    claimed = db.query(UploadSession).filter(
+        UploadSession.id == upload.id,
+        or_(UploadSession.writing_since.is_(None), UploadSession.writing_since < live_after),
+        streaming < max_per_owner
+    ).update({UploadSession.writing_since: now}, synchronize_session=False)
+    db.commit()
+    return claimed == 1
+
+def writer_active(upload: UploadSession) -> bool:
+    cutoff = datetime.now() - timedelta(seconds=UPLOAD_WRITE_LEASE_SECONDS)
+    return upload.writing_since is not None and upload.writing_since >= cutoff
+
+def renew_writer(db: Session, upload_id: str):
+    db.query(UploadSession).filter(
+        UploadSession.id == upload_id, UploadSession.writing_since.isnot(None)
+    ).update({UploadSession.writing_since: datetime.now()}, synchronize_session=False)
+    db.commit()
+
+def delete_upload_session(db: Session, upload: UploadSession):
+    # Finalized uploads hand their temp dir to the processing pipeline
+    if not upload.video_id:
+        shutil.rmtree(os.path.dirname(upload.temp_path), ignore_errors=True)
+    db.delete(upload)
+    db.commit()
+
+def expire_upload_sessions(db: Session, now: datetime = None):
+    """Drop sessions idle for longer than UPLOAD_SESSION_TTL_HOURS."""
+    cutoff = (now or datetime.now()) - timedelta(hours=UPLOAD_SESSION_TTL_HOURS)
+    stale = db.query(UploadSession).filter(UploadSession.updated_at < cutoff).all()
+    for upload in stale:
+        delete_upload_session(db, upload)
+    return len(stale)
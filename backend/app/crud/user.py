@@ -1,8 +1,11 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func
 from app.schemas import schemas
 from app.core import security
 from app.models.models import User, Follow, Video, Post, VerificationCode
+from app.utils.autocomplete import autocomplete, normalize
+from app.utils.cache import response_cache, SEARCH
+from app.core.config import SEARCH_CACHE_TTL_SECONDS
 from datetime import datetime, timedelta
 import random
 import string
@@ -37,6 +40,7 @@ def create_user(db: Session, user: schemas.UserCreate, google_id: str = None, is
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    autocomplete.update_user(db_user)
     return db_user
 
 def update_user_role(db: Session, user_id: int, role: str):
@@ -65,11 +69,31 @@ def update_user(db: Session, user_id: int, user_update: schemas.UserUpdate):
     
     db.commit()
     db.refresh(user)
+    if user_update.username or user_update.full_name:
+        autocomplete.update_user(user)
     return user
 
 def get_user_by_id(db: Session, user_id: int):
     return db.query(User).filter(User.id == user_id).first()
 
+def search_users(db: Session, query_str: str, limit: int = 10, offset: int = 0):
+    """Users matched by username/full-name prefix, most-followed first.
+
+    Served from the in-memory prefix index, so the cost depends on the page
+    size rather than on how many users match. Returns (users, has_more).
+    """
+    autocomplete.ensure_ready(db)
+    user_ids, has_more = response_cache.memoize(
+        SEARCH,
+        {"users": normalize(query_str), "limit": limit, "offset": offset},
+        lambda: autocomplete.search_users(query_str, offset=offset, limit=limit),
+        ttl=SEARCH_CACHE_TTL_SECONDS
+    )
+    if not user_ids:
+        return [], False
+    by_id = {u.id: u for u in db.query(User).filter(User.id.in_(user_ids)).all()}
+    return [by_id[user_id] for user_id in user_ids if user_id in by_id], has_more
+
 def get_user_profile(db: Session, username: str, current_user_id: int = None):
     db_user = get_user_by_username(db, username)
     if not db_user:
@@ -89,12 +113,13 @@ def get_user_profile(db: Session, username: str, current_user_id: int = None):
         is_following = db.query(Follow).filter(Follow.follower_id == current_user_id, Follow.followed_id == user_id).first() is not None
 
     # Videos - Fetch all statuses (Pending, Approved, Failed) for user's own view
-    all_videos = db.query(Video).filter(Video.owner_id == user_id).all()
+    all_videos = crud_video.query_videos(db).filter(Video.owner_id == user_id).all()
+    crud_video.hydrate_videos(db, all_videos, current_user_id=current_user_id)
     videos = [v for v in all_videos if v.video_type == "home"]
     flash_videos = [v for v in all_videos if v.video_type == "flash"]
     
     # Posts
-    posts = db.query(Post).filter(Post.owner_id == user_id).all()
+    posts = db.query(Post).options(joinedload(Post.owner)).filter(Post.owner_id == user_id).all()
 
     profile_data = {
         "id": db_user.id,
@@ -127,6 +152,7 @@ def get_user_profile(db: Session, username: str, current_user_id: int = None):
     return profile_data
 
 from app.crud import achievement as crud_achievement
+from app.crud import video as crud_video
 from app.crud import notification as crud_notification
 from app.utils.push import notify_user_push
 from app.schemas.notification import NotificationCreate
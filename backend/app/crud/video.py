@@ -1,12 +1,102 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, text
-from app.models.models import Video, Like, Comment, View, User, Post, SponsoredAd
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, desc, text, or_, and_, select
+from app.models.models import Video, Like, Comment, View, User, Post, SponsoredAd, Job
 from app.schemas import schemas
-from datetime import datetime
-from typing import Optional
+from app.crud import tag as crud_tag
+from app.utils.ranking import feed_ranker
+from app.utils.search import search_index, query_terms
+from app.utils.autocomplete import autocomplete
+from app.utils.cache import response_cache, VIDEO_LISTS, SEARCH, video_namespace
+from app.core.config import SEARCH_CACHE_TTL_SECONDS, PROCESSING_TIMEOUT_SECONDS
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
 
-def get_videos(db: Session, video_type: str = None, filter_status: str = "approved", current_user_id: int = None):
-    query = db.query(Video)
+def query_videos(db: Session):
+    """Base query for anything serialized as schemas.Video.
+
+    Loads the owner in the same SELECT; otherwise each row's `owner` (and
+    `owner_username`) fires its own lazy query during serialization.
+    """
+    return db.query(Video).options(joinedload(Video.owner))
+
+def hydrate_videos(db: Session, videos: List[Video], current_user_id: int = None):
+    """Fill liked_by_user for a list of videos with a single query.
+
+    likes_count and comments_count are stored on the row itself (kept current
+    by toggle_like/create_comment), so only the per-viewer flag needs a lookup.
+    """
+    if not videos:
+        return videos
+
+    liked_ids = set()
+    if current_user_id:
+        video_ids = [video.id for video in videos]
+        liked_ids = {
+            row[0] for row in db.query(Like.video_id)
+            .filter(Like.video_id.in_(video_ids), Like.user_id == current_user_id)
+            .all()
+        }
+
+    for video in videos:
+        video.liked_by_user = video.id in liked_ids
+
+    return videos
+
+def hydrate_posts(db: Session, posts: List[Post], current_user_id: int = None):
+    """Post counterpart of hydrate_videos."""
+    if not posts:
+        return posts
+
+    liked_ids = set()
+    if current_user_id:
+        post_ids = [post.id for post in posts]
+        liked_ids = {
+            row[0] for row in db.query(Like.post_id)
+            .filter(Like.post_id.in_(post_ids), Like.user_id == current_user_id)
+            .all()
+        }
+
+    for post in posts:
+        post.liked_by_user = post.id in liked_ids
+
+    return posts
+
+def _invalidate_counts(video_id: int):
+    # Listings embed likes_count/comments_count too, not just the detail view
+    response_cache.invalidate(VIDEO_LISTS, video_namespace(video_id))
+
+def _rerank(db: Session, video_id: Optional[int]):
+    if not video_id:
+        return
+    _invalidate_counts(video_id)
+    video = db.get(Video, video_id)
+    if video:
+        feed_ranker.update(video)
+
+def _bump_counter(db: Session, column: str, delta: int, video_id: Optional[int] = None, post_id: Optional[int] = None):
+    # Single UPDATE ... SET col = col + delta so concurrent writers never lose increments
+    model, target_id = (Video, video_id) if video_id else (Post, post_id)
+    counter = getattr(model, column)
+    db.query(model).filter(model.id == target_id).update(
+        {counter: func.coalesce(counter, 0) + delta},
+        synchronize_session=False
+    )
+
+def get_videos(
+    db: Session,
+    video_type: str = None,
+    filter_status: str = "approved",
+    current_user_id: int = None,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None
+):
+    """Newest-first video feed.
+
+    `after` is a decoded (created_at, id) keyset position; only videos strictly
+    older than it are returned. Paging on the composite index keeps every page
+    equally cheap, however deep the client scrolls.
+    """
+    query = query_videos(db)
     from datetime import timedelta
     twenty_four_hours_ago = datetime.now() - timedelta(hours=24)
     
@@ -19,54 +109,71 @@ def get_videos(db: Session, video_type: str = None, filter_status: str = "approv
         query = query.filter(Video.video_type == video_type)
     if filter_status:
         query = query.filter(Video.status == filter_status)
-    
-    videos = query.all()
-    
-    for video in videos:
-        video.likes_count = db.query(func.count(Like.video_id)).filter(Like.video_id == video.id).scalar() or 0
-        video.comments_count = db.query(func.count(Comment.id)).filter(Comment.video_id == video.id).scalar() or 0
-        
-        if current_user_id:
-            video.liked_by_user = db.query(Like).filter(Like.video_id == video.id, Like.user_id == current_user_id).first() is not None
-        else:
-            video.liked_by_user = False
-            
-    return videos
+    if after:
+        after_created_at, after_id = after
+        query = query.filter(
+            or_(
+                Video.created_at < after_created_at,
+                and_(Video.created_at == after_created_at, Video.id < after_id)
+            )
+        )
+
+    query = query.order_by(Video.created_at.desc(), Video.id.desc())
+    if limit:
+        query = query.limit(limit)
 
-def search_videos(db: Session, query_str: str, status: str = "approved", current_user_id: int = None):
-    query = db.query(Video)
-    if status:
-        query = query.filter(Video.status == status)
-    
-    if query_str:
-        query = query.filter(Video.title.ilike(f"%{query_str}%"))
-        
     videos = query.all()
-    
-    for video in videos:
-        video.likes_count = db.query(func.count(Like.video_id)).filter(Like.video_id == video.id).scalar() or 0
-        video.comments_count = db.query(func.count(Comment.id)).filter(Comment.video_id == video.id).scalar() or 0
-        
-        if current_user_id:
-            video.liked_by_user = db.query(Like).filter(Like.video_id == video.id, Like.user_id == current_user_id).first() is not None
-        else:
-            video.liked_by_user = False
-            
-    return videos
+    return hydrate_videos(db, videos, current_user_id=current_user_id)
+
+def get_videos_by_ids(db: Session, video_ids: List[int], current_user_id: int = None):
+    """Load and hydrate videos, preserving the order of `video_ids`."""
+    if not video_ids:
+        return []
+    by_id = {v.id: v for v in query_videos(db).filter(Video.id.in_(video_ids)).all()}
+    videos = [by_id[video_id] for video_id in video_ids if video_id in by_id]
+    return hydrate_videos(db, videos, current_user_id=current_user_id)
+
+def get_ranked_videos(db: Session, video_type: str, offset: int = 0, limit: int = 20, current_user_id: int = None):
+    """Serve one slice of the precomputed ranking. Returns (videos, has_more)."""
+    video_ids, has_more = feed_ranker.page(video_type, offset, limit)
+    return get_videos_by_ids(db, video_ids, current_user_id=current_user_id), has_more
+
+def search_videos(
+    db: Session,
+    query_str: str,
+    status: str = "approved",
+    current_user_id: int = None,
+    limit: int = 20,
+    offset: int = 0
+):
+    """Full-text search over title, description and tags, ranked by relevance
+    blended with popularity. An empty query returns the newest videos.
+
+    Hit ids are cached briefly under the normalized query, so a burst of
+    identical searches runs the ranking query once; only hydration is per caller.
+    """
+    if not query_str or not query_str.strip():
+        query = query_videos(db)
+        if status:
+            query = query.filter(Video.status == status)
+        videos = query.order_by(Video.created_at.desc(), Video.id.desc()).offset(offset).limit(limit).all()
+        return hydrate_videos(db, videos, current_user_id=current_user_id)
+
+    normalized = " ".join(query_terms(query_str))
+    video_ids = response_cache.memoize(
+        SEARCH,
+        {"q": normalized, "status": status, "limit": limit, "offset": offset},
+        lambda: [video_id for video_id, _ in search_index.search(db, normalized, status=status, limit=limit, offset=offset)],
+        ttl=SEARCH_CACHE_TTL_SECONDS
+    )
+    return get_videos_by_ids(db, video_ids, current_user_id=current_user_id)
 
 def get_video(db: Session, video_id: int, current_user_id: int = None):
-    video = db.query(Video).filter(Video.id == video_id).first()
+    video = query_videos(db).filter(Video.id == video_id).first()
     if not video:
         return None
     
-    video.likes_count = db.query(func.count(Like.video_id)).filter(Like.video_id == video_id).scalar() or 0
-    video.comments_count = db.query(func.count(Comment.id)).filter(Comment.video_id == video_id).scalar() or 0
-    
-    if current_user_id:
-        video.liked_by_user = db.query(Like).filter(Like.video_id == video_id, Like.user_id == current_user_id).first() is not None
-    else:
-        video.liked_by_user = False
-        
+    hydrate_videos(db, [video], current_user_id=current_user_id)
     return video
 
 from app.crud import achievement as crud_achievement
@@ -80,6 +187,9 @@ def create_video(db: Session, video: schemas.VideoCreate, user_id: int):
     video_data = video.model_dump()
     db_video = Video(**video_data, owner_id=user_id)
     db.add(db_video)
+    db.flush()
+    search_index.index_video(db, db_video)
+    crud_tag.set_video_tags(db, db_video, db_video.tags)
     db.commit()
     db.refresh(db_video)
     return db_video
@@ -88,6 +198,8 @@ def create_post(db: Session, post: schemas.PostCreate, user_id: int):
     post_data = post.model_dump()
     db_post = Post(**post_data, owner_id=user_id)
     db.add(db_post)
+    db.flush()
+    crud_tag.set_post_tags(db, db_post, db_post.tags)
     db.commit()
     db.refresh(db_post)
     return db_post
@@ -104,12 +216,16 @@ def toggle_like(db: Session, user_id: int, video_id: Optional[int] = None, post_
     existing = query.first()
     if existing:
         db.delete(existing)
+        _bump_counter(db, "likes_count", -1, video_id=video_id, post_id=post_id)
         db.commit()
+        _rerank(db, video_id)
         return False
     else:
         new_like = Like(user_id=user_id, video_id=video_id, post_id=post_id)
         db.add(new_like)
+        _bump_counter(db, "likes_count", 1, video_id=video_id, post_id=post_id)
         db.commit()
+        _rerank(db, video_id)
 
         # Notify owner
         try:
@@ -142,6 +258,7 @@ def increment_share(db: Session, video_id: int):
         video.shares = (video.shares or 0) + 1
         db.commit()
         db.refresh(video)
+        feed_ranker.update(video)
         return video
     return None
 
@@ -173,6 +290,7 @@ def increment_view(db: Session, user_id: Optional[int] = None, video_id: Optiona
             target.views = (target.views or 0) + 1
             db.commit()
             db.refresh(target)
+            feed_ranker.update(target)
             return target
     elif post_id:
         target = db.query(Post).filter(Post.id == post_id).first()
@@ -193,8 +311,11 @@ def create_comment(db: Session, comment: schemas.CommentBase, user_id: int, vide
     comment_data = comment.model_dump()
     db_comment = Comment(**comment_data, video_id=video_id, post_id=post_id, owner_id=user_id)
     db.add(db_comment)
+    _bump_counter(db, "comments_count", 1, video_id=video_id, post_id=post_id)
     db.commit()
     db.refresh(db_comment)
+    if video_id:
+        _invalidate_counts(video_id)
 
     # Notify owner
     try:
@@ -232,7 +353,89 @@ def get_comments(db: Session, video_id: Optional[int] = None, post_id: Optional[
 def delete_video(db: Session, video_id: int):
     video = db.query(Video).filter(Video.id == video_id).first()
     if video:
+        search_index.remove_video(db, video_id)
+        crud_tag.on_video_status_change(db, video, video.status, None)
         db.delete(video)
         db.commit()
+        feed_ranker.remove(video_id)
+        autocomplete.remove_video(video_id)
+        response_cache.invalidate(VIDEO_LISTS, SEARCH, video_namespace(video_id))
         return True
     return False
+
+def mark_processing_failed(db: Session, video: Video):
+    """Fail the upload and give its slot back to the owner's quota.
+
+    A no-op for videos that were published or already failed, so a late or
+    repeated failure can neither unpublish a video nor refund it twice.
+    """
+    if video.video_url or video.failed_at:
+        return
+    video.status = "failed"
+    video.failed_at = func.now()
+    owner = db.query(User).filter(User.id == video.owner_id).first()
+    if owner:
+        if video.video_type == "flash":
+            owner.flash_uploads = max(0, (owner.flash_uploads or 1) - 1)
+        else:
+            owner.home_uploads = max(0, (owner.home_uploads or 1) - 1)
+    db.commit()
+
+def get_processed_duplicate(db: Session, video: Video):
+    """A finished video with the same content and type whose renditions can be reused."""
+    return db.query(Video).filter(
+        Video.content_hash == video.content_hash,
+        Video.video_type == video.video_type,
+        Video.id != video.id,
+        Video.video_url != "",
+        Video.failed_at.is_(None)
+    ).order_by(Video.id.desc()).first()
+
+def get_stalled_processing(db: Session, now: datetime = None):
+    """Uploads whose completion callback has not arrived in time.
+
+    The clock starts when the video-service accepted the job, not at upload,
+    so time spent waiting in the job queue does not count.
+    """
+    cutoff = (now or datetime.now()) - timedelta(seconds=PROCESSING_TIMEOUT_SECONDS)
+    submitted = select(Job.key).where(Job.kind == "process_video", Job.status == "done", Job.finished_at < cutoff)
+    active = select(Job.key).where(Job.status.in_(["queued", "running"]), Job.key.isnot(None))
+    stalled = db.query(Video).filter(
+        Video.processing_key.in_(submitted),
+        Video.processing_key.notin_(active),
+        Video.video_url == "",
+        Video.failed_at.is_(None),
+        Video.status == "pending"
+    ).all()
+    return stalled
+
+def reconcile_engagement_counters(db: Session, batch_size: int = 1000):
+    """Repair drift between the stored likes/comments counters and the raw tables.
+
+    Walks videos and posts in id ranges so each UPDATE stays short, and only
+    rewrites rows whose stored counters disagree. Returns the number of rows fixed.
+    """
+    repaired = 0
+    targets = (
+        (Video, Like.video_id, Comment.video_id),
+        (Post, Like.post_id, Comment.post_id),
+    )
+    for model, like_fk, comment_fk in targets:
+        likes_sq = select(func.count(Like.id)).where(like_fk == model.id).scalar_subquery()
+        comments_sq = select(func.count(Comment.id)).where(comment_fk == model.id).scalar_subquery()
+
+        max_id = db.query(func.max(model.id)).scalar() or 0
+        for start in range(0, max_id + 1, batch_size):
+            repaired += db.query(model).filter(
+                model.id >= start,
+                model.id < start + batch_size,
+                or_(
+                    func.coalesce(model.likes_count, -1) != likes_sq,
+                    func.coalesce(model.comments_count, -1) != comments_sq
+                )
+            ).update(
+                {model.likes_count: likes_sq, model.comments_count: comments_sq},
+                synchronize_session=False
+            )
+            db.commit()
+    return repaired
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Float, Text, DateTime, func
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, ForeignKey, Float, Text, DateTime, Index, JSON, func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 import enum
@@ -87,7 +87,10 @@ class Video(Base):
     url_1080p = Column(String, nullable=True)
     url_2k = Column(String, nullable=True)
     url_4k = Column(String, nullable=True)
+    manifest_url = Column(String, nullable=True) # HLS master playlist
     thumbnail_url = Column(String)
+    thumbnails = Column(JSON, nullable=True) # {"grid": {"webp": url, "jpg": url}, "card": ..., "hero": ...}
+    seek_preview_url = Column(String, nullable=True) # WebVTT index into the sprite sheets
     video_type = Column(String) # home or flash
     status = Column(String, default=ApprovalStatus.PENDING)
     owner_id = Column(Integer, ForeignKey("users.id"))
@@ -95,7 +98,19 @@ class Video(Base):
     earnings = Column(Float, default=0.0)
     shares = Column(Integer, default=0)
     duration = Column(Integer, default=0)
+    # Source media details, filled from the video-service probe
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    fps = Column(Float, nullable=True)
+    bitrate = Column(BigInteger, nullable=True)
+    video_codec = Column(String, nullable=True)
+    audio_codec = Column(String, nullable=True)
+    file_size = Column(BigInteger, nullable=True)
+    rendition_sizes = Column(JSON, nullable=True) # {"720p": bytes, ...}
+    likes_count = Column(Integer, default=0, server_default="0", nullable=False)
+    comments_count = Column(Integer, default=0, server_default="0", nullable=False)
     processing_key = Column(String, nullable=True)
+    content_hash = Column(String(64), nullable=True, index=True) # SHA-256 of the uploaded file
     tags = Column(Text, nullable=True) # Comma-separated tags
     failed_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=func.now())
@@ -103,6 +118,12 @@ class Video(Base):
     owner = relationship("User", back_populates="videos")
     comments = relationship("Comment", back_populates="video", cascade="all, delete-orphan")
     likes = relationship("Like", back_populates="video", cascade="all, delete-orphan")
+    tag_links = relationship("VideoTag", back_populates="video", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Keyset pagination for feeds: WHERE status = ? ORDER BY created_at DESC, id DESC
+        Index("ix_videos_status_created_at_id", "status", "created_at", "id"),
+    )
 
     @property
     def owner_username(self):
@@ -121,6 +142,11 @@ class View(Base):
     video = relationship("Video")
     post = relationship("Post")
 
+    __table_args__ = (
+        # Sliding-window trending counts: WHERE created_at >= ? GROUP BY video_id
+        Index("ix_views_created_at_video_id", "created_at", "video_id"),
+    )
+
 class Like(Base):
     __tablename__ = "likes"
 
@@ -134,6 +160,10 @@ class Like(Base):
     video = relationship("Video", back_populates="likes")
     post = relationship("Post", back_populates="likes")
 
+    __table_args__ = (
+        Index("ix_likes_created_at_video_id", "created_at", "video_id"),
+    )
+
 class Post(Base):
     __tablename__ = "posts"
 
@@ -143,6 +173,8 @@ class Post(Base):
     owner_id = Column(Integer, ForeignKey("users.id"))
     original_post_id = Column(Integer, ForeignKey("posts.id"), nullable=True)
     views_count = Column(Integer, default=0)
+    likes_count = Column(Integer, default=0, server_default="0", nullable=False)
+    comments_count = Column(Integer, default=0, server_default="0", nullable=False)
     tags = Column(Text, nullable=True) # Comma-separated tags
 
     owner = relationship("User", back_populates="posts")
@@ -152,6 +184,76 @@ class Post(Base):
     
     likes = relationship("Like", back_populates="post", cascade="all, delete-orphan")
     comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
+    tag_links = relationship("PostTag", back_populates="post", cascade="all, delete-orphan")
+
+class Tag(Base):
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True)
+    # Facet counts; video_count only includes approved videos
+    video_count = Column(Integer, default=0, server_default="0", nullable=False)
+    post_count = Column(Integer, default=0, server_default="0", nullable=False)
+
+class VideoTag(Base):
+    __tablename__ = "video_tags"
+
+    # (tag_id, video_id) doubles as the index for paging a tag newest-first
+    tag_id = Column(Integer, ForeignKey("tags.id"), primary_key=True)
+    video_id = Column(Integer, ForeignKey("videos.id"), primary_key=True, index=True)
+
+    tag = relationship("Tag")
+    video = relationship("Video", back_populates="tag_links")
+
+class PostTag(Base):
+    __tablename__ = "post_tags"
+
+    tag_id = Column(Integer, ForeignKey("tags.id"), primary_key=True)
+    post_id = Column(Integer, ForeignKey("posts.id"), primary_key=True, index=True)
+
+    tag = relationship("Tag")
+    post = relationship("Post", back_populates="tag_links")
+
+class UploadSession(Base):
+    __tablename__ = "upload_sessions"
+
+    id = Column(String, primary_key=True) # Opaque token handed to the client
+    owner_id = Column(Integer, ForeignKey("users.id"), index=True)
+    title = Column(String)
+    description = Column(Text, nullable=True)
+    tags = Column(Text, nullable=True)
+    video_type = Column(String)
+    filename = Column(String)
+    length = Column(BigInteger) # Declared total size in bytes
+    bytes_received = Column(BigInteger, default=0, server_default="0", nullable=False)
+    temp_path = Column(String)
+    video_id = Column(Integer, ForeignKey("videos.id"), nullable=True) # Set once finalized
+    writing_since = Column(DateTime, nullable=True) # Write lease of the PATCH streaming a chunk
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), index=True)
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String) # Registered handler name, e.g. process_video
+    key = Column(String, nullable=True, index=True) # What the job is about, e.g. a processing key
+    payload = Column(Text) # JSON keyword arguments for the handler
+    priority = Column(Integer, default=0, server_default="0", nullable=False) # Higher runs first
+    status = Column(String, default="queued") # queued, running, done or failed
+    attempts = Column(Integer, default=0, server_default="0", nullable=False)
+    max_attempts = Column(Integer, default=5, server_default="5", nullable=False)
+    run_at = Column(DateTime, default=func.now()) # Not claimed before this (retry backoff)
+    locked_by = Column(String, nullable=True)
+    locked_at = Column(DateTime, nullable=True) # Lease heartbeat while running
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Claiming: WHERE status = 'queued' AND run_at <= now ORDER BY priority DESC, run_at
+        Index("ix_jobs_status_priority_run_at", "status", "priority", "run_at"),
+    )
 
 class Comment(Base):
     __tablename__ = "comments"
@@ -177,6 +279,10 @@ class Follow(Base):
     follower = relationship("User", foreign_keys=[follower_id], back_populates="following")
     followed = relationship("User", foreign_keys=[followed_id], back_populates="followers")
 
+    __table_args__ = (
+        Index("ix_follows_created_at_followed_id", "created_at", "followed_id"),
+    )
+
 class Repost(Base):
     __tablename__ = "reposts"
 
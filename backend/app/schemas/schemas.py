@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict, field_validator
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 class UserBase(BaseModel):
@@ -103,6 +103,7 @@ class VideoCreate(VideoBase):
     thumbnail_url: str
     duration: Optional[int] = 0
     processing_key: Optional[str] = None
+    content_hash: Optional[str] = None
     description: Optional[str] = None
 
 class Video(VideoBase):
@@ -113,7 +114,11 @@ class Video(VideoBase):
     url_1080p: Optional[str] = None
     url_2k: Optional[str] = None
     url_4k: Optional[str] = None
+    manifest_url: Optional[str] = None
     thumbnail_url: str
+    # Sized copies of the generated poster; absent for custom thumbnails
+    thumbnails: Optional[Dict[str, Dict[str, str]]] = None
+    seek_preview_url: Optional[str] = None
     status: str
     owner_id: int
     owner: Optional[UserBase] = None
@@ -125,6 +130,14 @@ class Video(VideoBase):
     liked_by_user: bool = False
     owner_followed: bool = False
     duration: int = 0
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
+    bitrate: Optional[int] = None
+    video_codec: Optional[str] = None
+    audio_codec: Optional[str] = None
+    file_size: Optional[int] = None
+    rendition_sizes: Optional[Dict[str, int]] = None
     processing_key: Optional[str] = None
     failed_at: Optional[datetime] = None
     created_at: Optional[datetime] = None
@@ -189,3 +202,60 @@ class Achievement(BaseModel):
 class UnifiedSearchResponse(BaseModel):
     videos: List[Video]
     users: List[User]
+    videos_next_cursor: Optional[str] = None
+    users_next_cursor: Optional[str] = None
+
+class TagFacet(BaseModel):
+    name: str
+    count: int
+
+class Tag(BaseModel):
+    name: str
+    video_count: int = 0
+    post_count: int = 0
+
+    model_config = ConfigDict(from_attributes=True)
+
+class TagVideoPage(BaseModel):
+    tag: Tag
+    videos: List[Video]
+    next_cursor: Optional[str] = None
+    related_tags: List[TagFacet] = []
+
+class TagPostPage(BaseModel):
+    tag: Tag
+    posts: List[Post]
+    next_cursor: Optional[str] = None
+
+class UploadCreate(BaseModel):
+    title: str
+    description: Optional[str] = None
+    tags: Optional[str] = None
+    video_type: str
+    filename: str
+    length: int
+
+class UploadStatus(BaseModel):
+    upload_id: str
+    offset: int
+    length: int
+    video: Optional[Video] = None
+
+class MediaInfo(BaseModel):
+    duration: float = 0
+    width: int
+    height: int
+    video_codec: Optional[str] = None
+    audio_codec: Optional[str] = None
+    bitrate: int = 0
+    fps: float = 0
+    size: int = 0
+    rendition_sizes: Dict[str, int] = {}
+
+class ProcessingEvent(BaseModel):
+    task_id: str
+    status: str # completed or error
+    message: Optional[str] = None
+    video_path: str
+    skip_thumbnail: bool = False
+    media: Optional[MediaInfo] = None
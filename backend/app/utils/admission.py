@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import shutil
+import tempfile
+import threading
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from jose import JWTError, jwt
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from starlette.datastructures import Headers
+
+from app.core import config
+from app.db.session import SessionLocal
+from app.models.models import UploadSession, User, Video
+
+logger = logging.getLogger(__name__)
+
+LEGACY_UPLOAD_PATH = "/api/v1/videos/upload"
+
+
+class AdmissionController:
+    """Decides whether a new upload may start, before any of it is written.
+
+    An upload is admitted while the videos still being processed, plus open
+    resumable upload sessions and the multipart uploads this worker is
+    receiving, stay under a global and a per-user limit, and the
+    temp filesystem keeps ADMISSION_MIN_FREE_BYTES free once the upload lands.
+    Otherwise the client gets 429 with Retry-After.
+    """
+
+    def __init__(
+        self,
+        max_processing: int = config.ADMISSION_MAX_PROCESSING,
+        max_processing_per_user: int = config.ADMISSION_MAX_PROCESSING_PER_USER,
+        min_free_bytes: int = config.ADMISSION_MIN_FREE_BYTES,
+        retry_after: int = config.ADMISSION_RETRY_AFTER_SECONDS
+    ):
+        self.max_processing = max_processing
+        self.max_processing_per_user = max_processing_per_user
+        self.min_free_bytes = min_free_bytes
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        # Admitted uploads whose body is still arriving, per user
+        self._receiving: Dict[int, int] = {}
+        self._rejected: Dict[str, int] = {"disk": 0, "global": 0, "user": 0}
+
+    def _reject(self, kind: str, detail: str):
+        with self._lock:
+            self._rejected[kind] += 1
+        logger.info("Upload rejected (%s): %s", kind, detail)
+        raise HTTPException(status_code=429, detail=detail, headers={"Retry-After": str(self.retry_after)})
+
+    def _processing(self, db: Session, user_id: Optional[int] = None) -> int:
+        query = db.query(func.count(Video.id)).filter(
+            Video.status == "pending", Video.video_url == "", Video.failed_at.is_(None)
+        )
+        if user_id is not None:
+            query = query.filter(Video.owner_id == user_id)
+        return query.scalar() or 0
+
+    def _uploading(self, db: Session, user_id: Optional[int] = None) -> int:
+        # Resumable sessions hold their slot until they become a pending video
+        # (counted by _processing from then on) or expire
+        query = db.query(func.count(UploadSession.id)).filter(UploadSession.video_id.is_(None))
+        if user_id is not None:
+            query = query.filter(UploadSession.owner_id == user_id)
+        return query.scalar() or 0
+
+    def _pending_bytes(self, db: Session) -> int:
+        """Bytes still to arrive for the open resumable sessions."""
+        return db.query(func.sum(UploadSession.length - UploadSession.bytes_received)).filter(
+            UploadSession.video_id.is_(None)
+        ).scalar() or 0
+
+    def _in_flight(self, db: Session, user_id: Optional[int] = None) -> int:
+        return self._processing(db, user_id) + self._uploading(db, user_id)
+
+    def free_bytes(self) -> int:
+        return shutil.disk_usage(tempfile.gettempdir()).free
+
+    def check_disk(self, incoming_bytes: int):
+        if self.free_bytes() - incoming_bytes < self.min_free_bytes:
+            self._reject("disk", "Not enough temporary storage for this upload, retry later")
+
+    def check(self, db: Session, user_id: int, incoming_bytes: int = 0):
+        """Raise 429 unless an upload of `incoming_bytes` by `user_id` may start now."""
+        # Open sessions will need their remaining bytes too
+        self.check_disk(incoming_bytes + self._pending_bytes(db))
+        with self._lock:
+            receiving = sum(self._receiving.values())
+            receiving_user = self._receiving.get(user_id, 0)
+        if self._in_flight(db) + receiving >= self.max_processing:
+            self._reject("global", "Video processing is at capacity, retry later")
+        if self._in_flight(db, user_id) + receiving_user >= self.max_processing_per_user:
+            self._reject("user", "Too many of your uploads are still processing, retry later")
+
+    def reserve(self, db: Session, user_id: int, incoming_bytes: int = 0):
+        """Check, then count the upload against the limits until `release`,
+        which follows once it has become a pending video."""
+        self.check(db, user_id, incoming_bytes)
+        with self._lock:
+            self._receiving[user_id] = self._receiving.get(user_id, 0) + 1
+
+    def release(self, user_id: int):
+        with self._lock:
+            self._receiving[user_id] -= 1
+            if not self._receiving[user_id]:
+                del self._receiving[user_id]
+
+    def state(self, db: Session) -> dict:
+        with self._lock:
+            receiving = sum(self._receiving.values())
+            rejected = dict(self._rejected)
+        return {
+            "processing": self._processing(db),
+            "uploading": self._uploading(db),
+            "receiving": receiving,
+            "max_processing": self.max_processing,
+            "max_processing_per_user": self.max_processing_per_user,
+            "free_bytes": self.free_bytes(),
+            "min_free_bytes": self.min_free_bytes,
+            "retry_after": self.retry_after,
+            "rejected": rejected
+        }
+
+
+admission = AdmissionController()
+
+
+def _reserve_for_token(authorization: Optional[str], incoming_bytes: int) -> Optional[int]:
+    """Reserve a slot for the token's user; None when there is no valid token."""
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        username = jwt.decode(token, config.SECRET_KEY, algorithms=[config.ALGORITHM]).get("sub")
+    except JWTError:
+        return None
+    db = SessionLocal()
+    try:
+        user_id = db.query(User.id).filter(User.username == username).scalar()
+        if user_id is not None:
+            admission.reserve(db, user_id, incoming_bytes)
+        return user_id
+    finally:
+        db.close()
+
+
+class UploadAdmissionMiddleware:
+    """Admission for the multipart /videos/upload endpoint.
+
+    FastAPI parses (and spools) a form body before the endpoint or any of its
+    dependencies run, so the check has to happen here, ahead of routing.
+    Requests without a valid token pass through and fail authentication there.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"].rstrip("/") != LEGACY_UPLOAD_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        length = headers.get("content-length", "")
+        try:
+            user_id = await asyncio.to_thread(
+                _reserve_for_token, headers.get("authorization"), int(length) if length.isdigit() else 0
+            )
+        except HTTPException as e:
+            response = JSONResponse({"detail": e.detail}, status_code=e.status_code, headers=e.headers)
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if user_id is not None:
+                admission.release(user_id)
@@ -0,0 +1,226 @@
+import bisect
+import heapq
+import re
+import threading
+from typing import Dict, List, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.models import Follow, User, Video
+
+# Titles are also reachable from the start of each later word ("cats" -> "Funny cats")
+MAX_WORD_STARTS = 5
+# Prefixes up to this long are answered from a weight-ordered bucket per prefix
+BUCKET_PREFIX_LENGTH = 3
+# Longer prefixes rank their key range when it is at most this big; past that
+# they take the first matches among this many of their bucket's heaviest items
+MAX_SCAN = 5000
+# Sorts after any character a key can contain
+KEY_END = "\U0010ffff"
+RESULT_CACHE_SIZE = 4096
+
+def normalize(value: str) -> str:
+    return re.sub(r"\s+", " ", (value or "").strip().lower())
+
+
+class PrefixIndex:
+    """Sorted-array prefix index with popularity weights.
+
+    Keys live in one sorted list, so a prefix lookup is a bisect plus a scan of
+    the matching range. Short prefixes match too many keys for that, so every
+    key prefix up to BUCKET_PREFIX_LENGTH characters also keeps its items in
+    weight order, and their top-k is a slice. Results for hot prefixes are
+    memoized until the next write; writes (approvals, sign-ups) are rare
+    compared to keystrokes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: List[Tuple[str, int]] = []
+        # item_id -> (display value, weight, index keys)
+        self._items: Dict[int, Tuple[str, float, List[str]]] = {}
+        # Short prefix -> (-weight, item_id) of the items with a key starting with it, heaviest first
+        self._buckets: Dict[str, List[Tuple[float, int]]] = {}
+        self._results: Dict[Tuple[str, int], List[str]] = {}
+
+    @staticmethod
+    def _keys_for(texts: List[str], word_starts: bool) -> List[str]:
+        keys = []
+        for value in texts:
+            normalized = normalize(value)
+            if not normalized:
+                continue
+            words = normalized.split(" ") if word_starts else [normalized]
+            keys.extend(" ".join(words[i:]) for i in range(min(len(words), MAX_WORD_STARTS)))
+        return list(dict.fromkeys(keys))
+
+    @staticmethod
+    def _bucket_prefixes(keys: List[str]) -> set:
+        return {key[:length] for key in keys for length in range(1, BUCKET_PREFIX_LENGTH + 1)}
+
+    def load(self, items: List[Tuple[int, str, float, List[str]]], word_starts: bool = False):
+        """Replace the index with (item_id, display value, weight, key texts) tuples."""
+        keys, indexed = [], {}
+        for item_id, value, weight, key_texts in items:
+            item_keys = self._keys_for(key_texts, word_starts)
+            indexed[item_id] = (value, weight, item_keys)
+            keys.extend((key, item_id) for key in item_keys)
+        keys.sort()
+        buckets: Dict[str, List[Tuple[float, int]]] = {}
+        for item_id, (_, weight, item_keys) in indexed.items():
+            for prefix in self._bucket_prefixes(item_keys):
+                buckets.setdefault(prefix, []).append((-weight, item_id))
+        for bucket in buckets.values():
+            bucket.sort()
+        with self._lock:
+            self._keys, self._items, self._buckets, self._results = keys, indexed, buckets, {}
+
+    def upsert(self, item_id: int, value: str, weight: float, key_texts: List[str], word_starts: bool = False):
+        with self._lock:
+            self._discard(item_id)
+            item_keys = self._keys_for(key_texts, word_starts)
+            self._items[item_id] = (value, weight, item_keys)
+            for key in item_keys:
+                bisect.insort(self._keys, (key, item_id))
+            for prefix in self._bucket_prefixes(item_keys):
+                bisect.insort(self._buckets.setdefault(prefix, []), (-weight, item_id))
+            self._results.clear()
+
+    def remove(self, item_id: int):
+        with self._lock:
+            self._discard(item_id)
+            self._results.clear()
+
+    def _discard(self, item_id: int):
+        item = self._items.pop(item_id, None)
+        if not item:
+            return
+        for key in item[2]:
+            index = bisect.bisect_left(self._keys, (key, item_id))
+            if index < len(self._keys) and self._keys[index] == (key, item_id):
+                del self._keys[index]
+        for prefix in self._bucket_prefixes(item[2]):
+            bucket = self._buckets.get(prefix, [])
+            index = bisect.bisect_left(bucket, (-item[1], item_id))
+            if index < len(bucket) and bucket[index] == (-item[1], item_id):
+                del bucket[index]
+            if not bucket:
+                self._buckets.pop(prefix, None)
+
+    def _top(self, prefix: str, n: int) -> List[int]:
+        # Caller holds the lock
+        if len(prefix) <= BUCKET_PREFIX_LENGTH:
+            return [item_id for _, item_id in self._buckets.get(prefix, [])[:n]]
+        start = bisect.bisect_left(self._keys, (prefix, -1))
+        end = bisect.bisect_left(self._keys, (prefix + KEY_END,), start)
+        if end - start > MAX_SCAN:
+            # Approximate: matches outside the bucket's MAX_SCAN heaviest items are not considered
+            top = []
+            for _, item_id in self._buckets.get(prefix[:BUCKET_PREFIX_LENGTH], [])[:MAX_SCAN]:
+                if any(key.startswith(prefix) for key in self._items[item_id][2]):
+                    top.append(item_id)
+                    if len(top) == n:
+                        break
+            return top
+        matches = {item_id for _, item_id in self._keys[start:end]}
+        return heapq.nlargest(n, matches, key=lambda item_id: (self._items[item_id][1], -item_id))
+
+    def complete(self, prefix: str, k: int = 10) -> List[str]:
+        """Top-k display values whose key starts with `prefix`, heaviest first."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            cached = self._results.get((prefix, k))
+            if cached is not None:
+                return list(cached)
+
+            result = [self._items[item_id][0] for item_id in self._top(prefix, k)]
+            if len(self._results) >= RESULT_CACHE_SIZE:
+                self._results.clear()
+            self._results[(prefix, k)] = result
+            return list(result)
+
+    def lookup(self, prefix: str, offset: int, limit: int) -> Tuple[List[int], bool]:
+        """One page of matching item ids, heaviest first. Returns (ids, has_more)."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return [], False
+        with self._lock:
+            ranked = self._top(prefix, offset + limit + 1)
+        return ranked[offset:offset + limit], len(ranked) > offset + limit
+
+
+class Autocomplete:
+    """Typeahead over approved video titles and usernames."""
+
+    def __init__(self):
+        self.videos = PrefixIndex()
+        self.users = PrefixIndex()
+        self._ready = False
+        self._build_lock = threading.Lock()
+
+    @staticmethod
+    def user_keys(user) -> List[str]:
+        # "@name" for typeahead, plus the bare username and full name for search
+        return [f"@{user.username}", user.username, user.full_name or ""]
+
+    @staticmethod
+    def video_weight(video) -> float:
+        return (video.views or 0) + 4 * (video.likes_count or 0)
+
+    def refresh(self, db: Session):
+        videos = db.query(Video.id, Video.title, Video.views, Video.likes_count).filter(Video.status == "approved").all()
+        self.videos.load(
+            [(v.id, v.title, self.video_weight(v), [v.title]) for v in videos if v.title],
+            word_starts=True
+        )
+
+        followers = dict(
+            db.query(Follow.followed_id, func.count(Follow.follower_id)).group_by(Follow.followed_id).all()
+        )
+        users = db.query(User.id, User.username, User.full_name).all()
+        self.users.load(
+            [(u.id, f"@{u.username}", followers.get(u.id, 0), self.user_keys(u)) for u in users if u.username],
+            word_starts=True
+        )
+        self._ready = True
+
+    def ensure_ready(self, db: Session):
+        if not self._ready:
+            with self._build_lock:
+                if not self._ready:
+                    self.refresh(db)
+
+    def update_video(self, video: Video):
+        if video.status == "approved" and video.title:
+            self.videos.upsert(video.id, video.title, self.video_weight(video), [video.title], word_starts=True)
+        else:
+            self.videos.remove(video.id)
+
+    def remove_video(self, video_id: int):
+        self.videos.remove(video_id)
+
+    def update_user(self, user: User, followers: int = 0):
+        self.users.upsert(user.id, f"@{user.username}", followers, self.user_keys(user), word_starts=True)
+
+    def search_users(self, q: str, offset: int = 0, limit: int = 10) -> Tuple[List[int], bool]:
+        """Ranked user ids whose username or a word of their full name starts with q."""
+        return self.users.lookup(q.lstrip("@"), offset, limit)
+
+    def suggest(self, q: str, limit: int = 10, max_users: int = 5) -> List[str]:
+        # "@name" searches creators only
+        if q.startswith("@"):
+            return self.users.complete(q, limit)
+
+        suggestions = self.users.complete("@" + q, max_users)
+        seen = set(suggestions)
+        for title in self.videos.complete(q, limit):
+            if title not in seen:
+                suggestions.append(title)
+                seen.add(title)
+        return suggestions[:limit]
+
+
+autocomplete = Autocomplete()
@@ -0,0 +1,29 @@
+import asyncio
+import logging
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodic(job: Callable[[Session], None], session_factory, interval: int):
+    """Run `job(db)` in a worker thread every `interval` seconds.
+
+    Each run gets its own session; failures are logged and retried on the next
+    tick. Started from the app lifespan and cancelled on shutdown.
+    """
+    def run_once():
+        db = session_factory()
+        try:
+            job(db)
+        finally:
+            db.close()
+
+    name = getattr(job, "__qualname__", repr(job))
+    while True:
+        try:
+            await asyncio.to_thread(run_once)
+        except Exception as e:
+            logger.error("Background job %s failed: %s", name, e)
+        await asyncio.sleep(interval)
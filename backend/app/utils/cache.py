@@ -0,0 +1,250 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Request, Response
+
+from app.core.config import CACHE_URL, CACHE_TTL_SECONDS, CACHE_MAX_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires: W/ prefixes are ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+class LocalCacheBackend:
+    """In-process LRU with per-entry TTL.
+
+    Namespace version counters live outside the LRU so they are never evicted;
+    losing one would let entries from before an invalidation resurface.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: int):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class RedisCacheBackend:
+    """Shared backend so every API worker sees the same entries and invalidations."""
+
+    def __init__(self, url: str):
+        import redis
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: int):
+        self._client.set(key, value, ex=ttl)
+
+    def get_counter(self, key: str) -> int:
+        return int(self._client.get(key) or 0)
+
+    def incr(self, key: str) -> int:
+        return self._client.incr(key)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one execution.
+
+    The first caller runs the function; callers arriving while it is in flight
+    wait for it and share its result (or its exception). Per-process only: with
+    several workers, each runs at most one computation per key at a time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class ResponseCache:
+    """Caches serialized JSON responses, keyed on namespace + query parameters.
+
+    Invalidation bumps a namespace version that is part of every key, so
+    stale entries are never read again and simply age out of the backend.
+    """
+
+    def __init__(self, backend, ttl: int = CACHE_TTL_SECONDS):
+        self.backend = backend
+        self.ttl = ttl
+        self._flights = SingleFlight()
+
+    def _key(self, namespace: str, params: Dict[str, Any]) -> str:
+        version = self.backend.get_counter(f"cache:v:{namespace}")
+        query = json.dumps(params, sort_keys=True, default=str)
+        return f"cache:{namespace}:{version}:{query}"
+
+    def _read(self, key: str) -> Any:
+        try:
+            cached = self.backend.get(key)
+            return json.loads(cached) if cached else None
+        except Exception as e:
+            logger.error("Cache read failed: %s", e)
+            return None
+
+    def _write(self, key: str, value: Any, ttl: int):
+        try:
+            self.backend.set(key, json.dumps(value).encode(), ttl)
+        except Exception as e:
+            logger.error("Cache write failed: %s", e)
+
+    def invalidate(self, *namespaces: str):
+        for namespace in namespaces:
+            try:
+                self.backend.incr(f"cache:v:{namespace}")
+            except Exception as e:
+                logger.error("Cache invalidation failed for %s: %s", namespace, e)
+
+    def memoize(self, namespace: str, params: Dict[str, Any], compute: Callable[[], Any], ttl: Optional[int] = None) -> Any:
+        """Cache a JSON-compatible value; concurrent misses share one compute()."""
+        key = "memo:" + self._key(namespace, params)
+        value = self._read(key)
+        if value is not None:
+            return value
+
+        def load():
+            value = compute()
+            self._write(key, value, ttl or self.ttl)
+            return value
+
+        return self._flights.do(key, load)
+
+    def respond(
+        self,
+        request: Request,
+        namespace: str,
+        params: Dict[str, Any],
+        build: Callable[[], Any],
+        cacheable: bool = True,
+        headers: Optional[Dict[str, str]] = None,
+        ttl: Optional[int] = None
+    ) -> Response:
+        """Serve from cache or build, always with an ETag and 304 support.
+
+        `build` returns a JSON-compatible payload, optionally as a
+        (payload, extra_headers) tuple when headers such as X-Next-Cursor
+        depend on the result. Concurrent misses for the same key share one build.
+        """
+        ttl = ttl or self.ttl
+        key = self._key(namespace, params) if cacheable else None
+
+        def load():
+            result = build()
+            payload, extra_headers = result if isinstance(result, tuple) else (result, {})
+            body = json.dumps(payload, separators=(",", ":"))
+            entry = {
+                "body": body,
+                "etag": f'"{hashlib.sha1(body.encode()).hexdigest()}"',
+                "headers": dict(headers or {}, **extra_headers),
+            }
+            if key:
+                self._write(key, entry, ttl)
+            return entry
+
+        entry = self._read(key) if key else None
+        if entry is None:
+            entry = self._flights.do(key, load) if key else load()
+
+        # Signed-in requests to the same URL get personalized, private
+        # responses, so shared caches must key on the Authorization header
+        response_headers = dict(entry["headers"], ETag=entry["etag"], Vary="Authorization")
+        if cacheable:
+            response_headers["Cache-Control"] = f"public, max-age={ttl}"
+        else:
+            response_headers["Cache-Control"] = "private, no-cache"
+
+        if _etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+            return Response(status_code=304, headers=response_headers)
+        return Response(content=entry["body"], media_type="application/json", headers=response_headers)
+
+
+def _create_backend():
+    if CACHE_URL:
+        try:
+            return RedisCacheBackend(CACHE_URL)
+        except Exception as e:
+            logger.error("Shared cache unavailable, falling back to local cache: %s", e)
+    return LocalCacheBackend()
+
+
+response_cache = ResponseCache(_create_backend())
+
+
+# Namespaces: every public listing, search results, and one per video detail
+VIDEO_LISTS = "videos"
+SEARCH = "search"
+
+def video_namespace(video_id: int) -> str:
+    return f"video:{video_id}"
@@ -0,0 +1,246 @@
+import json
+import logging
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    JOB_WORKER_CONCURRENCY, JOB_MAX_ATTEMPTS, JOB_RETRY_BASE_SECONDS, JOB_POLL_SECONDS, JOB_LEASE_SECONDS
+)
+from app.models.models import Job
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY_SECONDS = 600
+# Finished jobs are kept this long for inspection, then purged
+DONE_RETENTION = timedelta(days=7)
+CLAIM_ATTEMPTS = 3
+
+
+class JobQueue:
+    """Durable job queue stored in the application database.
+
+    Jobs are claimed with a conditional UPDATE, so any number of worker
+    processes can share the table. A running job holds a lease its worker keeps
+    renewing; if the worker dies, the lease lapses and the job is queued again.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, Tuple[Callable[..., Any], Optional[Callable[..., Any]]]] = {}
+
+    def register(self, kind: str, handler: Callable[..., Any], on_failure: Optional[Callable[..., Any]] = None):
+        """`handler(**payload)` runs a job; `on_failure(error, **payload)` runs
+        once when its retries are exhausted."""
+        self._handlers[kind] = (handler, on_failure)
+
+    def enqueue(
+        self,
+        db: Session,
+        kind: str,
+        payload: Dict[str, Any],
+        key: Optional[str] = None,
+        priority: int = 0,
+        max_attempts: int = JOB_MAX_ATTEMPTS
+    ) -> Job:
+        job = Job(
+            kind=kind,
+            key=key,
+            payload=json.dumps(payload),
+            priority=priority,
+            status="queued",
+            attempts=0,
+            max_attempts=max_attempts,
+            run_at=datetime.now()
+        )
+        db.add(job)
+        db.commit()
+        return job
+
+    def active(self, db: Session, kind: str, key: str) -> Optional[Job]:
+        """A queued or running job of `kind` for `key`, if there is one."""
+        return db.query(Job).filter(Job.kind == kind, Job.key == key, Job.status.in_(["queued", "running"])).first()
+
+    def claim(self, db: Session, worker_id: str) -> Optional[Job]:
+        """Take the highest-priority job that is due, or None."""
+        for _ in range(CLAIM_ATTEMPTS):
+            now = datetime.now()
+            job_id = db.query(Job.id).filter(Job.status == "queued", Job.run_at <= now).order_by(
+                Job.priority.desc(), Job.run_at, Job.id
+            ).limit(1).scalar()
+            if job_id is None:
+                db.rollback()
+                return None
+
+            claimed = db.query(Job).filter(Job.id == job_id, Job.status == "queued").update(
+                {Job.status: "running", Job.locked_by: worker_id, Job.locked_at: now, Job.attempts: Job.attempts + 1},
+                synchronize_session=False
+            )
+            db.commit()
+            # Another worker may have won the race for this row
+            if claimed:
+                return db.get(Job, job_id)
+        return None
+
+    def run(self, db: Session, job: Job):
+        handler, on_failure = self._handlers.get(job.kind, (None, None))
+        payload = json.loads(job.payload or "{}")
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind {job.kind}")
+            handler(**payload)
+        except Exception as e:
+            self._fail(db, job, e, on_failure, payload)
+            return
+
+        job.status = "done"
+        job.finished_at = datetime.now()
+        job.locked_by = None
+        db.commit()
+
+    def _fail(self, db: Session, job: Job, error: Exception, on_failure, payload: Dict[str, Any]):
+        now = datetime.now()
+        job.last_error = f"{type(error).__name__}: {error}"
+        job.locked_by = None
+        if job.attempts < job.max_attempts:
+            delay = min(JOB_RETRY_BASE_SECONDS * 2 ** max(0, job.attempts - 1), MAX_RETRY_DELAY_SECONDS)
+            job.status = "queued"
+            job.run_at = now + timedelta(seconds=delay)
+            db.commit()
+            logger.warning("Job %s (%s) failed, retrying in %ss: %s", job.id, job.kind, delay, error)
+            return
+
+        job.status = "failed"
+        job.finished_at = now
+        db.commit()
+        logger.error("Job %s (%s) failed after %s attempts: %s", job.id, job.kind, job.attempts, error)
+        if on_failure:
+            try:
+                on_failure(error, **payload)
+            except Exception as e:
+                logger.error("Failure hook for job %s failed: %s", job.id, e)
+
+    def heartbeat(self, db: Session, job_ids: List[int]):
+        if not job_ids:
+            return
+        db.query(Job).filter(Job.id.in_(job_ids), Job.status == "running").update(
+            {Job.locked_at: datetime.now()}, synchronize_session=False
+        )
+        db.commit()
+
+    def requeue_expired(self, db: Session) -> int:
+        """Recover jobs whose worker stopped renewing its lease."""
+        cutoff = datetime.now() - timedelta(seconds=JOB_LEASE_SECONDS)
+        expired = db.query(Job).filter(Job.status == "running", Job.locked_at < cutoff).all()
+        for job in expired:
+            lost = RuntimeError(f"Worker {job.locked_by} lost its lease")
+            _, on_failure = self._handlers.get(job.kind, (None, None))
+            # A job that keeps killing its worker must not be retried forever
+            self._fail(db, job, lost, on_failure, json.loads(job.payload or "{}"))
+        return len(expired)
+
+    def purge(self, db: Session) -> int:
+        deleted = db.query(Job).filter(
+            Job.status == "done", Job.finished_at < datetime.now() - DONE_RETENTION
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    def stats(self, db: Session) -> Dict[str, Any]:
+        """Queue depth per status and kind, plus how long the oldest due job has waited."""
+        now = datetime.now()
+        by_kind: Dict[str, Dict[str, int]] = {}
+        totals = {"queued": 0, "running": 0, "failed": 0}
+        rows = db.query(Job.kind, Job.status, func.count(Job.id)).filter(
+            Job.status.in_(list(totals))
+        ).group_by(Job.kind, Job.status).all()
+        for kind, status, count in rows:
+            by_kind.setdefault(kind, {})[status] = count
+            totals[status] += count
+
+        ready, oldest_run_at = db.query(func.count(Job.id), func.min(Job.run_at)).filter(
+            Job.status == "queued", Job.run_at <= now
+        ).one()
+        return dict(
+            totals,
+            ready=ready,
+            oldest_ready_seconds=int((now - oldest_run_at).total_seconds()) if oldest_run_at else 0,
+            by_kind=by_kind
+        )
+
+
+class WorkerPool:
+    """`concurrency` threads claiming jobs, plus one thread that renews their
+    leases, recovers jobs from dead workers and purges old finished jobs."""
+
+    def __init__(self, queue: JobQueue, session_factory, concurrency: int = JOB_WORKER_CONCURRENCY, poll_seconds: float = JOB_POLL_SECONDS):
+        self.queue = queue
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._running: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        for index in range(self.concurrency):
+            thread = threading.Thread(target=self._work, args=(index,), name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._maintain, name="job-maintenance", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        logger.info("Job worker pool %s started with %s workers", self.worker_id, self.concurrency)
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop claiming new jobs and wait for the running ones to finish."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _work(self, index: int):
+        worker_id = f"{self.worker_id}:{index}"
+        while not self._stop.is_set():
+            job = None
+            db = self.session_factory()
+            try:
+                job = self.queue.claim(db, worker_id)
+                if job is not None:
+                    with self._lock:
+                        self._running[index] = job.id
+                    try:
+                        self.queue.run(db, job)
+                    finally:
+                        with self._lock:
+                            self._running.pop(index, None)
+            except Exception as e:
+                logger.error("Job worker %s error: %s", worker_id, e)
+            finally:
+                db.close()
+            if job is None:
+                self._stop.wait(self.poll_seconds)
+
+    def _maintain(self):
+        interval = max(1, JOB_LEASE_SECONDS // 4)
+        while not self._stop.wait(interval):
+            db = self.session_factory()
+            try:
+                with self._lock:
+                    running = list(self._running.values())
+                self.queue.heartbeat(db, running)
+                self.queue.requeue_expired(db)
+                self.queue.purge(db)
+            except Exception as e:
+                logger.error("Job maintenance failed: %s", e)
+            finally:
+                db.close()
+
+
+job_queue = JobQueue()
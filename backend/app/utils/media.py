@@ -0,0 +1,168 @@
+import struct
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+from app.core import config
+
+# Sample entry fourcc -> codec name as ffprobe reports it
+CODEC_NAMES = {
+    b"avc1": "h264", b"avc3": "h264",
+    b"hvc1": "hevc", b"hev1": "hevc",
+    b"av01": "av1",
+    b"vp09": "vp9",
+    b"mp4v": "mpeg4",
+    b"apch": "prores", b"apcn": "prores", b"apcs": "prores", b"apco": "prores", b"ap4h": "prores",
+    b"mp4a": "aac",
+    b"Opus": "opus",
+    b"ac-3": "ac3", b"ec-3": "eac3",
+}
+
+
+class IncompleteHeader(Exception):
+    """The part of the file read so far ends before the metadata does."""
+
+
+def _boxes(f: BinaryIO, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """Yield (type, content start, box end) for the boxes in [start, end)."""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        size, kind = struct.unpack(">I4s", f.read(8))
+        header = 8
+        if size == 1:
+            size = struct.unpack(">Q", f.read(8))[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header:
+            raise ValueError("Malformed MP4 box")
+        yield kind, pos + header, pos + size
+        pos += size
+
+
+def _read(f: BinaryIO, offset: int, length: int) -> bytes:
+    f.seek(offset)
+    data = f.read(length)
+    if len(data) < length:
+        raise ValueError("Truncated MP4 box")
+    return data
+
+
+def _children(f: BinaryIO, start: int, end: int) -> Dict[bytes, Tuple[int, int]]:
+    return {kind: (content, box_end) for kind, content, box_end in _boxes(f, start, end)}
+
+
+def _parse_track(f: BinaryIO, start: int, end: int, media: dict):
+    boxes = _children(f, start, end)
+    if b"tkhd" not in boxes or b"mdia" not in boxes:
+        return
+    mdia = _children(f, *boxes[b"mdia"])
+    if b"hdlr" not in mdia or b"minf" not in mdia:
+        return
+    handler = _read(f, mdia[b"hdlr"][0] + 8, 4)
+
+    stbl = _children(f, *mdia[b"minf"]).get(b"stbl")
+    stsd = _children(f, *stbl).get(b"stsd") if stbl else None
+    # First sample entry: size, then its fourcc
+    codec = _read(f, stsd[0] + 12, 4) if stsd else b""
+    name = CODEC_NAMES.get(codec, codec.decode("latin-1").strip())
+
+    if handler == b"vide" and "video_codec" not in media:
+        tkhd = boxes[b"tkhd"][0]
+        version = _read(f, tkhd, 1)[0]
+        matrix_at, size_at = (tkhd + 52, tkhd + 88) if version == 1 else (tkhd + 40, tkhd + 76)
+        a, b = struct.unpack(">ii", _read(f, matrix_at, 8))
+        width, height = (value >> 16 for value in struct.unpack(">II", _read(f, size_at, 8)))
+        # Phones store portrait video as landscape plus a 90 degree rotation
+        if a == 0 and b != 0:
+            width, height = height, width
+        media.update(video_codec=name, width=width, height=height)
+    elif handler == b"soun" and "audio_codec" not in media:
+        media["audio_codec"] = name
+
+
+def probe_header(f: BinaryIO, available: int) -> Optional[dict]:
+    """Read duration, display size and codecs from an MP4/MOV header.
+
+    Only the first `available` bytes are considered, so this also works on an
+    upload that is still arriving. Returns None for other containers, and raises
+    IncompleteHeader when the metadata is not within the bytes received yet.
+    """
+    try:
+        return _probe(f, available)
+    except struct.error:
+        raise ValueError("Malformed MP4 header")
+
+
+def _probe(f: BinaryIO, available: int) -> Optional[dict]:
+    # Boxes off the path to the ones we read (mdat, sample tables) are skipped
+    # with a seek, so only a few KB of the file are touched
+    boxes = _boxes(f, 0, available)
+    first = next(boxes, None)
+    if first is None:
+        raise IncompleteHeader()
+    if first[0] != b"ftyp":
+        return None
+
+    for kind, content, box_end in boxes:
+        if kind != b"moov":
+            continue
+        if box_end > available:
+            raise IncompleteHeader()
+        media = {}
+        timescale = duration = fragment_duration = 0
+        moov = list(_boxes(f, content, box_end))
+        for child, child_start, child_end in moov:
+            if child == b"mvhd":
+                version = _read(f, child_start, 1)[0]
+                if version == 1:
+                    timescale, duration = struct.unpack(">IQ", _read(f, child_start + 20, 12))
+                else:
+                    timescale, duration = struct.unpack(">II", _read(f, child_start + 12, 8))
+            elif child == b"mvex":
+                # Fragmented MP4: the samples live in moof boxes and mvhd usually
+                # says 0; the optional mehd carries the overall duration instead
+                media["fragmented"] = True
+                mehd = _children(f, child_start, child_end).get(b"mehd")
+                if mehd:
+                    version = _read(f, mehd[0], 1)[0]
+                    if version == 1:
+                        fragment_duration = struct.unpack(">Q", _read(f, mehd[0] + 4, 8))[0]
+                    else:
+                        fragment_duration = struct.unpack(">I", _read(f, mehd[0] + 4, 4))[0]
+            elif child == b"trak":
+                _parse_track(f, child_start, child_end, media)
+        duration = duration or fragment_duration
+        media["duration"] = duration / timescale if timescale else 0.0
+        return media
+    # moov comes after mdat in files that were not written for streaming
+    raise IncompleteHeader()
+
+
+def validate_media(media: dict, video_type: str):
+    """Raise ValueError with the reason the upload would be refused later."""
+    if "video_codec" not in media:
+        raise ValueError("No video track found")
+    if media["video_codec"] not in config.ALLOWED_VIDEO_CODECS:
+        raise ValueError(f"Unsupported video codec: {media['video_codec']}")
+
+    width, height = media["width"], media["height"]
+    if not width or not height:
+        raise ValueError("Video has no dimensions")
+    if max(width, height) > config.MAX_VIDEO_DIMENSION:
+        raise ValueError(f"Video resolution {width}x{height} is too large")
+    # Same rule the video-service applies
+    if video_type == "home" and width < height:
+        raise ValueError("Invalid aspect ratio for Home (Horizontal expected)")
+    if video_type == "flash" and width > height:
+        raise ValueError("Invalid aspect ratio for Flash (Vertical expected)")
+
+    duration = media.get("duration") or 0
+    limit = config.FLASH_MAX_DURATION_SECONDS if video_type == "flash" else config.HOME_MAX_DURATION_SECONDS
+    if duration <= 0:
+        # Without mehd a fragmented file's length is only known from its
+        # fragments, which may not have arrived yet; the service checks it
+        if media.get("fragmented"):
+            return
+        raise ValueError("Video has no duration")
+    if duration > limit:
+        raise ValueError(f"Video is too long ({int(duration)}s, at most {limit}s)")
@@ -0,0 +1,52 @@
+import base64
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Pack a (created_at, id) keyset position into an opaque, URL-safe token."""
+    raw = f"{created_at.isoformat()}|{item_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor. Raises ValueError on a malformed token."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        created_at, item_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(item_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Opaque token for position-based pages (e.g. slices of a ranked feed)."""
+    return base64.urlsafe_b64encode(f"o|{offset}".encode()).decode().rstrip("=")
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        kind, offset = base64.urlsafe_b64decode(padded.encode()).decode().split("|", 1)
+        if kind != "o" or int(offset) < 0:
+            raise ValueError
+        return int(offset)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def encode_id_cursor(item_id: int) -> str:
+    """Opaque token for pages ordered by id alone."""
+    return base64.urlsafe_b64encode(f"i|{item_id}".encode()).decode().rstrip("=")
+
+
+def decode_id_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        kind, item_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|", 1)
+        if kind != "i":
+            raise ValueError
+        return int(item_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
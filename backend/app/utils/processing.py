@@ -0,0 +1,500 @@
+import errno
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core import config
+from app.core.security import processing_callback_token
+from app.crud import video as crud_video
+from app.db.session import SessionLocal
+from app.models.models import Job, Video
+from app.utils.jobs import job_queue
+
+logger = logging.getLogger(__name__)
+
+# Video url field and the suffix the Rust service gives each rendition
+RENDITIONS = [
+    ("url_480p", "480p"),
+    ("url_720p", "720p"),
+    ("url_1080p", "1080p"),
+    ("url_2k", "1440p"),
+    ("url_4k", "2160p"),
+]
+# Columns filled from the video-service probe
+MEDIA_FIELDS = (
+    "duration", "width", "height", "fps", "bitrate", "video_codec", "audio_codec", "file_size", "rendition_sizes"
+)
+# Sized copies of the generated poster, each in every format
+THUMBNAIL_VARIANTS = ("grid", "card", "hero")
+THUMBNAIL_FORMATS = ("webp", "jpg")
+PUBLISH_WORKERS = 4
+
+# Finishing frees temp disk and makes a video watchable, so it goes first;
+# premium uploads are transcoded ahead of everyone else's
+FINISH_PRIORITY = 10
+PREMIUM_PRIORITY = 5
+DEFAULT_PRIORITY = 0
+
+def _cleanup_temp(temp_file_path: str):
+    temp_dir = os.path.dirname(temp_file_path)
+    if os.path.exists(temp_dir):
+        try:
+            shutil.rmtree(temp_dir)
+        except Exception as e:
+            print(f"Error cleaning up temp dir {temp_dir}: {e}")
+
+def background_process_video(
+    temp_file_path: str,
+    video_type: str,
+    video_id: int,
+    thumbnail_provided: bool,
+    task_id: str
+):
+    """Phase 1: hand the upload to the Rust service.
+
+    The service reports back on /videos/processing-callback when it is done,
+    so nothing is held open for the length of the transcode. Errors propagate
+    so the job queue can retry.
+    """
+    db = SessionLocal()
+    try:
+        video = db.query(Video.video_url, Video.failed_at).filter(Video.id == video_id).first()
+        if not video:
+            # Deleted while queued
+            _cleanup_temp(temp_file_path)
+            return
+        if video.video_url or video.failed_at:
+            # Settled by an earlier attempt of this job
+            return
+    finally:
+        db.close()
+
+    with httpx.Client() as client:
+        # A retry after a lost lease: the service may have accepted the first
+        # attempt, and submitting again would transcode the upload twice
+        status_response = client.get(f"{config.RUST_SERVICE_URL}/status/{task_id}", timeout=10.0)
+        status_response.raise_for_status()
+        upstream = status_response.json()
+        if upstream and upstream.get("status") != "error":
+            logger.info("Task %s is already known to the video-service, not resubmitting", task_id)
+            return
+
+        rust_response = client.post(
+            f"{config.RUST_SERVICE_URL}/process",
+            json={
+                "video_id": temp_file_path,
+                "target_format": video_type,
+                "skip_thumbnail": thumbnail_provided,
+                "hls": config.HLS_ENABLED and video_type == "home",
+                "seek_preview": config.SEEK_PREVIEW_ENABLED and video_type == "home",
+                "transcode_mode": config.TRANSCODE_MODE,
+                "task_id": task_id,
+                "callback_url": config.PROCESSING_CALLBACK_URL,
+                "callback_token": processing_callback_token(task_id)
+            },
+            timeout=30.0
+        )
+        rust_response.raise_for_status()
+
+def _copy_file(src: str, dest: str):
+    """Copy inside the kernel: copy_file_range where available, otherwise
+    shutil.copyfile, which uses sendfile on Linux."""
+    with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+        remaining = os.fstat(fsrc.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+            if remaining == 0:
+                return
+        except (AttributeError, OSError):
+            pass
+    shutil.copyfile(src, dest)
+
+def publish_file(src: str, dest: str) -> Tuple[int, bool]:
+    """Move a finished output into the static tree.
+
+    A rename when both paths share a filesystem (no bytes copied, readers
+    never see a partial file); otherwise a kernel copy to a temporary name
+    followed by a rename. Returns (size, copied).
+    """
+    size = os.path.getsize(src)
+    try:
+        os.replace(src, dest)
+        return size, False
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+
+    partial = f"{dest}.part"
+    try:
+        _copy_file(src, partial)
+        os.replace(partial, dest)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    os.remove(src)
+    return size, True
+
+def publish_outputs(video_id: int, outputs: List[Tuple[str, str, str, str]]) -> Dict[str, str]:
+    """Publish (field, source, subdir, name) outputs concurrently; returns {field: url}."""
+    started = time.monotonic()
+
+    def publish(output):
+        field, src, subdir, name = output
+        dest_dir = os.path.join(config.STATIC_DIR, subdir)
+        os.makedirs(dest_dir, exist_ok=True)
+        dest_path = os.path.join(dest_dir, name)
+        url = f"{config.BASE_URL}/static/{subdir}/{name}"
+        if os.path.exists(src):
+            return field, url, publish_file(src, dest_path)
+        # Already moved by an earlier attempt of this job
+        if os.path.exists(dest_path):
+            return field, url, (0, False)
+        return field, None, (0, False)
+
+    with ThreadPoolExecutor(max_workers=PUBLISH_WORKERS) as executor:
+        results = list(executor.map(publish, outputs))
+
+    urls = {field: url for field, url, _ in results if url}
+    moved = sum(size for _, _, (size, copied) in results if not copied)
+    copied = sum(size for _, _, (size, copied) in results if copied)
+    logger.info(
+        "Published %s files for video %s in %.2fs: %.1f MB renamed, %.1f MB copied",
+        len(urls), video_id, time.monotonic() - started, moved / 1e6, copied / 1e6
+    )
+    return urls
+
+def _base_filename(video: Video, temp_file_path: str) -> str:
+    # Ensure base filename is safe and unique
+    clean_title = "".join([c if c.isalnum() else "_" for c in video.title or ""])
+    timestamp = int(os.path.getmtime(temp_file_path))
+    return f"{clean_title}_{timestamp}"
+
+def _thumbnail_files(base_filename: str) -> List[Tuple[str, str, str]]:
+    """(url field, suffix the Rust service gives the file, published name) per variant."""
+    return [
+        (f"thumb_{variant}_{fmt}", f"_thumb_{variant}.{fmt}", f"{base_filename}_{variant}.{fmt}")
+        for variant in THUMBNAIL_VARIANTS
+        for fmt in THUMBNAIL_FORMATS
+    ]
+
+def thumbnail_urls(video: Video) -> Dict[str, str]:
+    """A video's thumbnail variants keyed by url field, as _thumbnail_files names them."""
+    return {
+        f"thumb_{variant}_{fmt}": url
+        for variant, formats in (video.thumbnails or {}).items()
+        for fmt, url in formats.items()
+    }
+
+def _set_renditions(video: Video, urls: Dict[str, str]):
+    for field, _ in RENDITIONS:
+        setattr(video, field, urls.get(field))
+    # Fallback logic for the main video URL
+    video.video_url = urls.get("url_720p") or urls.get("url_1080p") or urls.get("url_480p") or ""
+    if urls.get("thumbnail_url"):
+        video.thumbnail_url = urls["thumbnail_url"]
+    thumbnails = {}
+    for variant in THUMBNAIL_VARIANTS:
+        formats = {fmt: urls[f"thumb_{variant}_{fmt}"] for fmt in THUMBNAIL_FORMATS if urls.get(f"thumb_{variant}_{fmt}")}
+        if formats:
+            thumbnails[variant] = formats
+    video.thumbnails = thumbnails or None
+    # video.status = "approved" # REMOVED AUTO-APPROVAL
+    video.failed_at = None # Clear if it was a retry
+
+def hls_dir(video_id: int) -> str:
+    """Where a video's HLS playlists and segments are published."""
+    return os.path.join(config.STATIC_DIR, "videos", str(video_id))
+
+def manifest_url(video_id: int) -> str:
+    return f"{config.BASE_URL}/static/videos/{video_id}/master.m3u8"
+
+def seek_preview_dir(video_id: int) -> str:
+    """Where a video's seek-preview sprite sheets and their index are published."""
+    return os.path.join(config.STATIC_DIR, "previews", str(video_id))
+
+def seek_preview_url(video_id: int) -> str:
+    return f"{config.BASE_URL}/static/previews/{video_id}/preview.vtt"
+
+def publish_tree(src_dir: str, dest: str) -> bool:
+    """Move a directory of outputs into place, as publish_file does for one
+    file; False when there was nothing to publish."""
+    if not os.path.isdir(src_dir):
+        # Not produced, or already moved by an earlier attempt of this job
+        return os.path.isdir(dest)
+
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    try:
+        os.replace(src_dir, dest)
+        return True
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+
+    partial = f"{dest}.part"
+    shutil.rmtree(partial, ignore_errors=True)
+    shutil.copytree(src_dir, partial, copy_function=_copy_file)
+    os.replace(partial, dest)
+    shutil.rmtree(src_dir)
+    return True
+
+def publish_hls(video_id: int, src_dir: str) -> Optional[str]:
+    """Move the packaged HLS tree into place; returns the master playlist URL."""
+    return manifest_url(video_id) if publish_tree(src_dir, hls_dir(video_id)) else None
+
+def publish_seek_preview(video_id: int, src_dir: str) -> Optional[str]:
+    """Move the sprite sheets into place; returns the URL of their VTT index."""
+    return seek_preview_url(video_id) if publish_tree(src_dir, seek_preview_dir(video_id)) else None
+
+def finish_processing(temp_file_path: str, video_id: int, thumbnail_provided: bool, media: Optional[Dict] = None):
+    """Phase 2: publish the renditions once the Rust service reports success.
+
+    `media` is the probe the service ran while processing; nothing is
+    re-read from the source file here.
+    """
+    db = SessionLocal()
+    try:
+        video = db.query(Video).filter(Video.id == video_id).first()
+        if not video or video.video_url or video.failed_at:
+            # Deleted, or finished by a duplicate delivery of the same event
+            _cleanup_temp(temp_file_path)
+            return
+        if not os.path.exists(temp_file_path):
+            logger.warning("Temp files of video %s are gone, nothing to publish", video_id)
+            return
+
+        base_filename = _base_filename(video, temp_file_path)
+        # (url field, temp source, static subdir, published name)
+        outputs = [
+            (field, f"{temp_file_path}_{suffix}.mp4", "videos", f"{base_filename}_{suffix}.mp4")
+            for field, suffix in RENDITIONS
+        ]
+        if not thumbnail_provided:
+            outputs.append(("thumbnail_url", f"{temp_file_path}.jpg", "thumbs", f"{base_filename}.jpg"))
+            outputs.extend(
+                (field, f"{temp_file_path}{suffix}", "thumbs", name)
+                for field, suffix, name in _thumbnail_files(base_filename)
+            )
+
+        _set_renditions(video, publish_outputs(video.id, outputs))
+        video.manifest_url = publish_hls(video.id, f"{temp_file_path}_hls")
+        video.seek_preview_url = publish_seek_preview(video.id, f"{temp_file_path}_preview")
+        if media:
+            apply_media_info(video, media)
+        db.commit()
+    finally:
+        db.close()
+
+    # Clean up temp (kept until here so a failed attempt can be retried)
+    _cleanup_temp(temp_file_path)
+
+def _static_path(url: Optional[str]) -> Optional[str]:
+    """Local path of a file served from our static tree, or None."""
+    prefix = f"{config.BASE_URL}/static/"
+    if not url or not url.startswith(prefix):
+        return None
+    return os.path.join(config.STATIC_DIR, url[len(prefix):].replace("/", os.sep))
+
+def link_file(src: str, dest: str):
+    """Give an existing static file a second name. A hardlink shares the
+    bytes, and deleting either video later leaves the other intact; across
+    filesystems it falls back to a copy."""
+    try:
+        os.link(src, dest)
+        return
+    except FileExistsError:
+        # Linked by an earlier attempt of this job
+        return
+    except OSError:
+        pass
+    partial = f"{dest}.part"
+    _copy_file(src, partial)
+    os.replace(partial, dest)
+
+def link_tree(src_dir: str, dest_dir: str):
+    """link_file for every file under src_dir, recreating its layout."""
+    for root, _, files in os.walk(src_dir):
+        target = os.path.join(dest_dir, os.path.relpath(root, src_dir))
+        os.makedirs(target, exist_ok=True)
+        for name in files:
+            link_file(os.path.join(root, name), os.path.join(target, name))
+
+def reuse_renditions(temp_file_path: str, video_id: int, source_id: int, thumbnail_provided: bool, **_):
+    """Give a re-uploaded file the renditions of an earlier identical upload
+    instead of transcoding it again."""
+    db = SessionLocal()
+    try:
+        video = db.query(Video).filter(Video.id == video_id).first()
+        if not video:
+            _cleanup_temp(temp_file_path)
+            return
+        source = db.query(Video).filter(Video.id == source_id).first()
+
+        base_filename = _base_filename(video, temp_file_path)
+        # (url field, static subdir, name for this video)
+        fields = [(field, "videos", f"{base_filename}_{suffix}.mp4") for field, suffix in RENDITIONS]
+        if not thumbnail_provided:
+            fields.append(("thumbnail_url", "thumbs", f"{base_filename}.jpg"))
+            fields.extend((field, "thumbs", name) for field, _, name in _thumbnail_files(base_filename))
+        source_urls = {}
+        if source:
+            source_urls = {field: getattr(source, field) for field, _ in RENDITIONS}
+            source_urls["thumbnail_url"] = source.thumbnail_url
+            source_urls.update(thumbnail_urls(source))
+
+        urls, links = {}, []
+        for field, subdir, name in fields:
+            url = source_urls.get(field)
+            src = _static_path(url)
+            if src:
+                links.append((field, src, subdir, name))
+            elif url:
+                # Remote objects (custom thumbnails) are never deleted with a video
+                urls[field] = url
+
+        if not source or not source.video_url or not all(os.path.exists(src) for _, src, _, _ in links):
+            # The original went away in the meantime: transcode after all
+            logger.info("Renditions of video %s are gone, transcoding video %s", source_id, video_id)
+            enqueue_processing(db, video, temp_file_path, thumbnail_provided, dedupe=False)
+            return
+
+        for field, src, subdir, name in links:
+            dest_dir = os.path.join(config.STATIC_DIR, subdir)
+            os.makedirs(dest_dir, exist_ok=True)
+            link_file(src, os.path.join(dest_dir, name))
+            urls[field] = f"{config.BASE_URL}/static/{subdir}/{name}"
+
+        _set_renditions(video, urls)
+        video.manifest_url = None
+        if source.manifest_url and os.path.isdir(hls_dir(source.id)):
+            link_tree(hls_dir(source.id), hls_dir(video.id))
+            video.manifest_url = manifest_url(video.id)
+        video.seek_preview_url = None
+        if source.seek_preview_url and os.path.isdir(seek_preview_dir(source.id)):
+            link_tree(seek_preview_dir(source.id), seek_preview_dir(video.id))
+            video.seek_preview_url = seek_preview_url(video.id)
+        for field in MEDIA_FIELDS:
+            setattr(video, field, getattr(source, field))
+        db.commit()
+        logger.info("Video %s reuses the renditions of video %s", video_id, source_id)
+    finally:
+        db.close()
+
+    _cleanup_temp(temp_file_path)
+
+def apply_media_info(video: Video, media: Dict):
+    video.duration = int(media.get("duration") or 0)
+    video.width = media.get("width")
+    video.height = media.get("height")
+    video.fps = media.get("fps")
+    video.bitrate = media.get("bitrate")
+    video.video_codec = media.get("video_codec")
+    video.audio_codec = media.get("audio_codec")
+    video.file_size = media.get("size")
+    video.rendition_sizes = media.get("rendition_sizes")
+
+def abandon_processing(error: Exception, temp_file_path: str, video_id: int, **_):
+    """Out of retries: rollback quota and mark as failed."""
+    print(f"Error in background processing phase: {error}")
+    db = SessionLocal()
+    try:
+        video = db.query(Video).filter(Video.id == video_id).first()
+        if video:
+            crud_video.mark_processing_failed(db, video)
+    finally:
+        db.close()
+    _cleanup_temp(temp_file_path)
+
+def enqueue_processing(
+    db, video: Video, temp_file_path: str, thumbnail_provided: bool = False, premium: bool = False, dedupe: bool = True
+):
+    payload = {
+        "temp_file_path": temp_file_path,
+        "video_type": video.video_type,
+        "video_id": video.id,
+        "thumbnail_provided": thumbnail_provided,
+        "task_id": video.processing_key
+    }
+    source = crud_video.get_processed_duplicate(db, video) if dedupe and video.content_hash else None
+    if source:
+        # Same bytes were transcoded before; linking is cheap, so it goes first
+        return job_queue.enqueue(
+            db, "reuse_video", dict(payload, source_id=source.id), key=video.processing_key, priority=FINISH_PRIORITY
+        )
+    return job_queue.enqueue(
+        db,
+        "process_video",
+        payload,
+        key=video.processing_key,
+        priority=PREMIUM_PRIORITY if premium else DEFAULT_PRIORITY
+    )
+
+def enqueue_finish(db, video: Video, temp_file_path: str, thumbnail_provided: bool, media: Optional[Dict] = None):
+    # A retried callback can arrive while the first one's job is still pending
+    pending = job_queue.active(db, "finish_video", video.processing_key)
+    if pending:
+        return pending
+    return job_queue.enqueue(
+        db,
+        "finish_video",
+        {"temp_file_path": temp_file_path, "video_id": video.id, "thumbnail_provided": thumbnail_provided, "media": media},
+        key=video.processing_key,
+        priority=FINISH_PRIORITY
+    )
+
+def sweep_stalled_processing(db) -> int:
+    """Settle uploads whose completion callback never arrived.
+
+    The video-service is asked first: a transcode that finished (its callback
+    lost) is published from the status it reports, one still running is left
+    alone, and only failed or unknown tasks are failed. Returns the number of
+    uploads settled.
+    """
+    settled = 0
+    with httpx.Client(base_url=config.RUST_SERVICE_URL, timeout=5.0) as client:
+        for video in crud_video.get_stalled_processing(db):
+            key = video.processing_key
+            try:
+                resp = client.get(f"/status/{key}")
+                resp.raise_for_status()
+                upstream = resp.json()
+            except Exception as e:
+                # Unreachable service: try again on the next sweep
+                logger.warning("Could not ask the video-service about task %s: %s", key, e)
+                continue
+
+            status = (upstream or {}).get("status")
+            if status == "completed":
+                submitted = db.query(Job).filter(Job.kind == "process_video", Job.key == key).order_by(Job.id.desc()).first()
+                payload = json.loads(submitted.payload) if submitted else {}
+                if payload.get("temp_file_path") and os.path.exists(payload["temp_file_path"]):
+                    logger.info("Callback for video %s was lost, finishing from the service status", video.id)
+                    enqueue_finish(
+                        db, video, payload["temp_file_path"], payload.get("thumbnail_provided", False), upstream.get("media")
+                    )
+                    settled += 1
+                    continue
+            elif status not in (None, "error"):
+                # Still transcoding
+                continue
+
+            print(f"Processing timed out for video {video.id} (task {key})")
+            crud_video.mark_processing_failed(db, video)
+            shutil.rmtree(os.path.join(tempfile.gettempdir(), key), ignore_errors=True)
+            settled += 1
+    return settled
+
+job_queue.register("process_video", background_process_video, on_failure=abandon_processing)
+job_queue.register("finish_video", finish_processing, on_failure=abandon_processing)
+job_queue.register("reuse_video", reuse_renditions, on_failure=abandon_processing)
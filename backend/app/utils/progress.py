@@ -0,0 +1,148 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, Optional, Set
+
+import httpx
+
+from app.core import config
+from app.db.session import SessionLocal
+from app.models.models import Video
+
+logger = logging.getLogger(__name__)
+
+# Statuses after which a processing key never changes again
+TERMINAL = {"ready", "failed"}
+# Per-subscriber backlog; a slow client skips intermediate progress events
+SUBSCRIBER_BUFFER = 16
+
+
+class ProgressHub:
+    """Processing progress, fanned out to any number of subscribers.
+
+    One watcher per processing key polls the video-service and the database,
+    and publishes an event whenever the state changes. Upstream traffic grows
+    with the number of tasks being watched, not with the number of clients.
+    The watcher stops once the task is finished or its last subscriber leaves.
+    """
+
+    def __init__(self, poll_seconds: float = config.PROGRESS_POLL_SECONDS):
+        self.poll_seconds = poll_seconds
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._watchers: Dict[str, asyncio.Task] = {}
+        self._last: Dict[str, dict] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(base_url=config.RUST_SERVICE_URL, timeout=5.0)
+        return self._client
+
+    async def close(self):
+        for watcher in list(self._watchers.values()):
+            watcher.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def subscribe(self, key: str) -> AsyncIterator[dict]:
+        """Yield the current state, then every change, ending with a terminal event."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_BUFFER)
+        self._subscribers.setdefault(key, set()).add(queue)
+        if key in self._last:
+            queue.put_nowait(self._last[key])
+        if key not in self._watchers:
+            self._watchers[key] = asyncio.create_task(self._watch(key))
+        try:
+            while True:
+                event = await queue.get()
+                yield event
+                if event["status"] in TERMINAL:
+                    return
+        finally:
+            subscribers = self._subscribers.get(key, set())
+            subscribers.discard(queue)
+            if not subscribers:
+                self._subscribers.pop(key, None)
+                self._last.pop(key, None)
+                watcher = self._watchers.pop(key, None)
+                if watcher:
+                    watcher.cancel()
+
+    async def snapshot(self, key: str) -> dict:
+        """Current state without subscribing; reuses a running watcher's view."""
+        if key in self._last:
+            return self._last[key]
+        return await self._poll(key)
+
+    def _publish(self, key: str, event: dict):
+        self._last[key] = event
+        for queue in self._subscribers.get(key, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def _watch(self, key: str):
+        try:
+            while True:
+                try:
+                    event = await self._poll(key)
+                except Exception as e:
+                    logger.warning("Progress poll for %s failed: %s", key, e)
+                else:
+                    if event != self._last.get(key):
+                        self._publish(key, event)
+                    if event["status"] in TERMINAL:
+                        return
+                await asyncio.sleep(self.poll_seconds)
+        finally:
+            if self._watchers.get(key) is asyncio.current_task():
+                del self._watchers[key]
+
+    async def _poll(self, key: str) -> dict:
+        # The database decides when processing is over: the video-service only
+        # knows about the transcode, not about publishing the renditions
+        state = await asyncio.to_thread(_video_state, key)
+        if state is None:
+            return {"status": "failed", "progress": 0, "message": "Video not found"}
+        video_id, ready, failed = state
+        if ready:
+            return {"status": "ready", "progress": 100, "video_id": video_id}
+        if failed:
+            return {"status": "failed", "progress": 0, "video_id": video_id, "message": "Processing failed"}
+
+        upstream = await self._upstream(key)
+        if not upstream:
+            # Still waiting in the job queue
+            return {"status": "queued", "progress": 0, "video_id": video_id}
+        status = upstream.get("status")
+        if status == "error":
+            return {"status": "failed", "progress": 0, "video_id": video_id, "message": upstream.get("message")}
+        if status == "completed":
+            return {"status": "publishing", "progress": 99, "video_id": video_id}
+        return {
+            "status": "processing",
+            "progress": upstream.get("progress", 0),
+            "video_id": video_id,
+            "message": upstream.get("message")
+        }
+
+    async def _upstream(self, key: str) -> Optional[dict]:
+        # Errors propagate: an unreachable service must not look like "queued"
+        resp = await self.client.get(f"/status/{key}")
+        resp.raise_for_status()
+        return resp.json()
+
+
+def _video_state(key: str):
+    db = SessionLocal()
+    try:
+        row = db.query(Video.id, Video.video_url, Video.failed_at).filter(Video.processing_key == key).first()
+        if row is None:
+            return None
+        return row.id, bool(row.video_url), row.failed_at is not None
+    finally:
+        db.close()
+
+
+progress_hub = ProgressHub()
@@ -0,0 +1,107 @@
+import bisect
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import FEED_RANK_TOP_N
+from app.models.models import Video
+
+# Engagement weights and recency gravity for feed scoring
+VIEW_WEIGHT = 1.0
+LIKE_WEIGHT = 4.0
+SHARE_WEIGHT = 8.0
+GRAVITY = 1.5
+
+def score_video(views: int, likes: int, shares: int, created_at: Optional[datetime], now: datetime) -> float:
+    engagement = VIEW_WEIGHT * (views or 0) + LIKE_WEIGHT * (likes or 0) + SHARE_WEIGHT * (shares or 0)
+    age_hours = max(0.0, (now - created_at).total_seconds() / 3600) if created_at else 0.0
+    return (engagement + 1) / ((age_hours + 2) ** GRAVITY)
+
+
+class FeedRanker:
+    """Top-N ranked video ids per video_type, kept in memory.
+
+    A periodic full rebuild re-applies recency decay to every approved video;
+    between rebuilds, single videos are re-scored in place as they change, so
+    serving a page is just a slice of a pre-sorted list.
+    """
+
+    def __init__(self, top_n: int = FEED_RANK_TOP_N):
+        self.top_n = top_n
+        self._lock = threading.Lock()
+        # video_type -> ascending list of (-score, video_id)
+        self._ranked: Dict[str, List[Tuple[float, int]]] = {}
+        # video_id -> (video_type, -score) for everything currently ranked
+        self._entries: Dict[int, Tuple[str, float]] = {}
+        self.refreshed_at: Optional[datetime] = None
+
+    def refresh(self, db: Session):
+        now = datetime.now()
+        rows = db.query(
+            Video.id, Video.video_type, Video.views, Video.likes_count, Video.shares, Video.created_at
+        ).filter(Video.status == "approved").all()
+
+        ranked: Dict[str, List[Tuple[float, int]]] = {}
+        for video_id, video_type, views, likes, shares, created_at in rows:
+            ranked.setdefault(video_type, []).append((-score_video(views, likes, shares, created_at, now), video_id))
+
+        entries = {}
+        for video_type, items in ranked.items():
+            items.sort()
+            del items[self.top_n:]
+            for key, video_id in items:
+                entries[video_id] = (video_type, key)
+
+        with self._lock:
+            self._ranked = ranked
+            self._entries = entries
+            self.refreshed_at = now
+
+    def update(self, video: Video):
+        """Re-score one video after its engagement or status changed."""
+        if video.status != "approved":
+            self.remove(video.id)
+            return
+
+        key = -score_video(video.views, video.likes_count, video.shares, video.created_at, datetime.now())
+        with self._lock:
+            self._discard(video.id)
+            items = self._ranked.setdefault(video.video_type, [])
+            if len(items) >= self.top_n and key >= items[-1][0]:
+                return
+            bisect.insort(items, (key, video.id))
+            self._entries[video.id] = (video.video_type, key)
+            if len(items) > self.top_n:
+                _, evicted_id = items.pop()
+                self._entries.pop(evicted_id, None)
+
+    def remove(self, video_id: int):
+        with self._lock:
+            self._discard(video_id)
+
+    def _discard(self, video_id: int):
+        entry = self._entries.pop(video_id, None)
+        if not entry:
+            return
+        video_type, key = entry
+        items = self._ranked.get(video_type, [])
+        index = bisect.bisect_left(items, (key, video_id))
+        if index < len(items) and items[index] == (key, video_id):
+            del items[index]
+
+    def page(self, video_type: str, offset: int, limit: int) -> Tuple[List[int], bool]:
+        """Return (video_ids, has_more) for one slice of the ranking."""
+        with self._lock:
+            items = self._ranked.get(video_type, [])
+            ids = [video_id for _, video_id in items[offset:offset + limit]]
+            return ids, offset + limit < len(items)
+
+    @property
+    def is_ready(self) -> bool:
+        return self.refreshed_at is not None
+
+
+feed_ranker = FeedRanker()
+
@@ -0,0 +1,164 @@
+import logging
+import re
+import threading
+from typing import List, Tuple
+
+from sqlalchemy import text, or_
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.orm import Session
+
+from app.db.session import engine
+from app.models.models import Video
+
+logger = logging.getLogger(__name__)
+
+# Relevance is multiplied by 1 + popularity / (popularity + POPULARITY_HALF_POINT),
+# so engagement can at most double a match's score and never swamps relevance.
+POPULARITY_HALF_POINT = 1000
+POPULARITY_SQL = "(COALESCE(v.views, 0) + 4 * COALESCE(v.likes_count, 0) + 8 * COALESCE(v.shares, 0))"
+BLEND_SQL = f"(1.0 + {POPULARITY_SQL} * 1.0 / ({POPULARITY_SQL} + {POPULARITY_HALF_POINT}))"
+
+MAX_QUERY_TERMS = 8
+
+def query_terms(query_str: str) -> List[str]:
+    return re.findall(r"\w+", (query_str or "").lower())[:MAX_QUERY_TERMS]
+
+
+class LikeSearchIndex:
+    """Fallback for databases without a full-text engine: bounded ILIKE scan."""
+
+    def ensure(self, conn):
+        pass
+
+    def index_video(self, db: Session, video: Video):
+        pass
+
+    def remove_video(self, db: Session, video_id: int):
+        pass
+
+    def search(self, db: Session, query_str: str, status: str, limit: int, offset: int) -> List[Tuple[int, float]]:
+        query = db.query(Video.id)
+        if status:
+            query = query.filter(Video.status == status)
+        for term in query_terms(query_str):
+            pattern = f"%{term}%"
+            query = query.filter(or_(Video.title.ilike(pattern), Video.description.ilike(pattern), Video.tags.ilike(pattern)))
+        rows = query.order_by(Video.views.desc(), Video.id.desc()).offset(offset).limit(limit).all()
+        return [(row[0], 0.0) for row in rows]
+
+
+class SqliteSearchIndex(LikeSearchIndex):
+    """FTS5 table keyed by video id, maintained explicitly on every write."""
+
+    def ensure(self, conn):
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts "
+            "USING fts5(title, description, tags, tokenize='unicode61')"
+        ))
+        # Backfill once for databases that predate the index
+        if conn.execute(text("SELECT count(*) FROM videos_fts")).scalar() == 0:
+            conn.execute(text(
+                "INSERT INTO videos_fts(rowid, title, description, tags) "
+                "SELECT id, coalesce(title, ''), coalesce(description, ''), coalesce(tags, '') FROM videos"
+            ))
+
+    def index_video(self, db: Session, video: Video):
+        self.remove_video(db, video.id)
+        db.execute(
+            text("INSERT INTO videos_fts(rowid, title, description, tags) VALUES (:id, :title, :description, :tags)"),
+            {"id": video.id, "title": video.title or "", "description": video.description or "", "tags": video.tags or ""}
+        )
+
+    def remove_video(self, db: Session, video_id: int):
+        db.execute(text("DELETE FROM videos_fts WHERE rowid = :id"), {"id": video_id})
+
+    def search(self, db: Session, query_str: str, status: str, limit: int, offset: int) -> List[Tuple[int, float]]:
+        terms = query_terms(query_str)
+        if not terms:
+            return []
+        # Prefix match every term; quoting keeps FTS5 syntax out of user input
+        match = " ".join(f'"{term}"*' for term in terms)
+        rows = db.execute(text(
+            f"SELECT v.id, -bm25(videos_fts, 3.0, 1.0, 2.0) * {BLEND_SQL} AS score "
+            "FROM videos_fts JOIN videos v ON v.id = videos_fts.rowid "
+            "WHERE videos_fts MATCH :match AND (:status IS NULL OR v.status = :status) "
+            "ORDER BY score DESC, v.id DESC LIMIT :limit OFFSET :offset"
+        ), {"match": match, "status": status or None, "limit": limit, "offset": offset}).all()
+        return [(row[0], row[1]) for row in rows]
+
+
+class PostgresSearchIndex(LikeSearchIndex):
+    """Generated, weighted tsvector column with a GIN index.
+
+    Postgres keeps the vector in sync on every INSERT/UPDATE, so the explicit
+    index/remove hooks are no-ops here.
+    """
+
+    def ensure(self, conn):
+        conn.execute(text(
+            "ALTER TABLE videos ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(tags, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+            ") STORED"
+        ))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_videos_search_vector ON videos USING GIN (search_vector)"))
+
+    def search(self, db: Session, query_str: str, status: str, limit: int, offset: int) -> List[Tuple[int, float]]:
+        terms = query_terms(query_str)
+        if not terms:
+            return []
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        rows = db.execute(text(
+            f"SELECT v.id, ts_rank(v.search_vector, q) * {BLEND_SQL} AS score "
+            "FROM videos v, to_tsquery('simple', :tsquery) q "
+            "WHERE v.search_vector @@ q AND (CAST(:status AS VARCHAR) IS NULL OR v.status = :status) "
+            "ORDER BY score DESC, v.id DESC LIMIT :limit OFFSET :offset"
+        ), {"tsquery": tsquery, "status": status or None, "limit": limit, "offset": offset}).all()
+        return [(row[0], row[1]) for row in rows]
+
+
+class VideoSearchIndex:
+    """Picks the full-text backend for the configured database and creates its
+    structures on first use, falling back to the ILIKE scan if that fails."""
+
+    def __init__(self):
+        self._backend = None
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self) -> LikeSearchIndex:
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = self._create_backend()
+        return self._backend
+
+    def _create_backend(self) -> LikeSearchIndex:
+        dialect = engine.dialect.name
+        if dialect == "sqlite":
+            candidate = SqliteSearchIndex()
+        elif dialect == "postgresql":
+            candidate = PostgresSearchIndex()
+        else:
+            return LikeSearchIndex()
+        try:
+            with engine.begin() as conn:
+                candidate.ensure(conn)
+            return candidate
+        except (OperationalError, ProgrammingError) as e:
+            logger.error("Full-text search unavailable, falling back to ILIKE: %s", e)
+            return LikeSearchIndex()
+
+    def index_video(self, db: Session, video: Video):
+        self.backend.index_video(db, video)
+
+    def remove_video(self, db: Session, video_id: int):
+        self.backend.remove_video(db, video_id)
+
+    def search(self, db: Session, query_str: str, status: str = "approved", limit: int = 20, offset: int = 0):
+        """Return [(video_id, score)] ordered by blended relevance."""
+        return self.backend.search(db, query_str, status, limit, offset)
+
+
+search_index = VideoSearchIndex()
@@ -0,0 +1,107 @@
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import TRENDING_WINDOWS
+from app.models.models import Follow, Like, User, Video, View
+
+TRENDING_VIDEOS = 5
+RECENT_VIDEOS = 5
+TRENDING_CREATORS = 3
+MAX_SUGGESTIONS = 10
+
+# Weight of a like relative to a view, and of engagement on a creator's
+# videos relative to a new follower
+LIKE_WEIGHT = 4.0
+CREATOR_ENGAGEMENT_WEIGHT = 0.25
+
+
+class TrendingEngine:
+    """Scores recent activity over nested sliding windows.
+
+    Each window contributes weight * activity inside it, so an event from the
+    last hour counts in every window while a week-old one only counts in the
+    widest: a step-wise time decay computed with plain grouped COUNTs.
+    """
+
+    def __init__(self, windows=TRENDING_WINDOWS):
+        self.windows = windows
+        self._lock = threading.Lock()
+        self._suggestions: Optional[List[str]] = None
+        self.computed_at: Optional[datetime] = None
+
+    def _windowed_counts(self, db: Session, column, timestamp, now: datetime, *filters) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for hours, weight in self.windows:
+            since = now - timedelta(hours=hours)
+            rows = db.query(column, func.count()).filter(
+                column.isnot(None), timestamp >= since, *filters
+            ).group_by(column).all()
+            for key, count in rows:
+                scores[key] = scores.get(key, 0.0) + weight * count
+        return scores
+
+    def compute(self, db: Session, now: Optional[datetime] = None) -> List[str]:
+        now = now or datetime.now()
+
+        # Videos: views and likes inside each window
+        video_scores = self._windowed_counts(db, View.video_id, View.created_at, now)
+        for video_id, score in self._windowed_counts(db, Like.video_id, Like.created_at, now).items():
+            video_scores[video_id] = video_scores.get(video_id, 0.0) + LIKE_WEIGHT * score
+
+        # Creators: new followers plus likes landing on their videos
+        creator_scores = self._windowed_counts(db, Follow.followed_id, Follow.created_at, now)
+        owner_likes = self._windowed_counts(
+            db, Video.owner_id, Like.created_at, now, Like.video_id == Video.id, Video.status == "approved"
+        )
+        for owner_id, score in owner_likes.items():
+            creator_scores[owner_id] = creator_scores.get(owner_id, 0.0) + CREATOR_ENGAGEMENT_WEIGHT * score
+
+        trending_titles = []
+        if video_scores:
+            candidates = sorted(video_scores, key=lambda video_id: (-video_scores[video_id], -video_id))
+            approved = dict(
+                db.query(Video.id, Video.title)
+                .filter(Video.id.in_(candidates[:TRENDING_VIDEOS * 4]), Video.status == "approved")
+                .all()
+            )
+            trending_titles = [approved[video_id] for video_id in candidates if video_id in approved][:TRENDING_VIDEOS]
+
+        recent_titles = [
+            row[0] for row in db.query(Video.title)
+            .filter(Video.status == "approved")
+            .order_by(Video.created_at.desc(), Video.id.desc())
+            .limit(RECENT_VIDEOS)
+            .all()
+        ]
+
+        creator_names = []
+        if creator_scores:
+            top_creators = sorted(creator_scores, key=lambda user_id: -creator_scores[user_id])[:TRENDING_CREATORS]
+            names = dict(db.query(User.id, User.username).filter(User.id.in_(top_creators)).all())
+            creator_names = [f"@{names[user_id]}" for user_id in top_creators if names.get(user_id)]
+
+        suggestions = []
+        # Recent uploads fill whatever room trending videos and creators leave
+        for value in trending_titles + creator_names + recent_titles:
+            if value and value not in suggestions:
+                suggestions.append(value)
+        suggestions = suggestions[:MAX_SUGGESTIONS]
+
+        with self._lock:
+            self._suggestions = suggestions
+            self.computed_at = now
+        return suggestions
+
+    def get_suggestions(self, db: Session) -> List[str]:
+        """Precomputed suggestions; computed inline only before the first run."""
+        with self._lock:
+            if self._suggestions is not None:
+                return list(self._suggestions)
+        return list(self.compute(db))
+
+
+trending = TrendingEngine()
@@ -6,9 +6,57 @@ from app.core import dependencies
 # Trigger reload - B2 Config Typo Fixed
 
 from fastapi.staticfiles import StaticFiles
+from contextlib import asynccontextmanager
+import asyncio
+import mimetypes
 import os
 
-app = FastAPI(title="Montage Video Platform")
+from app.core.config import FEED_RANK_REFRESH_SECONDS, AUTOCOMPLETE_REFRESH_SECONDS, TRENDING_REFRESH_SECONDS, UPLOAD_CLEANUP_INTERVAL_SECONDS
+from app.core.config import PROCESSING_SWEEP_INTERVAL_SECONDS, JOB_INLINE_WORKERS
+from app.db.session import SessionLocal
+from app.utils.background import run_periodic
+from app.utils.ranking import feed_ranker
+from app.utils.autocomplete import autocomplete
+from app.utils.trending import trending
+from app.utils.search import search_index
+from app.crud.upload import expire_upload_sessions
+from app.utils.jobs import job_queue, WorkerPool
+from app.utils import processing # registers the processing job handlers
+from app.utils.progress import progress_hub
+from app.utils.admission import UploadAdmissionMiddleware
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create the full-text index up front: created lazily inside a write
+    # transaction, SQLite would report the database as locked
+    await asyncio.to_thread(lambda: search_index.backend)
+
+    # Background jobs owned by this worker
+    tasks = [
+        asyncio.create_task(run_periodic(feed_ranker.refresh, SessionLocal, FEED_RANK_REFRESH_SECONDS)),
+        # Rebuilds pick up weight changes; approvals and sign-ups apply immediately
+        asyncio.create_task(run_periodic(autocomplete.refresh, SessionLocal, AUTOCOMPLETE_REFRESH_SECONDS)),
+        asyncio.create_task(run_periodic(trending.compute, SessionLocal, TRENDING_REFRESH_SECONDS)),
+        asyncio.create_task(run_periodic(expire_upload_sessions, SessionLocal, UPLOAD_CLEANUP_INTERVAL_SECONDS)),
+        # Safety net for completion callbacks that never arrive
+        asyncio.create_task(run_periodic(processing.sweep_stalled_processing, SessionLocal, PROCESSING_SWEEP_INTERVAL_SECONDS)),
+    ]
+    # Development convenience; production runs worker.py as its own process
+    pool = WorkerPool(job_queue, SessionLocal, concurrency=JOB_INLINE_WORKERS) if JOB_INLINE_WORKERS > 0 else None
+    if pool:
+        pool.start()
+    yield
+    for task in tasks:
+        task.cancel()
+    await progress_hub.close()
+    if pool:
+        await asyncio.to_thread(pool.stop)
+
+app = FastAPI(title="Montage Video Platform", lifespan=lifespan)
+
+# Rejects uploads before their body is read; added first so that CORS,
+# added after it, wraps it and its 429s carry CORS headers
+app.add_middleware(UploadAdmissionMiddleware)
 
 # CORS middleware - MUST be added before other middleware
 app.add_middleware(
@@ -17,9 +65,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Upload-Offset", "Upload-Length", "Location", "Retry-After", "ETag"],
 )
 
 # Mount static files
+# HLS: some platforms map .ts to Qt translation files
+mimetypes.add_type("application/vnd.apple.mpegurl", ".m3u8")
+mimetypes.add_type("video/mp2t", ".ts")
+mimetypes.add_type("text/vtt", ".vtt")
+mimetypes.add_type("image/webp", ".webp")
 static_path = os.path.join(os.path.dirname(__file__), "static")
 os.makedirs(static_path, exist_ok=True)
 app.mount("/static", StaticFiles(directory=static_path), name="static")
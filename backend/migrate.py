@@ -0,0 +1,54 @@
+import os
+import sys
+
+# Add the parent directory to sys.path so we can import app
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import inspect, text
+from app.db.session import engine
+from app.db.base import Base
+from app.models import models  # registers every table on Base.metadata
+
+def _default_sql(column):
+    default = column.server_default
+    if default is None:
+        return None
+    arg = default.arg
+    return arg if isinstance(arg, str) else str(arg.text)
+
+def add_missing_columns(conn, table, existing):
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+        default = _default_sql(column)
+        if default is not None:
+            ddl += f" DEFAULT '{default}'" if not default.lstrip("-").isdigit() else f" DEFAULT {default}"
+            # Existing rows take the default, so NOT NULL is safe to add with it
+            if not column.nullable:
+                ddl += " NOT NULL"
+        print(f"Adding {table.name}.{column.name}...")
+        conn.execute(text(ddl))
+
+def migrate():
+    """Bring an existing database up to the models.
+
+    create_all only creates missing tables; columns and indexes added to
+    existing tables since the database was created are added here. Safe to
+    run repeatedly: anything already present is left alone.
+    """
+    Base.metadata.create_all(bind=engine)
+
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            add_missing_columns(conn, table, {c["name"] for c in inspector.get_columns(table.name)})
+            existing_indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    print(f"Creating index {index.name}...")
+                    index.create(bind=conn)
+    print("Database is up to date.")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,27 @@
+import os
+import sys
+
+# Add the parent directory to sys.path so we can import app
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.session import SessionLocal, engine
+from app.models.models import Tag, VideoTag, PostTag
+from app.crud import tag as crud_tag
+
+def rebuild():
+    # Databases created before the tag index need its tables once
+    for model in [Tag, VideoTag, PostTag]:
+        model.__table__.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        crud_tag.rebuild_tag_index(db)
+        print(f"Rebuilt tag index, {db.query(Tag).count()} tags.")
+    except Exception as e:
+        print(f"Error: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild()
@@ -0,0 +1,38 @@
+import os
+import sys
+
+# Add the parent directory to sys.path so we can import app
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import inspect, text
+from app.db.session import SessionLocal, engine
+from app.crud import video as crud_video
+
+COUNTER_COLUMNS = ["likes_count", "comments_count"]
+
+def ensure_counter_columns():
+    # Databases created before the counters existed need the columns added once
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in ["videos", "posts"]:
+            existing = {c["name"] for c in inspector.get_columns(table)}
+            for column in COUNTER_COLUMNS:
+                if column not in existing:
+                    print(f"Adding {table}.{column}...")
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"))
+
+def reconcile():
+    ensure_counter_columns()
+
+    db = SessionLocal()
+    try:
+        repaired = crud_video.reconcile_engagement_counters(db)
+        print(f"Reconciled engagement counters, {repaired} rows repaired.")
+    except Exception as e:
+        print(f"Error: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    reconcile()
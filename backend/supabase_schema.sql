@@ -5,6 +5,11 @@
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
 -- Drop existing tables if they exist (in correct order due to foreign keys)
+DROP TABLE IF EXISTS "UploadSession" CASCADE;
+DROP TABLE IF EXISTS "Job" CASCADE;
+DROP TABLE IF EXISTS "Tag" CASCADE;
+DROP TABLE IF EXISTS "VideoTag" CASCADE;
+DROP TABLE IF EXISTS "PostTag" CASCADE;
 DROP TABLE IF EXISTS reposts CASCADE;
 DROP TABLE IF EXISTS follows CASCADE;
 DROP TABLE IF EXISTS comments CASCADE;
@@ -60,7 +65,10 @@ CREATE TABLE "Video" (
     url_1080p VARCHAR,
     url_2k VARCHAR,
     url_4k VARCHAR,
+    manifest_url VARCHAR,
     thumbnail_url VARCHAR NOT NULL,
+    thumbnails JSONB,
+    seek_preview_url VARCHAR,
     video_type VARCHAR NOT NULL,
     status VARCHAR DEFAULT 'pending',
     owner_id INTEGER NOT NULL REFERENCES "User"(id) ON DELETE CASCADE,
@@ -69,6 +77,20 @@ CREATE TABLE "Video" (
     shares INTEGER DEFAULT 0,
     duration INTEGER DEFAULT 0,
     processing_key VARCHAR,
+    content_hash VARCHAR(64),
+    -- Source media details, filled from the video-service probe
+    width INTEGER,
+    height INTEGER,
+    fps DOUBLE PRECISION,
+    bitrate BIGINT,
+    video_codec VARCHAR,
+    audio_codec VARCHAR,
+    file_size BIGINT,
+    rendition_sizes JSONB,
+    failed_at TIMESTAMP WITH TIME ZONE,
+    -- Denormalized engagement counters; backfill with reconcile_counters.py
+    likes_count INTEGER NOT NULL DEFAULT 0,
+    comments_count INTEGER NOT NULL DEFAULT 0,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
@@ -76,6 +98,9 @@ CREATE INDEX idx_video_owner ON "Video"(owner_id);
 CREATE INDEX idx_video_type ON "Video"(video_type);
 CREATE INDEX idx_video_status ON "Video"(status);
 CREATE INDEX idx_video_created ON "Video"(created_at DESC);
+-- Keyset pagination for feeds: WHERE status = ? ORDER BY created_at DESC, id DESC
+CREATE INDEX idx_video_status_created_id ON "Video"(status, created_at, id);
+CREATE INDEX idx_video_content_hash ON "Video"(content_hash);
 
 -- Views table (for tracking video views)
 CREATE TABLE "View" (
@@ -88,6 +113,8 @@ CREATE TABLE "View" (
 CREATE INDEX idx_view_user ON "View"(user_id);
 CREATE INDEX idx_view_video ON "View"(video_id);
 CREATE INDEX idx_view_created ON "View"(created_at);
+-- Sliding-window trending counts: WHERE created_at >= ? GROUP BY video_id
+CREATE INDEX idx_view_created_video ON "View"(created_at, video_id);
 
 -- Likes table (composite primary key)
 CREATE TABLE "Like" (
@@ -98,6 +125,7 @@ CREATE TABLE "Like" (
 );
 
 CREATE INDEX idx_like_video ON "Like"(video_id);
+CREATE INDEX idx_like_created_video ON "Like"(created_at, video_id);
 
 -- Posts table
 CREATE TABLE "Post" (
@@ -106,6 +134,9 @@ CREATE TABLE "Post" (
     image_url VARCHAR,
     owner_id INTEGER NOT NULL REFERENCES "User"(id) ON DELETE CASCADE,
     is_active BOOLEAN DEFAULT TRUE,
+    -- Denormalized engagement counters; backfill with reconcile_counters.py
+    likes_count INTEGER NOT NULL DEFAULT 0,
+    comments_count INTEGER NOT NULL DEFAULT 0,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
@@ -136,6 +167,7 @@ CREATE TABLE "Follow" (
 
 CREATE INDEX idx_follow_follower ON "Follow"(follower_id);
 CREATE INDEX idx_follow_followed ON "Follow"(followed_id);
+CREATE INDEX idx_follow_created_followed ON "Follow"(created_at, followed_id);
 
 -- Reposts table
 CREATE TABLE "Repost" (
@@ -148,6 +180,74 @@ CREATE TABLE "Repost" (
 CREATE INDEX idx_repost_user ON "Repost"(user_id);
 CREATE INDEX idx_repost_video ON "Repost"(video_id);
 
+-- Upload sessions (resumable chunked uploads)
+CREATE TABLE "UploadSession" (
+    id VARCHAR PRIMARY KEY,
+    owner_id INTEGER NOT NULL REFERENCES "User"(id) ON DELETE CASCADE,
+    title VARCHAR,
+    description TEXT,
+    tags TEXT,
+    video_type VARCHAR,
+    filename VARCHAR,
+    length BIGINT,
+    bytes_received BIGINT DEFAULT 0 NOT NULL,
+    temp_path VARCHAR,
+    video_id INTEGER REFERENCES "Video"(id) ON DELETE SET NULL,
+    writing_since TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX idx_upload_session_owner ON "UploadSession"(owner_id);
+CREATE INDEX idx_upload_session_updated ON "UploadSession"(updated_at);
+
+-- Jobs (durable background work queue)
+CREATE TABLE "Job" (
+    id SERIAL PRIMARY KEY,
+    kind VARCHAR NOT NULL,
+    key VARCHAR,
+    payload TEXT,
+    priority INTEGER DEFAULT 0 NOT NULL,
+    status VARCHAR DEFAULT 'queued',
+    attempts INTEGER DEFAULT 0 NOT NULL,
+    max_attempts INTEGER DEFAULT 5 NOT NULL,
+    run_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    locked_by VARCHAR,
+    locked_at TIMESTAMP WITH TIME ZONE,
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX idx_job_key ON "Job"(key);
+CREATE INDEX idx_job_status_priority_run_at ON "Job"(status, priority, run_at);
+
+-- Tags (normalized from the comma-separated tags columns)
+CREATE TABLE "Tag" (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR NOT NULL UNIQUE,
+    video_count INTEGER DEFAULT 0 NOT NULL,
+    post_count INTEGER DEFAULT 0 NOT NULL
+);
+
+-- Video tag links; the primary key also pages a tag's videos newest-first
+CREATE TABLE "VideoTag" (
+    tag_id INTEGER NOT NULL REFERENCES "Tag"(id) ON DELETE CASCADE,
+    video_id INTEGER NOT NULL REFERENCES "Video"(id) ON DELETE CASCADE,
+    PRIMARY KEY (tag_id, video_id)
+);
+
+CREATE INDEX idx_video_tag_video ON "VideoTag"(video_id);
+
+-- Post tag links
+CREATE TABLE "PostTag" (
+    tag_id INTEGER NOT NULL REFERENCES "Tag"(id) ON DELETE CASCADE,
+    post_id INTEGER NOT NULL REFERENCES "Post"(id) ON DELETE CASCADE,
+    PRIMARY KEY (tag_id, post_id)
+);
+
+CREATE INDEX idx_post_tag_post ON "PostTag"(post_id);
+
 -- Enable Row Level Security (RLS) on all tables
 ALTER TABLE "User" ENABLE ROW LEVEL SECURITY;
 ALTER TABLE "VerificationCode" ENABLE ROW LEVEL SECURITY;
@@ -158,6 +258,11 @@ ALTER TABLE "Post" ENABLE ROW LEVEL SECURITY;
 ALTER TABLE "Comment" ENABLE ROW LEVEL SECURITY;
 ALTER TABLE "Follow" ENABLE ROW LEVEL SECURITY;
 ALTER TABLE "Repost" ENABLE ROW LEVEL SECURITY;
+ALTER TABLE "Job" ENABLE ROW LEVEL SECURITY;
+ALTER TABLE "UploadSession" ENABLE ROW LEVEL SECURITY;
+ALTER TABLE "Tag" ENABLE ROW LEVEL SECURITY;
+ALTER TABLE "VideoTag" ENABLE ROW LEVEL SECURITY;
+ALTER TABLE "PostTag" ENABLE ROW LEVEL SECURITY;
 
 -- Create RLS policies for public read access (you can customize these based on your needs)
 -- For now, allowing all operations via service role key (which your backend uses)
@@ -189,6 +294,21 @@ CREATE POLICY "Allow all for service role" ON "Follow" FOR ALL USING (true);
 -- Repost policies
 CREATE POLICY "Allow all for service role" ON "Repost" FOR ALL USING (true);
 
+-- UploadSession policies
+CREATE POLICY "Allow all for service role" ON "UploadSession" FOR ALL USING (true);
+
+-- Job policies
+CREATE POLICY "Allow all for service role" ON "Job" FOR ALL USING (true);
+
+-- Tag policies
+CREATE POLICY "Allow all for service role" ON "Tag" FOR ALL USING (true);
+
+-- VideoTag policies
+CREATE POLICY "Allow all for service role" ON "VideoTag" FOR ALL USING (true);
+
+-- PostTag policies
+CREATE POLICY "Allow all for service role" ON "PostTag" FOR ALL USING (true);
+
 -- Grant necessary permissions
 GRANT ALL ON ALL TABLES IN SCHEMA public TO postgres, anon, authenticated, service_role;
 GRANT ALL ON ALL SEQUENCES IN SCHEMA public TO postgres, anon, authenticated, service_role;
@@ -197,5 +317,5 @@ GRANT ALL ON ALL SEQUENCES IN SCHEMA public TO postgres, anon, authenticated, se
 DO $$
 BEGIN
     RAISE NOTICE 'Montage database schema created successfully!';
-    RAISE NOTICE 'Tables created: User, VerificationCode, Video, View, Like, Post, Comment, Follow, Repost';
+    RAISE NOTICE 'Tables created: User, VerificationCode, Video, View, Like, Post, Comment, Follow, Repost, UploadSession, Job, Tag, VideoTag, PostTag';
 END $$;
@@ -0,0 +1,78 @@
+import os
+import sys
+
+# Add the parent directory to sys.path so we can import app
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from fastapi.testclient import TestClient
+
+from main import app
+from app.db.base import Base
+from app.db.session import get_db
+from app.models.models import User, Video
+from app.core.security import create_access_token
+
+PAGE_SIZES = [1, 10, 50]
+
+def build_client():
+    # Throwaway in-memory database shared across the test client's threads
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = TestingSession()
+    owners = [User(username=f"creator{i}", email=f"creator{i}@montage.test") for i in range(10)]
+    db.add_all(owners)
+    db.commit()
+    db.add_all([
+        Video(
+            title=f"Video {i}", video_url="", thumbnail_url="", video_type="home",
+            status="approved", owner_id=owners[i % len(owners)].id
+        )
+        for i in range(max(PAGE_SIZES))
+    ])
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        session = TestingSession()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app), engine
+
+def test_feed_query_count_is_constant():
+    client, engine = build_client()
+    # Authenticated requests bypass the response cache and hit the database
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'creator0'})}"}
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    counts = {}
+    for page_size in PAGE_SIZES:
+        statements.clear()
+        response = client.get(f"/api/v1/videos/?sort=recent&limit={page_size}", headers=headers)
+        assert response.status_code == 200
+        assert len(response.json()) == page_size
+        assert all(v["owner"] for v in response.json())
+        counts[page_size] = len(statements)
+
+    app.dependency_overrides.clear()
+    print(f"Queries per feed request by page size: {counts}")
+    assert len(set(counts.values())) == 1, f"Query count grows with page size: {counts}"
+
+if __name__ == "__main__":
+    try:
+        test_feed_query_count_is_constant()
+        print("Feed query count is constant.")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"Failed: {e}")
+        sys.exit(1)
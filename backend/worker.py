@@ -0,0 +1,31 @@
+import os
+import sys
+import logging
+import signal
+import threading
+
+# Add the parent directory to sys.path so we can import app
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import JOB_WORKER_CONCURRENCY
+from app.db.session import SessionLocal
+from app.utils.jobs import job_queue, WorkerPool
+from app.utils import processing # registers the processing job handlers
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    pool = WorkerPool(job_queue, SessionLocal, concurrency=JOB_WORKER_CONCURRENCY)
+
+    stopping = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stopping.set())
+
+    pool.start()
+    print(f"Processing jobs with {JOB_WORKER_CONCURRENCY} workers, Ctrl+C to stop.")
+    while not stopping.wait(1):
+        pass
+    print("Finishing running jobs...")
+    pool.stop()
+
+if __name__ == "__main__":
+    main()
@@ -15,12 +15,21 @@ export const login = async (username, password) => {
 };
 
 export const getVideos = async (type, token = null) => {
+    const { videos } = await getVideosPage(type, token);
+    return videos;
+};
+
+// One feed page; nextCursor is null on the last page
+export const getVideosPage = async (type, token = null, cursor = null) => {
     const headers = {};
     if (token) {
         headers['Authorization'] = `Bearer ${token}`;
     }
-    const response = await fetch(`${API_BASE_URL}/videos/?video_type=${type}`, { headers });
-    return response.json();
+    const params = new URLSearchParams({ video_type: type });
+    if (cursor) params.set('cursor', cursor);
+    const response = await fetch(`${API_BASE_URL}/videos/?${params}`, { headers });
+    const videos = await response.json();
+    return { videos, nextCursor: response.headers.get('X-Next-Cursor') };
 };
 
 export const getVideoById = async (id, token = null) => {
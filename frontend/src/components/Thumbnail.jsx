@@ -0,0 +1,32 @@
+import React from 'react';
+
+// Widths the backend renders for each thumbnail variant
+const VARIANT_WIDTHS = { grid: 320, card: 640, hero: 1280 };
+
+const srcSet = (thumbnails, format) =>
+    Object.entries(VARIANT_WIDTHS)
+        .filter(([variant]) => thumbnails[variant]?.[format])
+        .map(([variant, width]) => `${thumbnails[variant][format]} ${width}w`)
+        .join(', ');
+
+/**
+ * Video thumbnail that lets the browser pick the smallest variant for the
+ * rendered size (`sizes`), preferring WebP. Videos without variants (custom
+ * thumbnails, older uploads) fall back to the full-size thumbnail_url.
+ */
+const Thumbnail = ({ video, sizes = '(max-width: 600px) 50vw, 320px', fallback, ...imgProps }) => {
+    const thumbnails = video?.thumbnails;
+    const src = video?.thumbnail_url || fallback;
+    if (!thumbnails) {
+        return <img src={src} loading="lazy" {...imgProps} />;
+    }
+    return (
+        // display: contents keeps the <img> sized by the card, as before
+        <picture style={{ display: 'contents' }}>
+            <source type="image/webp" srcSet={srcSet(thumbnails, 'webp')} sizes={sizes} />
+            <img src={thumbnails.card?.jpg || src} srcSet={srcSet(thumbnails, 'jpg')} sizes={sizes} loading="lazy" {...imgProps} />
+        </picture>
+    );
+};
+
+export default Thumbnail;
@@ -4,6 +4,23 @@ import { useAuth } from '../context/AuthContext';
 import { useNotification } from '../context/NotificationContext';
 import ShortcutGuide from './ShortcutGuide';
 
+const parseVttTime = (value) => value.split(':').reduce((total, part) => total * 60 + parseFloat(part), 0);
+
+// Thumbnail-track cues: "00:00:05.000 --> 00:00:10.000" then "sprite_001.jpg#xywh=160,0,160,90"
+const parsePreviewVtt = (text, baseUrl) => {
+    const cues = [];
+    const lines = text.split(/\r?\n/);
+    for (let i = 0; i < lines.length - 1; i++) {
+        if (!lines[i].includes('-->')) continue;
+        const [start, end] = lines[i].split('-->').map(t => parseVttTime(t.trim()));
+        const [file, fragment = ''] = lines[i + 1].trim().split('#xywh=');
+        const [x, y, w, h] = fragment.split(',').map(Number);
+        if (!file || [x, y, w, h].some(Number.isNaN)) continue;
+        cues.push({ start, end, src: new URL(file, baseUrl).href, x, y, w, h });
+    }
+    return cues;
+};
+
 const VideoPlayer = ({ video, autoPlay = false, onTimeUpdate }) => {
     const videoRef = useRef(null);
     const containerRef = useRef(null);
@@ -141,6 +158,33 @@ const VideoPlayer = ({ video, autoPlay = false, onTimeUpdate }) => {
         }
     };
 
+    // Seek previews: cues from the WebVTT index, each pointing at one sprite tile
+    const [previewCues, setPreviewCues] = useState([]);
+    const [hoverPreview, setHoverPreview] = useState(null);
+
+    useEffect(() => {
+        setPreviewCues([]);
+        const url = video?.seek_preview_url;
+        if (!url) return;
+        let cancelled = false;
+        fetch(url)
+            .then(res => res.ok ? res.text() : '')
+            .then(text => {
+                if (!cancelled) setPreviewCues(parsePreviewVtt(text, url));
+            })
+            .catch(() => {});
+        return () => { cancelled = true; };
+    }, [video?.seek_preview_url]);
+
+    const handleSeekHover = (e) => {
+        if (!previewCues.length || !duration) return;
+        const rect = e.currentTarget.getBoundingClientRect();
+        const fraction = Math.min(1, Math.max(0, (e.clientX - rect.left) / rect.width));
+        const time = fraction * duration;
+        const cue = previewCues.find(c => time >= c.start && time < c.end) || previewCues[previewCues.length - 1];
+        setHoverPreview({ cue, fraction, time });
+    };
+
     const handleSeek = (e) => {
         const seekTime = (e.target.value / 100) * videoRef.current.duration;
         videoRef.current.currentTime = seekTime;
@@ -265,7 +309,7 @@ const VideoPlayer = ({ video, autoPlay = false, onTimeUpdate }) => {
             <video
                 ref={videoRef}
                 src={currentSrc}
-                poster={video?.thumbnail_url}
+                poster={video?.thumbnails?.hero?.webp || video?.thumbnail_url}
                 onClick={togglePlay}
                 onTimeUpdate={handleTimeUpdate}
                 playsInline
@@ -303,19 +347,40 @@ const VideoPlayer = ({ video, autoPlay = false, onTimeUpdate }) => {
                 }}
             >
                 {/* Progress Bar */}
-                <input
-                    type="range"
-                    min="0"
-                    max="100"
-                    value={progress}
-                    onChange={handleSeek}
-                    style={{
-                        width: '100%',
-                        height: '4px',
-                        accentColor: 'var(--accent-primary)',
-                        cursor: 'pointer'
-                    }}
-                />
+                <div style={{ position: 'relative' }} onMouseMove={handleSeekHover} onMouseLeave={() => setHoverPreview(null)}>
+                    {hoverPreview && (
+                        <div style={{
+                            position: 'absolute',
+                            bottom: '16px',
+                            left: `clamp(0px, calc(${hoverPreview.fraction * 100}% - ${hoverPreview.cue.w / 2}px), calc(100% - ${hoverPreview.cue.w}px))`,
+                            pointerEvents: 'none',
+                            textAlign: 'center'
+                        }}>
+                            <div style={{
+                                width: `${hoverPreview.cue.w}px`,
+                                height: `${hoverPreview.cue.h}px`,
+                                backgroundImage: `url(${hoverPreview.cue.src})`,
+                                backgroundPosition: `-${hoverPreview.cue.x}px -${hoverPreview.cue.y}px`,
+                                borderRadius: '4px',
+                                border: '1px solid rgba(255,255,255,0.6)'
+                            }} />
+                            <div style={{ fontSize: '0.75rem', marginTop: '2px' }}>{formatTime(hoverPreview.time)}</div>
+                        </div>
+                    )}
+                    <input
+                        type="range"
+                        min="0"
+                        max="100"
+                        value={progress}
+                        onChange={handleSeek}
+                        style={{
+                            width: '100%',
+                            height: '4px',
+                            accentColor: 'var(--accent-primary)',
+                            cursor: 'pointer'
+                        }}
+                    />
+                </div>
 
                 <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center' }}>
                     <div style={{ display: 'flex', alignItems: 'center', gap: '1rem' }}>
@@ -1,5 +1,6 @@
 import React, { useState, useRef, useEffect } from 'react';
 import { Play } from 'lucide-react';
+import Thumbnail from './Thumbnail';
 
 const VideoPreviewCard = ({ video, onClick, onLike }) => {
     const [isHovered, setIsHovered] = useState(false);
@@ -30,8 +31,10 @@ const VideoPreviewCard = ({ video, onClick, onLike }) => {
         >
             <div className="preview-container">
                 {/* Static Thumbnail */}
-                <img
-                    src={video.thumbnail_url || "https://images.unsplash.com/photo-1618005182384-a83a8bd57fbe?auto=format&fit=crop&w=800&q=60"}
+                <Thumbnail
+                    video={video}
+                    sizes="(max-width: 600px) 100vw, 400px"
+                    fallback="https://images.unsplash.com/photo-1618005182384-a83a8bd57fbe?auto=format&fit=crop&w=800&q=60"
                     alt={video.title}
                     className={`thumbnail ${isHovered && isLoaded ? 'hidden' : ''}`}
                 />
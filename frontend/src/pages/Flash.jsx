@@ -1,5 +1,5 @@
 import React, { useState, useEffect, useRef } from 'react';
-import { getVideos, likeVideo, shareVideo, toggleFollow } from '../api';
+import { getVideosPage, likeVideo, shareVideo, toggleFollow } from '../api';
 import FlashCard from '../components/FlashCard';
 import CommentsDrawer from '../components/CommentsDrawer';
 import { ChevronUp, ChevronDown, Volume2, VolumeX, Play, Pause } from 'lucide-react';
@@ -11,6 +11,8 @@ const Flash = () => {
     const [clips, setClips] = useState([]);
     const [loading, setLoading] = useState(true);
     const [activeVideoId, setActiveVideoId] = useState(null);
+    const [nextCursor, setNextCursor] = useState(null);
+    const loadingMore = useRef(false);
     const [showCommentsId, setShowCommentsId] = useState(null);
     const [muted, setMuted] = useState(true);
     const [osd, setOsd] = useState({ visible: false, icon: null, text: '', key: 0 });
@@ -64,17 +66,20 @@ const Flash = () => {
         containerRef.current.scrollTop = scrollTop.current - walk;
     };
 
+    const toClip = (video) => ({
+        ...video,
+        liked: video.liked_by_user,
+        owner_followed: video.owner?.is_following || false, // Should be added by backend ideally
+        song: "Original Audio"
+    });
+
     useEffect(() => {
         const fetchClips = async () => {
             try {
                 // Pass token to get personalized data (liked_by_user)
-                const data = await getVideos('flash', token);
-                setClips(data.map(video => ({
-                    ...video,
-                    liked: video.liked_by_user,
-                    owner_followed: video.owner?.is_following || false, // Should be added by backend ideally
-                    song: "Original Audio"
-                })));
+                const { videos: data, nextCursor: cursor } = await getVideosPage('flash', token);
+                setClips(data.map(toClip));
+                setNextCursor(cursor);
                 if (data.length > 0 && !activeVideoId) setActiveVideoId(data[0].id);
             } catch (err) {
                 console.error("Failed to load clips", err);
@@ -85,6 +90,24 @@ const Flash = () => {
         fetchClips();
     }, [token]);
 
+    // Fetch the next page as the viewer nears the end of the loaded clips
+    useEffect(() => {
+        if (!nextCursor || loadingMore.current) return;
+        const index = clips.findIndex(c => c.id === activeVideoId);
+        if (index < clips.length - 3) return;
+        loadingMore.current = true;
+        getVideosPage('flash', token, nextCursor)
+            .then(({ videos, nextCursor: cursor }) => {
+                setClips(prev => {
+                    const seen = new Set(prev.map(c => c.id));
+                    return [...prev, ...videos.filter(v => !seen.has(v.id)).map(toClip)];
+                });
+                setNextCursor(cursor);
+            })
+            .catch(err => console.error("Failed to load more clips", err))
+            .finally(() => { loadingMore.current = false; });
+    }, [activeVideoId, clips, nextCursor, token]);
+
     useEffect(() => {
         if (loading) return;
 
@@ -1,10 +1,11 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Play, Flame, TrendingUp, Heart, Zap } from 'lucide-react';
-import { getVideos, likeVideo } from '../api';
+import { getVideos, getVideosPage, likeVideo } from '../api';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
 import { useNotification } from '../context/NotificationContext';
 import VideoPreviewCard from '../components/VideoPreviewCard';
+import Thumbnail from '../components/Thumbnail';
 
 const Home = () => {
     const navigate = useNavigate();
@@ -14,6 +15,9 @@ const Home = () => {
     const [flashVideos, setFlashVideos] = useState([]);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
+    const [nextCursor, setNextCursor] = useState(null);
+    const loadingMore = useRef(false);
+    const sentinel = useRef(null);
 
     const featured = {
         title: "Origins of the Peak",
@@ -23,11 +27,13 @@ const Home = () => {
 
     const fetchVideos = async () => {
         try {
-            const [homeData, flashData] = await Promise.all([
-                getVideos('home', token),
+            const [{ videos: homeData, nextCursor: cursor }, flashData] = await Promise.all([
+                getVideosPage('home', token),
+                // The shelf only shows the first few, so one page is enough
                 getVideos('flash', token)
             ]);
             setVideos(Array.isArray(homeData) ? homeData : []);
+            setNextCursor(Array.isArray(homeData) ? cursor : null);
             setFlashVideos(Array.isArray(flashData) ? flashData : []);
 
             if (!Array.isArray(homeData) || !Array.isArray(flashData)) {
@@ -48,6 +54,27 @@ const Home = () => {
         fetchVideos();
     }, [token]);
 
+    // Load the next page of long-form videos when the end of the list scrolls into view
+    useEffect(() => {
+        if (!nextCursor || !sentinel.current) return;
+        const observer = new IntersectionObserver((entries) => {
+            if (!entries[0].isIntersecting || loadingMore.current) return;
+            loadingMore.current = true;
+            getVideosPage('home', token, nextCursor)
+                .then(({ videos: page, nextCursor: cursor }) => {
+                    setVideos(prev => {
+                        const seen = new Set(prev.map(v => v.id));
+                        return [...prev, ...page.filter(v => !seen.has(v.id))];
+                    });
+                    setNextCursor(cursor);
+                })
+                .catch(err => console.error("Failed to load more videos:", err))
+                .finally(() => { loadingMore.current = false; });
+        }, { rootMargin: '400px' });
+        observer.observe(sentinel.current);
+        return () => observer.disconnect();
+    }, [nextCursor, token]);
+
     const handleVideoClick = (id) => {
         navigate(`/watch/${id}`);
     };
@@ -233,7 +260,7 @@ const Home = () => {
                                     background: 'var(--bg-surface)',
                                     boxShadow: '0 10px 30px rgba(0,0,0,0.3)'
                                 }}>
-                                    <img src={flash.thumbnail_url} alt="" style={{ width: '100%', height: '100%', objectFit: 'cover' }} />
+                                    <Thumbnail video={flash} alt="" style={{ width: '100%', height: '100%', objectFit: 'cover' }} />
                                     <div style={{
                                         position: 'absolute',
                                         bottom: 0,
@@ -282,6 +309,7 @@ const Home = () => {
 
                 </div>
             )}
+            {nextCursor && <div ref={sentinel} style={{ height: '1px' }} />}
         </div>
     );
 };
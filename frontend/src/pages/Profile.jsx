@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { Users, Eye, Play, Zap, Grid, Heart, MessageSquare, Share2, Plus, Bell } from 'lucide-react';
 import { getUserProfile, toggleFollow } from '../api';
+import Thumbnail from '../components/Thumbnail';
 import { useAuth } from '../context/AuthContext';
 import { useNotification } from '../context/NotificationContext';
 
@@ -209,7 +210,7 @@ const Profile = () => {
                         {profile.videos.length > 0 ? profile.videos.map(v => (
                             <div key={v.id} className="video-item" onClick={() => navigate(`/watch/${v.id}`)}>
                                 <div className="video-card">
-                                    <img src={v.thumbnail_url} alt="" className="video-thumb" />
+                                    <Thumbnail video={v} alt="" className="video-thumb" />
                                     <div style={{ position: 'absolute', bottom: '10px', right: '10px', background: 'rgba(0,0,0,0.8)', padding: '2px 6px', borderRadius: '4px', fontSize: '0.7rem' }}>{formatDuration(v.duration)}</div>
                                 </div>
                                 <div style={{ marginTop: '0.8rem', fontWeight: 600 }}>{v.title}</div>
@@ -235,7 +236,7 @@ const Profile = () => {
                                     position: 'relative',
                                     overflow: 'hidden'
                                 }}>
-                                    <img src={v.thumbnail_url} alt="" className="video-thumb" style={{ width: '100%', height: '100%', objectFit: 'cover', transition: 'transform 0.3s ease' }} />
+                                    <Thumbnail video={v} sizes="25vw" alt="" className="video-thumb" style={{ width: '100%', height: '100%', objectFit: 'cover', transition: 'transform 0.3s ease' }} />
 
                                     {/* View Count Overlay */}
                                     <div style={{
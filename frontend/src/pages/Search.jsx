@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { useLocation, useNavigate } from 'react-router-dom';
 import { Search as SearchIcon, Users, Play, Zap, Sparkles, AlertCircle } from 'lucide-react';
 import { searchUnified } from '../api';
+import Thumbnail from '../components/Thumbnail';
 
 const Search = () => {
     const location = useLocation();
@@ -137,7 +138,7 @@ const Search = () => {
                                         }}
                                     >
                                         <div className="result-thumb" style={{ position: 'relative', width: video.video_type === 'flash' ? '180px' : '300px', minWidth: video.video_type === 'flash' ? '180px' : '300px', aspectRatio: video.video_type === 'flash' ? '9/16' : '16/9', borderRadius: '15px', overflow: 'hidden' }}>
-                                            <img src={video.thumbnail_url} alt="" style={{ width: '100%', height: '100%', objectFit: 'cover' }} />
+                                            <Thumbnail video={video} sizes={video.video_type === 'flash' ? '180px' : '300px'} alt="" style={{ width: '100%', height: '100%', objectFit: 'cover' }} />
                                             {video.video_type === 'flash' ? (
                                                 <div style={{ position: 'absolute', top: '10px', right: '10px', background: 'rgba(255, 62, 62, 0.9)', padding: '4px 8px', borderRadius: '4px', fontSize: '0.7rem', fontWeight: 800 }}>FLASH</div>
                                             ) : (
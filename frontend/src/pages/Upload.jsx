@@ -132,50 +132,48 @@ const Upload = () => {
             const processingKey = data.processing_key;
 
             if (processingKey) {
-                const pollInterval = setInterval(async () => {
-                    try {
-                        const statusResp = await fetch(`${API_BASE_URL}/videos/status/${encodeURIComponent(processingKey)}`, {
-                            headers: { 'Authorization': `Bearer ${token}` }
+                // One shared upstream watcher per task on the server; no polling here
+                const events = new EventSource(`${API_BASE_URL}/videos/status/${encodeURIComponent(processingKey)}/events`);
+
+                events.addEventListener('progress', (e) => {
+                    const statusData = JSON.parse(e.data);
+                    updateNotification(notificationId, {
+                        progress: statusData.progress,
+                        status: 'Processing...',
+                        message: statusData.message
+                    });
+                });
+
+                events.addEventListener('done', (e) => {
+                    events.close();
+                    const statusData = JSON.parse(e.data);
+                    if (statusData.status === 'ready') {
+                        updateNotification(notificationId, {
+                            type: 'success',
+                            status: 'Upload Complete!',
+                            message: `"${title}" is now live.`,
+                            progress: 100
+                        });
+                        setTimeout(() => removeNotification(notificationId), 3000);
+
+                        setQuotas(prev => ({
+                            ...prev,
+                            [currentType]: { ...prev[currentType], used: prev[currentType].used + 1 }
+                        }));
+                        setTitle('');
+                        setFile(null);
+                        setThumbnailFile(null);
+                    } else {
+                        updateNotification(notificationId, {
+                            type: 'error',
+                            status: 'Processing Failed',
+                            message: statusData.message || 'Error occurred during processing.'
                         });
-                        const statusData = await statusResp.json();
-
-                        if (statusData) {
-                            if (statusData.status === 'completed') {
-                                clearInterval(pollInterval);
-                                updateNotification(notificationId, {
-                                    type: 'success',
-                                    status: 'Upload Complete!',
-                                    message: `"${title}" is now live.`,
-                                    progress: 100
-                                });
-                                setTimeout(() => removeNotification(notificationId), 3000);
-
-                                setQuotas(prev => ({
-                                    ...prev,
-                                    [currentType]: { ...prev[currentType], used: prev[currentType].used + 1 }
-                                }));
-                                setTitle('');
-                                setFile(null);
-                                setThumbnailFile(null);
-                            } else if (statusData.status === 'error') {
-                                clearInterval(pollInterval);
-                                updateNotification(notificationId, {
-                                    type: 'error',
-                                    status: 'Processing Failed',
-                                    message: statusData.message || 'Error occurred during processing.'
-                                });
-                            } else {
-                                updateNotification(notificationId, {
-                                    progress: statusData.progress,
-                                    status: 'Processing...',
-                                    message: statusData.message
-                                });
-                            }
-                        }
-                    } catch (err) {
-                        console.error("Polling error:", err);
                     }
-                }, 2000);
+                });
+
+                // EventSource reconnects on its own after network errors
+                events.onerror = (err) => console.error("Progress stream error:", err);
             } else {
                 updateNotification(notificationId, { type: 'success', status: 'Upload successful!' });
             }
@@ -1,11 +1,14 @@
 import React, { useState, useEffect } from 'react';
 import { useParams, useLocation, useNavigate } from 'react-router-dom';
-import { getVideoById, getComments, postComment, likeVideo, shareVideo, viewVideo } from '../api';
+import { getVideoById, getVideosPage, getComments, postComment, likeVideo, shareVideo, viewVideo } from '../api';
 import { Heart, Share2, Send, MessageSquare, Download, X, Check } from 'lucide-react';
 import VideoPlayer from '../components/VideoPlayer';
 import { useAuth } from '../context/AuthContext';
 import { useNotification } from '../context/NotificationContext';
 
+// Feed pages the "next video" shortcut searches for the current video
+const NEXT_VIDEO_MAX_PAGES = 5;
+
 const DownloadModal = ({ video, onClose, user }) => {
     const { showNotification } = useNotification();
     // ... rest of component
@@ -199,14 +202,25 @@ const Watch = () => {
                 // Simple implementation: fetch home videos and go to one.
                 const navigateToNext = async () => {
                     try {
-                        const vids = await getVideos('home', token);
-                        if (vids && vids.length > 0) {
-                            // Filter out current and find next index or just pick a random one
-                            const others = vids.filter(v => v.id.toString() !== id.toString());
-                            if (others.length > 0) {
-                                const next = others[Math.floor(Math.random() * others.length)];
-                                navigate(`/watch/${next.id}`);
+                        // Follow the feed pages until the current video turns up, then take the one after it
+                        const vids = [];
+                        let cursor = null;
+                        for (let page = 0; page < NEXT_VIDEO_MAX_PAGES; page++) {
+                            const { videos: batch, nextCursor } = await getVideosPage('home', token, cursor);
+                            vids.push(...batch);
+                            const index = vids.findIndex(v => v.id.toString() === id.toString());
+                            if (index >= 0 && index < vids.length - 1) {
+                                navigate(`/watch/${vids[index + 1].id}`);
+                                return;
                             }
+                            if (!nextCursor) break;
+                            cursor = nextCursor;
+                        }
+                        // Not in the pages we looked at (or last in the feed): pick a random one
+                        const others = vids.filter(v => v.id.toString() !== id.toString());
+                        if (others.length > 0) {
+                            const next = others[Math.floor(Math.random() * others.length)];
+                            navigate(`/watch/${next.id}`);
                         }
                     } catch (err) {
                         console.error("Failed to find next video:", err);
@@ -0,0 +1,73 @@
+use anyhow::Result;
+use reqwest::Client;
+use serde::Serialize;
+use std::sync::OnceLock;
+use std::time::Duration;
+
+use crate::processor::MediaInfo;
+
+// 1s doubling to 64s: about two minutes before the backend's sweep takes over
+const MAX_ATTEMPTS: u32 = 8;
+const CONNECT_TIMEOUT: Duration = Duration::from_secs(10);
+const RESPONSE_TIMEOUT: Duration = Duration::from_secs(30);
+
+#[derive(Serialize)]
+pub struct ProcessingEvent {
+    pub task_id: String,
+    pub status: String, // "completed" or "error"
+    pub message: String,
+    pub video_path: String,
+    pub skip_thumbnail: bool,
+    pub media: Option<MediaInfo>,
+}
+
+/// Deliver a completion event to the backend, retrying with exponential backoff.
+/// A 4xx answer is final: the backend understood the event and rejected it.
+pub async fn notify(url: &str, token: Option<&str>, event: &ProcessingEvent) {
+    let body = match serde_json::to_string(event) {
+        Ok(body) => body,
+        Err(e) => {
+            eprintln!("Could not serialize callback for task {}: {}", event.task_id, e);
+            return;
+        }
+    };
+
+    let mut delay = Duration::from_secs(1);
+    for attempt in 1..=MAX_ATTEMPTS {
+        match post_json(url, token, &body).await {
+            Ok(code) if (200..300).contains(&code) => return,
+            Ok(code) if (400..500).contains(&code) => {
+                eprintln!("Callback for task {} rejected with HTTP {}", event.task_id, code);
+                return;
+            }
+            Ok(code) => eprintln!("Callback for task {} returned HTTP {} (attempt {})", event.task_id, code, attempt),
+            Err(e) => eprintln!("Callback for task {} failed (attempt {}): {}", event.task_id, attempt, e),
+        }
+        if attempt < MAX_ATTEMPTS {
+            tokio::time::sleep(delay).await;
+            delay *= 2;
+        }
+    }
+}
+
+fn client() -> &'static Client {
+    static CLIENT: OnceLock<Client> = OnceLock::new();
+    CLIENT.get_or_init(|| {
+        Client::builder()
+            .connect_timeout(CONNECT_TIMEOUT)
+            .timeout(RESPONSE_TIMEOUT)
+            .build()
+            .expect("Could not build the callback HTTP client")
+    })
+}
+
+async fn post_json(url: &str, token: Option<&str>, body: &str) -> Result<u16> {
+    let mut request = client()
+        .post(url)
+        .header("Content-Type", "application/json")
+        .body(body.to_string());
+    if let Some(token) = token {
+        request = request.header("X-Callback-Token", token);
+    }
+    Ok(request.send().await?.status().as_u16())
+}
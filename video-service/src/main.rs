@@ -10,6 +10,10 @@ use tower_http::cors::CorsLayer;
 
 mod processor;
 mod ax_status;
+mod callback;
+mod scheduler;
+
+use scheduler::TranscodeScheduler;
 
 #[derive(Serialize, Deserialize)]
 struct ProcessRequest {
@@ -18,6 +22,19 @@ struct ProcessRequest {
     target_format: String, // "home" or "flash"
     #[serde(default)]
     skip_thumbnail: bool,
+    // Also package the renditions for HLS (home videos only)
+    #[serde(default)]
+    hls: bool,
+    // Also render seek-preview sprite sheets with a VTT index (home videos only)
+    #[serde(default)]
+    seek_preview: bool,
+    #[serde(default)]
+    transcode_mode: processor::TranscodeMode,
+    // Where to POST the completion event; without it callers poll /status
+    #[serde(default)]
+    callback_url: Option<String>,
+    #[serde(default)]
+    callback_token: Option<String>,
 }
 
 #[derive(Serialize)]
@@ -32,16 +49,22 @@ pub struct TaskStatus {
     pub progress: u32,
     pub status: String,
     pub message: String,
+    // Probe results, present once processing has completed
+    #[serde(skip_serializing_if = "Option::is_none")]
+    pub media: Option<processor::MediaInfo>,
 }
 
 struct AppState {
     status_map: StatusMap,
+    // One core budget for every task
+    scheduler: Arc<TranscodeScheduler>,
 }
 
 #[tokio::main]
 async fn main() {
     let status_map = Arc::new(dashmap::DashMap::new());
-    let state = Arc::new(AppState { status_map });
+    let scheduler = Arc::new(TranscodeScheduler::from_env());
+    let state = Arc::new(AppState { status_map, scheduler });
 
     let app = Router::new()
         .route("/health", get(|| async { "OK" }))
@@ -63,6 +86,7 @@ async fn process_video(
 ) -> Json<ProcessResponse> {
     let task_id = payload.task_id.clone();
     let status_map = state.status_map.clone();
+    let scheduler = state.scheduler.clone();
     
     println!("Processing video {} (task: {}) for format {}", payload.video_id, task_id, payload.target_format);
     
@@ -70,26 +94,33 @@ async fn process_video(
         progress: 0,
         status: "starting".to_string(),
         message: "Starting processing...".to_string(),
+        media: None,
     });
 
     // Run in background
     let task_id_clone = task_id.clone();
     tokio::spawn(async move {
-        match processor::process(&payload.video_id, &payload.target_format, payload.skip_thumbnail, Some(status_map.clone()), task_id_clone.clone()).await {
-            Ok(_) => {
-                status_map.insert(task_id_clone, TaskStatus {
-                    progress: 100,
-                    status: "completed".to_string(),
-                    message: "Processing completed".to_string(),
-                });
-            },
-            Err(e) => {
-                status_map.insert(task_id_clone, TaskStatus {
-                    progress: 0,
-                    status: "error".to_string(),
-                    message: e.to_string(),
-                });
-            },
+        let (status, message, media) = match processor::process(&payload.video_id, &payload.target_format, payload.skip_thumbnail, payload.hls, payload.seek_preview, payload.transcode_mode, scheduler, Some(status_map.clone()), task_id_clone.clone()).await {
+            Ok(media) => ("completed", "Processing completed".to_string(), Some(media)),
+            Err(e) => ("error", e.to_string(), None),
+        };
+        status_map.insert(task_id_clone.clone(), TaskStatus {
+            progress: if status == "completed" { 100 } else { 0 },
+            status: status.to_string(),
+            message: message.clone(),
+            media: media.clone(),
+        });
+
+        if let Some(url) = payload.callback_url.as_deref() {
+            let event = callback::ProcessingEvent {
+                task_id: task_id_clone,
+                status: status.to_string(),
+                message,
+                video_path: payload.video_id.clone(),
+                skip_thumbnail: payload.skip_thumbnail,
+                media,
+            };
+            callback::notify(url, payload.callback_token.as_deref(), &event).await;
         }
     });
 
@@ -1,18 +1,58 @@
-use std::process::Command;
+use std::collections::BTreeMap;
+use std::sync::Arc;
+use tokio::process::Command;
+use tokio::task::JoinSet;
 use anyhow::{Result, anyhow};
+use serde::{Deserialize, Serialize};
+use serde_json::Value;
 use crate::ax_status::StatusMap;
+use crate::scheduler::TranscodeScheduler;
 use crate::TaskStatus;
 
+// HLS segment length; renditions get a keyframe every KEYFRAME_INTERVAL so
+// segment boundaries line up across qualities and players can switch cleanly
+const HLS_SEGMENT_SECONDS: &str = "6";
+const KEYFRAME_INTERVAL: &str = "expr:gte(t,n_forced*2)";
 
-pub async fn process(video_path: &str, format: &str, skip_thumbnail: bool, status_map: Option<StatusMap>, task_id: String) -> Result<()> {
-    // 1. Get Dimensions and Aspect Ratio
-    let (width, height) = get_video_dimensions(video_path).await?;
+// The poster is the frame at this time, or the first frame of shorter sources
+const THUMBNAIL_AT_SECONDS: f64 = 1.0;
+
+// Sized copies of the poster, by name and width; each is written as WebP and JPEG
+const THUMBNAIL_VARIANTS: [(&str, u32); 3] = [("grid", 320), ("card", 640), ("hero", 1280)];
+
+// Seek previews: a tile every SPRITE_INTERVAL_SECONDS (stretched so long videos
+// stay under SPRITE_MAX_TILES), packed SPRITE_COLUMNS x SPRITE_ROWS per sheet
+const SPRITE_INTERVAL_SECONDS: u32 = 5;
+const SPRITE_MAX_TILES: u32 = 300;
+const SPRITE_TILE_WIDTH: u32 = 160;
+const SPRITE_COLUMNS: u32 = 10;
+const SPRITE_ROWS: u32 = 10;
+
+/// How home renditions are encoded; chosen per job so the two can be compared.
+#[derive(Serialize, Deserialize, Clone, Copy, Debug, Default, PartialEq)]
+#[serde(rename_all = "snake_case")]
+pub enum TranscodeMode {
+    /// One ffmpeg per rendition, run concurrently; each decodes the source
+    #[default]
+    PerRendition,
+    /// One ffmpeg decoding the source once and encoding every rendition
+    /// (and the thumbnail) from a split filter graph
+    SingleDecode,
+}
+
+pub async fn process(video_path: &str, format: &str, skip_thumbnail: bool, hls: bool, seek_preview: bool, mode: TranscodeMode, scheduler: Arc<TranscodeScheduler>, status_map: Option<StatusMap>, task_id: String) -> Result<MediaInfo> {
+    // 1. Probe once: dimensions for validation, the rest is reported back
+    let mut media = probe_media(video_path).await?;
+    let (width, height) = (media.width as f32, media.height as f32);
     let aspect_ratio = width / height;
     println!("Detected dimensions: {}x{} (AR: {})", width, height, aspect_ratio);
     
     validate_format(aspect_ratio, format)?;
 
     // 2. Transcode and Generate Thumbnail
+    let mut thumbnail_done = false;
+    let sprites = if seek_preview && format != "flash" { Some(SpriteSheet::for_media(&media)) } else { None };
+    let mut sprites_done = false;
     if format == "flash" {
         // For flash videos, skip multi-resolution transcoding.
         if let Some(ref map) = status_map {
@@ -20,11 +60,13 @@ pub async fn process(video_path: &str, format: &str, skip_thumbnail: bool, statu
                 progress: 50,
                 status: "processing".to_string(),
                 message: "Optimizing flash video (copy)...".to_string(),
+                media: None,
             });
         }
         let output_path = format!("{}_720p.mp4", video_path);
         println!("Flash video detected - copying to target path: {}", output_path);
-        std::fs::copy(video_path, &output_path)?;
+        tokio::fs::copy(video_path, &output_path).await?;
+        media.rendition_sizes.insert("720p".to_string(), tokio::fs::metadata(&output_path).await?.len());
     } else {
         // Resolutions: 480p, 720p, 1080p, 1440p (2K), 2160p (4K)
         let all_resolutions = [480, 720, 1080, 1440, 2160];
@@ -45,65 +87,215 @@ pub async fn process(video_path: &str, format: &str, skip_thumbnail: bool, statu
 
         println!("Selected target resolutions: {:?}", target_resolutions);
 
-        let total_steps = target_resolutions.len() + (if skip_thumbnail { 0 } else { 1 });
+        let total_steps = target_resolutions.len()
+            + (if skip_thumbnail { 0 } else { 1 })
+            + (if hls { 1 } else { 0 })
+            + (if sprites.is_some() { 1 } else { 0 });
         
-        for (i, target_height) in target_resolutions.iter().enumerate() {
+        if mode == TranscodeMode::SingleDecode {
+            if let Some(ref map) = status_map {
+                map.insert(task_id.clone(), TaskStatus {
+                    progress: 0,
+                    status: "processing".to_string(),
+                    message: format!("Transcoding {} renditions in one pass...", target_resolutions.len()),
+                    media: None,
+                });
+            }
+            let threads: Vec<u32> = target_resolutions.iter().map(|&h| scheduler.cores_for(h)).collect();
+            let _permit = scheduler.acquire(threads.iter().sum()).await?;
+            transcode_all(video_path, &target_resolutions, &threads, !skip_thumbnail, media.duration, sprites.as_ref()).await?;
+            thumbnail_done = !skip_thumbnail;
+            sprites_done = sprites.is_some();
+            for target_height in &target_resolutions {
+                let output_path = format!("{}_{}p.mp4", video_path, target_height);
+                media.rendition_sizes.insert(format!("{}p", target_height), tokio::fs::metadata(&output_path).await?.len());
+            }
+        } else {
             if let Some(ref map) = status_map {
                 map.insert(task_id.clone(), TaskStatus {
-                    progress: ((i as f32 / total_steps as f32) * 100.0) as u32,
+                    progress: 0,
                     status: "processing".to_string(),
-                    message: format!("Transcoding to {}p...", target_height),
+                    message: format!("Transcoding {} renditions...", target_resolutions.len()),
+                    media: None,
+                });
+            }
+
+            // Start every rendition at once; the scheduler holds each back until
+            // its cores are free, so the upload takes about as long as its slowest one
+            let mut jobs = JoinSet::new();
+            for &target_height in &target_resolutions {
+                let scheduler = scheduler.clone();
+                let input = video_path.to_string();
+                // Note: If we had a non-standard height like 360, it will still use the _[height]p.mp4 naming convention.
+                let output_path = format!("{}_{}p.mp4", video_path, target_height);
+                jobs.spawn(async move {
+                    let cores = scheduler.cores_for(target_height);
+                    let _permit = scheduler.acquire(cores).await?;
+                    transcode(&input, &output_path, target_height, cores).await?;
+                    let size = tokio::fs::metadata(&output_path).await?.len();
+                    Ok::<_, anyhow::Error>((target_height, size))
                 });
             }
 
-            // Note: If we had a non-standard height like 360, it will still use the _[height]p.mp4 naming convention.
-            // The backend might need to be aware of this, or we just label the smallest one as 480p.
-            // For now, let's keep the actual height in the name if non-standard, but we might want to standardize.
-            let output_path = format!("{}_{}p.mp4", video_path, target_height);
-            transcode(video_path, &output_path, *target_height).await?;
+            let mut finished = 0;
+            while let Some(joined) = jobs.join_next().await {
+                // On error the JoinSet is dropped, aborting the other renditions
+                // (their ffmpeg processes are killed with them)
+                let (target_height, size) = joined??;
+                finished += 1;
+                media.rendition_sizes.insert(format!("{}p", target_height), size);
+                if let Some(ref map) = status_map {
+                    map.insert(task_id.clone(), TaskStatus {
+                        progress: ((finished as f32 / total_steps as f32) * 100.0) as u32,
+                        status: "processing".to_string(),
+                        message: format!("Transcoded {}p ({}/{})", target_height, finished, target_resolutions.len()),
+                        media: None,
+                    });
+                }
+            }
+        }
+
+        // Adaptive streaming: segment the renditions we just wrote, no re-encode
+        if hls {
+            if let Some(ref map) = status_map {
+                map.insert(task_id.clone(), TaskStatus {
+                    progress: ((target_resolutions.len() as f32 / total_steps as f32) * 100.0) as u32,
+                    status: "processing".to_string(),
+                    message: "Packaging HLS...".to_string(),
+                    media: None,
+                });
+            }
+            package_hls(video_path, &media, &target_resolutions).await?;
+        }
+
+        if let Some(ref sheet) = sprites {
+            if !sprites_done {
+                if let Some(ref map) = status_map {
+                    map.insert(task_id.clone(), TaskStatus {
+                        progress: (((total_steps - 1) as f32 / total_steps as f32) * 100.0) as u32,
+                        status: "processing".to_string(),
+                        message: "Generating seek previews...".to_string(),
+                        media: None,
+                    });
+                }
+                sheet.render(video_path).await?;
+            }
+            sheet.write_index(video_path, media.duration).await?;
         }
     }
 
     // Generate thumbnail from the original source for best quality
-    if !skip_thumbnail {
+    if !skip_thumbnail && !thumbnail_done {
         if let Some(ref map) = status_map {
             let progress = if format == "flash" { 90 } else { 95 };
             map.insert(task_id.clone(), TaskStatus {
                 progress: progress,
                 status: "processing".to_string(),
                 message: "Generating thumbnail...".to_string(),
+                media: None,
             });
         }
-        generate_thumbnail(video_path).await?;
+        generate_thumbnail(video_path, media.duration).await?;
     }
-    Ok(())
+    if !skip_thumbnail {
+        // Optional: the backend falls back to the full-size poster without them
+        if let Err(e) = generate_thumbnail_variants(video_path).await {
+            eprintln!("Thumbnail variants for {} failed: {}", video_path, e);
+        }
+    }
+    Ok(media)
 }
 
-async fn get_video_dimensions(video_path: &str) -> Result<(f32, f32)> {
+/// Everything the backend stores about a video, from one ffprobe pass over the
+/// source plus the sizes of the renditions written from it.
+#[derive(Serialize, Clone, Debug, Default)]
+pub struct MediaInfo {
+    pub duration: f64,
+    pub width: u32,
+    pub height: u32,
+    pub video_codec: Option<String>,
+    pub audio_codec: Option<String>,
+    pub bitrate: u64,
+    pub fps: f64,
+    pub size: u64,
+    pub rendition_sizes: BTreeMap<String, u64>,
+}
+
+async fn probe_media(video_path: &str) -> Result<MediaInfo> {
     let output = Command::new("ffprobe")
         .args(&[
             "-v", "error",
-            "-select_streams", "v:0",
-            "-show_entries", "stream=width,height",
-            "-of", "csv=s=x:p=0",
+            "-print_format", "json",
+            "-show_format",
+            "-show_streams",
             video_path,
         ])
-        .output()?;
+        .output()
+        .await?;
 
     if !output.status.success() {
         return Err(anyhow!("ffprobe failed: {}", String::from_utf8_lossy(&output.stderr)));
     }
 
-    let s = String::from_utf8(output.stdout)?;
-    let parts: Vec<&str> = s.trim().split('x').collect();
-    if parts.len() != 2 {
-        return Err(anyhow!("Invalid ffprobe output: {}", s));
+    let probe: Value = serde_json::from_slice(&output.stdout)?;
+    let streams = probe["streams"].as_array().cloned().unwrap_or_default();
+    let video = streams.iter()
+        .find(|s| s["codec_type"] == "video")
+        .ok_or_else(|| anyhow!("No video stream found"))?;
+    let audio = streams.iter().find(|s| s["codec_type"] == "audio");
+    let format = &probe["format"];
+
+    let mut width = video["width"].as_u64().unwrap_or(0) as u32;
+    let mut height = video["height"].as_u64().unwrap_or(0) as u32;
+    if width == 0 || height == 0 {
+        return Err(anyhow!("Invalid ffprobe output: missing dimensions"));
+    }
+    // Report the display size: ffmpeg applies the rotation when transcoding,
+    // and the backend checks orientation against the same numbers
+    if rotation(video).rem_euclid(180.0) == 90.0 {
+        std::mem::swap(&mut width, &mut height);
     }
 
-    let width: f32 = parts[0].parse()?;
-    let height: f32 = parts[1].parse()?;
-    
-    Ok((width, height))
+    Ok(MediaInfo {
+        duration: parse_number(&format["duration"]).or_else(|| parse_number(&video["duration"])).unwrap_or(0.0),
+        width,
+        height,
+        video_codec: video["codec_name"].as_str().map(str::to_string),
+        audio_codec: audio.and_then(|a| a["codec_name"].as_str()).map(str::to_string),
+        bitrate: parse_number(&format["bit_rate"]).unwrap_or(0.0) as u64,
+        fps: parse_rate(&video["avg_frame_rate"]).or_else(|| parse_rate(&video["r_frame_rate"])).unwrap_or(0.0),
+        size: parse_number(&format["size"]).unwrap_or(0.0) as u64,
+        rendition_sizes: BTreeMap::new(),
+    })
+}
+
+// Older ffprobe puts rotation in a tag, newer in the display matrix side data
+fn rotation(stream: &Value) -> f64 {
+    parse_number(&stream["tags"]["rotate"])
+        .or_else(|| {
+            stream["side_data_list"].as_array()?
+                .iter()
+                .find_map(|d| parse_number(&d["rotation"]))
+        })
+        .unwrap_or(0.0)
+        .round()
+}
+
+// ffprobe reports most numbers as strings
+fn parse_number(value: &Value) -> Option<f64> {
+    match value {
+        Value::String(s) => s.parse().ok(),
+        Value::Number(n) => n.as_f64(),
+        _ => None,
+    }
+}
+
+// Frame rates come as fractions, e.g. "30000/1001"
+fn parse_rate(value: &Value) -> Option<f64> {
+    let (num, den) = value.as_str()?.split_once('/')?;
+    let num: f64 = num.parse().ok()?;
+    let den: f64 = den.parse().ok()?;
+    if den == 0.0 { None } else { Some(num / den) }
 }
 
 fn validate_format(ratio: f32, target: &str) -> Result<()> {
@@ -119,23 +311,31 @@ fn validate_format(ratio: f32, target: &str) -> Result<()> {
     Ok(())
 }
 
-async fn transcode(input: &str, output: &str, height: i32) -> Result<()> {
-    println!("Transcoding {} to {}p -> {}", input, height, output);
+async fn transcode(input: &str, output: &str, height: i32, threads: u32) -> Result<()> {
+    println!("Transcoding {} to {}p on {} cores -> {}", input, height, threads, output);
     
     // Scale filter: -2 ensures width is calculated to maintain aspect ratio, divisible by 2
     let scale_filter = format!("scale=-2:{}", height);
+    let threads = threads.to_string();
 
     let status = Command::new("ffmpeg")
         .args(&[
+            // Decoder and scale filter stay within the reserved cores too
+            "-threads", &threads,
             "-i", input,
+            "-filter_threads", &threads,
             "-vf", &scale_filter,
             "-vcodec", "libx264",
             "-crf", "28", // Lower quality for storage optimization
             "-preset", "faster", // Faster processing
+            "-force_key_frames", KEYFRAME_INTERVAL,
+            "-threads", &threads, // Matches the cores reserved with the scheduler
             "-y", // Overwrite output
             output,
         ])
-        .status()?;
+        .kill_on_drop(true)
+        .status()
+        .await?;
 
     if !status.success() {
         return Err(anyhow!("ffmpeg transcoding to {}p failed", height));
@@ -143,22 +343,292 @@ async fn transcode(input: &str, output: &str, height: i32) -> Result<()> {
     Ok(())
 }
 
-async fn generate_thumbnail(video_path: &str) -> Result<()> {
+/// Write `{video_path}_hls/`: a media playlist with TS segments per rendition
+/// under `<height>p/`, and `master.m3u8` listing them by bandwidth.
+async fn package_hls(video_path: &str, media: &MediaInfo, heights: &[i32]) -> Result<()> {
+    let hls_dir = format!("{}_hls", video_path);
+    let mut master = String::from("#EXTM3U\n#EXT-X-VERSION:3\n");
+
+    for height in heights {
+        let label = format!("{}p", height);
+        let input = format!("{}_{}.mp4", video_path, label);
+        let rendition_dir = format!("{}/{}", hls_dir, label);
+        let segments = format!("{}/seg_%05d.ts", rendition_dir);
+        let playlist = format!("{}/index.m3u8", rendition_dir);
+        tokio::fs::create_dir_all(&rendition_dir).await?;
+        println!("Packaging {} as HLS -> {}", input, playlist);
+
+        let status = Command::new("ffmpeg")
+            .args(&[
+                "-i", &input,
+                "-c", "copy",
+                "-f", "hls",
+                "-hls_time", HLS_SEGMENT_SECONDS,
+                "-hls_playlist_type", "vod",
+                "-hls_segment_filename", &segments,
+                "-y",
+                &playlist,
+            ])
+            .kill_on_drop(true)
+            .status()
+            .await?;
+
+        if !status.success() {
+            return Err(anyhow!("HLS packaging of {} failed", label));
+        }
+
+        let size = media.rendition_sizes.get(&label).copied().unwrap_or(0);
+        let bandwidth = if media.duration > 0.0 { (size as f64 * 8.0 / media.duration) as u64 } else { media.bitrate };
+        // Same rounding as scale=-2
+        let width = (media.width as f64 * *height as f64 / media.height as f64 / 2.0).round() as u32 * 2;
+        master.push_str(&format!(
+            "#EXT-X-STREAM-INF:BANDWIDTH={},RESOLUTION={}x{}\n{}/index.m3u8\n",
+            bandwidth.max(1), width, height, label
+        ));
+    }
+
+    tokio::fs::write(format!("{}/master.m3u8", hls_dir), master).await?;
+    Ok(())
+}
+
+/// Decode the source once: split the frames into one scaled branch per
+/// rendition (plus thumbnail and sprite branches) and encode them all in a single run.
+async fn transcode_all(input: &str, heights: &[i32], threads: &[u32], thumbnail: bool, duration: f64, sprites: Option<&SpriteSheet>) -> Result<()> {
+    println!("Transcoding {} to {:?} in one pass", input, heights);
+
+    let branches = heights.len() + if thumbnail { 1 } else { 0 } + if sprites.is_some() { 1 } else { 0 };
+    let mut graph = format!("[0:v]split={}", branches);
+    for i in 0..branches {
+        graph.push_str(&format!("[s{}]", i));
+    }
+    for (i, height) in heights.iter().enumerate() {
+        // -2 keeps the aspect ratio with an even width, as in transcode()
+        graph.push_str(&format!(";[s{}]scale=-2:{}[v{}]", i, height, i));
+    }
+    if thumbnail {
+        // Same frame generate_thumbnail() takes
+        graph.push_str(&format!(";[s{}]select={}[thumb]", heights.len(), poster_frame(duration)));
+    }
+    if let Some(sheet) = sprites {
+        graph.push_str(&format!(";[s{}]{}[sprites]", branches - 1, sheet.filter()));
+        tokio::fs::create_dir_all(SpriteSheet::dir(input)).await?;
+    }
+
+    // The decoder and the shared filter graph run on all the cores reserved for the encoders
+    let total = threads.iter().sum::<u32>().to_string();
+    let mut args: Vec<String> = vec![
+        "-y".into(),
+        "-threads".into(), total.clone(),
+        "-i".into(), input.into(),
+        "-filter_complex_threads".into(), total,
+        "-filter_complex".into(), graph,
+    ];
+    for (i, (height, threads)) in heights.iter().zip(threads).enumerate() {
+        args.extend([
+            "-map".into(), format!("[v{}]", i),
+            "-map".into(), "0:a?".into(),
+            "-vcodec".into(), "libx264".into(),
+            "-crf".into(), "28".into(),
+            "-preset".into(), "faster".into(),
+            "-force_key_frames".into(), KEYFRAME_INTERVAL.into(),
+            "-threads".into(), threads.to_string(),
+            format!("{}_{}p.mp4", input, height),
+        ]);
+    }
+    if thumbnail {
+        args.extend([
+            "-map".into(), "[thumb]".into(),
+            "-frames:v".into(), "1".into(),
+            "-q:v".into(), "2".into(),
+            format!("{}.jpg", input),
+        ]);
+    }
+    if sprites.is_some() {
+        args.extend([
+            "-map".into(), "[sprites]".into(),
+            "-q:v".into(), "5".into(),
+            SpriteSheet::pattern(input),
+        ]);
+    }
+
+    let status = Command::new("ffmpeg")
+        .args(&args)
+        .kill_on_drop(true)
+        .status()
+        .await?;
+
+    if !status.success() {
+        return Err(anyhow!("ffmpeg single-pass transcoding failed"));
+    }
+    Ok(())
+}
+
+/// `select` expression for the poster frame: the first one at
+/// THUMBNAIL_AT_SECONDS, or frame 0 when the source is shorter than that
+/// (or its duration is unknown) and no frame would match.
+fn poster_frame(duration: f64) -> String {
+    if duration > THUMBNAIL_AT_SECONDS {
+        format!("gte(t\\,{})", THUMBNAIL_AT_SECONDS)
+    } else {
+        "eq(n\\,0)".to_string()
+    }
+}
+
+async fn generate_thumbnail(video_path: &str, duration: f64) -> Result<()> {
     let thumb_path = format!("{}.jpg", video_path);
     println!("Generating thumbnail for {}", video_path);
+    let select = format!("select={}", poster_frame(duration));
     let status = Command::new("ffmpeg")
         .args(&[
             "-i", video_path,
-            "-ss", "00:00:01",
+            "-vf", &select,
             "-vframes", "1",
             "-q:v", "2",
             "-y",
             &thumb_path,
         ])
-        .status()?;
+        .kill_on_drop(true)
+        .status()
+        .await?;
 
     if !status.success() {
         return Err(anyhow!("ffmpeg thumbnail generation failed"));
     }
     Ok(())
 }
+
+/// Scale the poster (`{video_path}.jpg`) down to each of THUMBNAIL_VARIANTS,
+/// written as `{video_path}_thumb_<variant>.webp` and `.jpg`. Only the poster
+/// is decoded, not the video, and every output comes from one ffmpeg run.
+async fn generate_thumbnail_variants(video_path: &str) -> Result<()> {
+    let poster = format!("{}.jpg", video_path);
+    println!("Generating thumbnail variants for {}", video_path);
+
+    let mut args: Vec<String> = vec!["-y".into(), "-i".into(), poster];
+    for (name, width) in THUMBNAIL_VARIANTS {
+        // Never upscale; -2 keeps the aspect ratio with an even height
+        let scale = format!("scale=w=min({}\\,iw):h=-2", width);
+        args.extend([
+            "-vf".into(), scale.clone(),
+            "-c:v".into(), "libwebp".into(),
+            "-quality".into(), "75".into(),
+            "-frames:v".into(), "1".into(),
+            format!("{}_thumb_{}.webp", video_path, name),
+            "-vf".into(), scale,
+            "-q:v".into(), "4".into(),
+            "-frames:v".into(), "1".into(),
+            format!("{}_thumb_{}.jpg", video_path, name),
+        ]);
+    }
+
+    let status = Command::new("ffmpeg")
+        .args(&args)
+        .kill_on_drop(true)
+        .status()
+        .await?;
+
+    if !status.success() {
+        return Err(anyhow!("ffmpeg thumbnail variants failed"));
+    }
+    Ok(())
+}
+
+/// Seek-preview sprite sheets for a video: `{video_path}_preview/` holds
+/// `sprite_001.jpg`, ... and `preview.vtt`, whose cues point at one tile each
+/// (`sprite_001.jpg#xywh=x,y,w,h`), as players expect for thumbnail tracks.
+struct SpriteSheet {
+    interval: u32,
+    tile_width: u32,
+    tile_height: u32,
+}
+
+impl SpriteSheet {
+    fn for_media(media: &MediaInfo) -> Self {
+        let stretched = (media.duration / SPRITE_MAX_TILES as f64).ceil() as u32;
+        let tile_width = SPRITE_TILE_WIDTH.min(media.width.max(2));
+        // Same rounding as scale=-2
+        let tile_height = ((tile_width as f64 * media.height as f64 / media.width.max(1) as f64 / 2.0).round() as u32 * 2).max(2);
+        SpriteSheet {
+            interval: SPRITE_INTERVAL_SECONDS.max(stretched),
+            tile_width,
+            tile_height,
+        }
+    }
+
+    fn dir(video_path: &str) -> String {
+        format!("{}_preview", video_path)
+    }
+
+    fn pattern(video_path: &str) -> String {
+        format!("{}/sprite_%03d.jpg", SpriteSheet::dir(video_path))
+    }
+
+    /// One frame per interval, scaled to a tile, packed into sheets.
+    fn filter(&self) -> String {
+        format!(
+            "fps=1/{},scale={}:{},tile={}x{}",
+            self.interval, self.tile_width, self.tile_height, SPRITE_COLUMNS, SPRITE_ROWS
+        )
+    }
+
+    /// Decode the source at the sprite rate and write the sheets.
+    async fn render(&self, video_path: &str) -> Result<()> {
+        println!("Generating seek previews for {} every {}s", video_path, self.interval);
+        tokio::fs::create_dir_all(SpriteSheet::dir(video_path)).await?;
+        let filter = self.filter();
+        let pattern = SpriteSheet::pattern(video_path);
+
+        let status = Command::new("ffmpeg")
+            .args(&[
+                // Decode keyframes only: a tile just has to be near its time
+                "-skip_frame", "nokey",
+                "-i", video_path,
+                "-vf", &filter,
+                "-q:v", "5",
+                "-y",
+                &pattern,
+            ])
+            .kill_on_drop(true)
+            .status()
+            .await?;
+
+        if !status.success() {
+            return Err(anyhow!("ffmpeg seek preview generation failed"));
+        }
+        Ok(())
+    }
+
+    async fn write_index(&self, video_path: &str, duration: f64) -> Result<()> {
+        let per_sheet = SPRITE_COLUMNS * SPRITE_ROWS;
+        let tiles = ((duration / self.interval as f64).ceil() as u32).max(1);
+        let mut vtt = String::from("WEBVTT\n");
+        for i in 0..tiles {
+            let start = (i * self.interval) as f64;
+            let end = (start + self.interval as f64).min(duration.max(start + 1.0));
+            let tile = i % per_sheet;
+            vtt.push_str(&format!(
+                "\n{} --> {}\nsprite_{:03}.jpg#xywh={},{},{},{}\n",
+                vtt_time(start),
+                vtt_time(end),
+                i / per_sheet + 1,
+                (tile % SPRITE_COLUMNS) * self.tile_width,
+                (tile / SPRITE_COLUMNS) * self.tile_height,
+                self.tile_width,
+                self.tile_height
+            ));
+        }
+        tokio::fs::write(format!("{}/preview.vtt", SpriteSheet::dir(video_path)), vtt).await?;
+        Ok(())
+    }
+}
+
+fn vtt_time(seconds: f64) -> String {
+    let millis = (seconds * 1000.0).round() as u64;
+    format!(
+        "{:02}:{:02}:{:02}.{:03}",
+        millis / 3_600_000,
+        millis / 60_000 % 60,
+        millis / 1000 % 60,
+        millis % 1000
+    )
+}
@@ -0,0 +1,53 @@
+use anyhow::{anyhow, Result};
+use std::sync::Arc;
+use tokio::sync::{OwnedSemaphorePermit, Semaphore};
+
+/// A core budget shared by every transcode the service runs.
+///
+/// Each ffmpeg job takes as many permits as the cores it is given (its
+/// `-threads`), so renditions of one upload run side by side while the total
+/// across all uploads never exceeds the budget. Waiters are served in order.
+pub struct TranscodeScheduler {
+    permits: Arc<Semaphore>,
+    cores: u32,
+}
+
+impl TranscodeScheduler {
+    pub fn new(cores: u32) -> Self {
+        let cores = cores.max(1);
+        TranscodeScheduler {
+            permits: Arc::new(Semaphore::new(cores as usize)),
+            cores,
+        }
+    }
+
+    /// TRANSCODE_CORES, or every core the machine has.
+    pub fn from_env() -> Self {
+        let cores = std::env::var("TRANSCODE_CORES")
+            .ok()
+            .and_then(|v| v.parse().ok())
+            .unwrap_or_else(|| std::thread::available_parallelism().map(|n| n.get() as u32).unwrap_or(1));
+        println!("Transcode core budget: {}", cores);
+        TranscodeScheduler::new(cores)
+    }
+
+    /// Cores to give a rendition: encode cost grows with the output size.
+    pub fn cores_for(&self, height: i32) -> u32 {
+        let wanted = match height {
+            h if h >= 2160 => 4,
+            h if h >= 1440 => 3,
+            h if h >= 1080 => 2,
+            _ => 1,
+        };
+        wanted.min(self.cores)
+    }
+
+    /// Wait until `cores` are free; they are returned when the permit drops.
+    pub async fn acquire(&self, cores: u32) -> Result<OwnedSemaphorePermit> {
+        self.permits
+            .clone()
+            .acquire_many_owned(cores.clamp(1, self.cores))
+            .await
+            .map_err(|_| anyhow!("Transcode scheduler closed"))
+    }
+}